@@ -1,3 +1,29 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Application, ApplicationStatusCount, BatchScore, ParsedResume
+
+
+@admin.register(Application)
+class ApplicationAdmin(admin.ModelAdmin):
+    list_display = ('applicant', 'job_title', 'company', 'status', 'applied_at')
+    list_filter = ('status',)
+    search_fields = ('applicant', 'job_id', 'job_title', 'company')
+    # Status changes go through applications.set_status to keep the counts right
+    readonly_fields = ('status',)
+
+
+@admin.register(ApplicationStatusCount)
+class ApplicationStatusCountAdmin(admin.ModelAdmin):
+    list_display = ('applicant', 'status', 'count')
+
+
+@admin.register(ParsedResume)
+class ParsedResumeAdmin(admin.ModelAdmin):
+    list_display = ('applicant', 'version', 'resume_id', 'created_at')
+    search_fields = ('applicant', 'resume_id')
+
+
+@admin.register(BatchScore)
+class BatchScoreAdmin(admin.ModelAdmin):
+    list_display = ('batch_id', 'resume_id', 'score', 'created_at')
+    search_fields = ('batch_id', 'resume_id')
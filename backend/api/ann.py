@@ -0,0 +1,298 @@
+"""Approximate nearest-neighbour retrieval of jobs for a resume.
+
+Jobs and resumes are embedded with an offline feature-hashing vectorizer
+(no model download, stable across processes) and jobs are kept in an IVF
+index: vectors are bucketed under their nearest k-means centroid and a query
+only scans the ``nprobe`` closest buckets. Raising ``nprobe`` trades latency
+for recall; ``nprobe == nlist`` is an exact search.
+"""
+import math
+import threading
+import zlib
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+
+from .catalogue import catalogue
+from .matching import JobMatrix, SKILLS, catalogue_matrix, extract_skill_ids, normalize_skill, tokenize
+
+
+class HashingVectorizer:
+    """Signed feature hashing of weighted tokens into a fixed-size unit vector"""
+
+    def __init__(self, dim=512):
+        self.dim = dim
+
+    def vector(self, features):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in features.items():
+            h = zlib.crc32(feature.encode('utf-8'))
+            sign = 1.0 if (h >> 16) & 1 else -1.0
+            vector[h % self.dim] += sign * (1.0 + math.log(weight))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def job_features(self, job):
+        features = Counter()
+        for token in tokenize(job.get('description')):
+            features[token] += 1
+        for token in tokenize(job.get('title')):
+            features[token] += 2
+        for skill in job.get('skills_required') or []:
+            features[f'skill:{normalize_skill(skill)}'] += 3
+        return features
+
+    def resume_features(self, resume_text, target_role=''):
+        features = Counter(tokenize(resume_text))
+        for token in tokenize(target_role):
+            features[token] += 2
+        for skill_id in extract_skill_ids(resume_text):
+            features[f'skill:{SKILLS.terms[skill_id]}'] += 3
+        return features
+
+
+class _InvertedList:
+    """Growable block of vectors plus the key stored in each row"""
+
+    MIN_CAPACITY = 16
+
+    def __init__(self, dim, capacity=MIN_CAPACITY):
+        self.keys = []
+        self.vectors = np.empty((capacity, dim), dtype=np.float32)
+
+    @classmethod
+    def wrap(cls, keys, rows):
+        """List backed by existing rows (e.g. a mapped snapshot) without copying them"""
+        inverted = cls.__new__(cls)
+        inverted.keys = list(keys)
+        inverted.vectors = rows
+        return inverted
+
+    def __len__(self):
+        return len(self.keys)
+
+    def append(self, key, vector):
+        if len(self.keys) == len(self.vectors):
+            # Wrapped lists start full (and may be empty), so the first append copies them out
+            grown = np.empty((max(len(self.vectors) * 2, self.MIN_CAPACITY), self.vectors.shape[1]), dtype=np.float32)
+            grown[:len(self.keys)] = self.vectors
+            self.vectors = grown
+        self.vectors[len(self.keys)] = vector
+        self.keys.append(key)
+        return len(self.keys) - 1
+
+    def pop(self, slot):
+        """Remove a row by moving the last row into it; returns the moved key"""
+        if not self.vectors.flags.writeable:
+            self.vectors = self.vectors.copy()  # Copy-on-write for rows mapped from a snapshot
+        last = len(self.keys) - 1
+        moved = self.keys[last]
+        self.vectors[slot] = self.vectors[last]
+        self.keys[slot] = moved
+        self.keys.pop()
+        return moved if slot != last else None
+
+    def rows(self):
+        return self.vectors[:len(self.keys)]
+
+
+class IVFIndex:
+    """Inverted-file index over unit vectors with incremental add/remove.
+
+    Until ``train_size`` vectors have been added the index is a single flat
+    list (exact search). After that it clusters the vectors into ``nlist``
+    lists with spherical k-means and new vectors go to their nearest list.
+    As the data drifts the index retrains itself: once as many vectors have
+    been added as it held when last trained, or earlier (after
+    ``MIN_DRIFT`` of that) if the largest list outgrows ``MAX_IMBALANCE``
+    times the mean list length.
+    """
+
+    MAX_IMBALANCE = 8.0
+    MIN_DRIFT = 0.1
+
+    def __init__(self, dim, nlist=64, nprobe=8, train_size=None):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size or nlist * 40
+        self.centroids = None
+        self._lists = [_InvertedList(dim)]
+        self._where = {}
+        self._trained_size = 0
+        self._added_since_training = 0
+
+    @classmethod
+    def from_lists(cls, dim, centroids, lists, nlist=64, nprobe=8, train_size=None):
+        """Index over prebuilt inverted lists of (keys, rows); the rows are not copied"""
+        nlist = len(centroids) if centroids is not None else nlist
+        index = cls(dim, nlist=nlist, nprobe=nprobe, train_size=train_size)
+        index.centroids = centroids
+        index._lists = [_InvertedList.wrap(keys, rows) for keys, rows in lists]
+        index._where = {
+            key: (list_no, slot)
+            for list_no, (keys, _) in enumerate(lists)
+            for slot, key in enumerate(keys)
+        }
+        index._trained_size = len(index) if centroids is not None else 0
+        return index
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def keys(self):
+        return list(self._where)
+
+    def vector(self, key):
+        list_no, slot = self._where[key]
+        return self._lists[list_no].vectors[slot].copy()
+
+    def export(self):
+        """(centroids, [(keys, rows) per inverted list]); centroids is None until trained"""
+        return self.centroids, [(list(inverted.keys), inverted.rows()) for inverted in self._lists]
+
+    def add(self, keys, vectors):
+        """Add or replace vectors; a key repeated within ``keys`` keeps its last vector"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        last = {key: i for i, key in enumerate(keys)}
+        if len(last) < len(keys):
+            keys, vectors = list(last), vectors[list(last.values())]
+        self.remove([key for key in keys if key in self._where])
+        self._place(keys, vectors)
+        self._added_since_training += len(keys)
+        if self._needs_training():
+            self.train()
+
+    def _place(self, keys, vectors):
+        list_nos = self._assign(vectors)
+        for key, vector, list_no in zip(keys, vectors, list_nos):
+            self._where[key] = (list_no, self._lists[list_no].append(key, vector))
+
+    def imbalance(self):
+        """Largest inverted list over the mean list length (1.0 is perfectly even)"""
+        if self.centroids is None or not len(self):
+            return 1.0
+        return max(len(inverted) for inverted in self._lists) * len(self._lists) / len(self)
+
+    def _needs_training(self):
+        if len(self) < max(self.train_size if self.centroids is None else 0, self.nlist):
+            return False
+        if self.centroids is None:
+            return True
+        drift = self._added_since_training / max(self._trained_size, 1)
+        return drift >= 1.0 or (drift >= self.MIN_DRIFT and self.imbalance() > self.MAX_IMBALANCE)
+
+    def remove(self, keys):
+        for key in keys:
+            location = self._where.pop(key, None)
+            if location is None:
+                continue
+            list_no, slot = location
+            moved = self._lists[list_no].pop(slot)
+            if moved is not None:
+                self._where[moved] = (list_no, slot)
+
+    def train(self, iterations=10, seed=0):
+        """(Re)cluster every stored vector into ``nlist`` inverted lists"""
+        keys = [key for inverted in self._lists for key in inverted.keys]
+        vectors = np.concatenate([inverted.rows() for inverted in self._lists])
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(len(vectors), self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            for list_no in range(self.nlist):
+                members = vectors[assignment == list_no]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                else:
+                    centroid = vectors[rng.integers(len(vectors))].copy()
+                norm = np.linalg.norm(centroid)
+                centroids[list_no] = centroid / norm if norm else centroid
+        self.centroids = centroids
+        self._lists = [_InvertedList(self.dim) for _ in range(self.nlist)]
+        self._where = {}
+        self._place(keys, vectors)
+        self._trained_size = len(keys)
+        self._added_since_training = 0
+
+    def search(self, query, k=10, nprobe=None):
+        """Top-``k`` (key, cosine similarity) pairs for one query vector"""
+        query = np.asarray(query, dtype=np.float32)
+        if self.centroids is None:
+            probed = self._lists
+        else:
+            nprobe = min(nprobe or self.nprobe, self.nlist)
+            sims = self.centroids @ query
+            probed = [self._lists[i] for i in np.argpartition(-sims, nprobe - 1)[:nprobe]]
+        probed = [inverted for inverted in probed if len(inverted)]
+        if not probed:
+            return []
+        keys = [key for inverted in probed for key in inverted.keys]
+        scores = np.concatenate([inverted.rows() @ query for inverted in probed])
+        k = min(k, len(keys))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(keys[i], float(scores[i])) for i in top]
+
+    def _assign(self, vectors):
+        if self.centroids is None:
+            return np.zeros(len(vectors), dtype=np.int64)
+        return np.argmax(vectors @ self.centroids.T, axis=1)
+
+
+class JobVectorIndex:
+    """IVF index over the job catalogue, kept in sync through catalogue hooks"""
+
+    def __init__(self, dim=512, nlist=64, nprobe=8):
+        self.vectorizer = HashingVectorizer(dim)
+        self.index = IVFIndex(dim, nlist=nlist, nprobe=nprobe)
+        self._lock = threading.Lock()
+
+    def jobs_added(self, jobs):
+        # Changed jobs are removed first, so IDs still indexed were restored from a snapshot
+        jobs = [job for job in jobs if job['id'] not in self.index]
+        vectors = [self.vectorizer.vector(self.vectorizer.job_features(job)) for job in jobs]
+        with self._lock:
+            self.index.add([job['id'] for job in jobs], vectors)
+
+    def jobs_removed(self, jobs):
+        with self._lock:
+            self.index.remove([job['id'] for job in jobs])
+
+    def restore(self, centroids, lists):
+        """Serve vectors from prebuilt (e.g. memory-mapped) inverted lists.
+
+        Jobs indexed here that the lists do not cover are carried over.
+        """
+        index = IVFIndex.from_lists(self.index.dim, centroids, lists,
+                                    nlist=self.index.nlist, nprobe=self.index.nprobe)
+        with self._lock:
+            local = [key for key in self.index.keys() if key not in index]
+            if local:
+                index.add(local, [self.index.vector(key) for key in local])
+            self.index = index
+
+    def search(self, resume_text, target_role='', k=500, nprobe=None):
+        query = self.vectorizer.vector(self.vectorizer.resume_features(resume_text, target_role))
+        with self._lock:
+            return self.index.search(query, k=k, nprobe=nprobe)
+
+
+job_index = JobVectorIndex(nprobe=settings.JOB_ANN_NPROBE)
+catalogue.subscribe(job_index)
+
+
+def candidate_matrix(resume_text, target_role=''):
+    """JobMatrix to score a resume against.
+
+    Small catalogues are scored exhaustively; past ``JOB_ANN_MIN_CATALOGUE``
+    jobs only the ANN shortlist of ``JOB_ANN_CANDIDATES`` jobs is scored.
+    """
+    if len(catalogue) < settings.JOB_ANN_MIN_CATALOGUE:
+        return catalogue_matrix()
+    shortlist = job_index.search(resume_text, target_role, k=settings.JOB_ANN_CANDIDATES)
+    return JobMatrix([job for job in (catalogue.get(job_id) for job_id, _ in shortlist) if job])
@@ -0,0 +1,233 @@
+"""Job applications: idempotent submits, batched inserts, cursor-paged history.
+
+Per-status totals live in ``ApplicationStatusCount`` and are adjusted in the
+same transaction as every insert or status change, so listing an applicant's
+applications never has to count rows.
+"""
+import base64
+import hashlib
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from .catalogue import catalogue
+from .models import Application, ApplicationStatusCount
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Column widths on Application
+MAX_JOB_ID_LENGTH = Application._meta.get_field('job_id').max_length
+MAX_RESUME_ID_LENGTH = Application._meta.get_field('resume_id').max_length
+MAX_STORED_KEY_LENGTH = Application._meta.get_field('idempotency_key').max_length
+
+
+class InvalidApplication(ValueError):
+    """A submitted job or resume ID does not fit what can be stored"""
+
+
+class IdempotencyConflict(Exception):
+    """An idempotency key was reused for a different job"""
+
+
+def applicant_key(request):
+    """Who is applying: the authenticated user, else the (anonymous) session"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    if not request.session.session_key:
+        request.session.save()
+    return f'session:{request.session.session_key}'
+
+
+def _bump_counts(applicant, deltas):
+    for status_name, delta in deltas.items():
+        if not delta:
+            continue
+        counts = ApplicationStatusCount.objects.filter(applicant=applicant, status=status_name)
+        if counts.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                ApplicationStatusCount.objects.create(applicant=applicant, status=status_name, count=delta)
+        except IntegrityError:
+            counts.update(count=F('count') + delta)  # Created concurrently
+
+
+def _stored_key(idempotency_key):
+    """The key as stored: as sent when it fits the column, else a digest of it"""
+    if not idempotency_key:
+        return None
+    idempotency_key = str(idempotency_key)
+    if len(idempotency_key) <= MAX_STORED_KEY_LENGTH:
+        return idempotency_key
+    return 'sha256:' + hashlib.sha256(idempotency_key.encode('utf-8')).hexdigest()
+
+
+def _validate(job_id, resume_id=''):
+    if len(str(job_id)) > MAX_JOB_ID_LENGTH:
+        raise InvalidApplication(f'job_id must be at most {MAX_JOB_ID_LENGTH} characters')
+    if len(str(resume_id or '')) > MAX_RESUME_ID_LENGTH:
+        raise InvalidApplication(f'resume_id must be at most {MAX_RESUME_ID_LENGTH} characters')
+
+
+def _replayed(existing, job_id):
+    if existing.job_id != str(job_id):
+        raise IdempotencyConflict(f'Idempotency key already used to apply to job {existing.job_id}')
+    return existing, False
+
+
+def _build(applicant, job_id, cover_letter='', resume_id='', idempotency_key=None):
+    job_id = str(job_id)
+    job = catalogue.get(job_id)
+    return Application(
+        applicant=applicant,
+        job_id=job_id,
+        job_title=(job.get('title') or '')[:255] if job else '',
+        company=(job.get('company') or '')[:255] if job else '',
+        cover_letter=cover_letter or '',
+        resume_id=str(resume_id or ''),
+        idempotency_key=idempotency_key or None,
+    )
+
+
+def submit(applicant, job_id, cover_letter='', resume_id='', idempotency_key=None):
+    """Create one application; returns (application, created).
+
+    A repeated ``idempotency_key`` returns the application it first created;
+    reusing one for another job raises ``IdempotencyConflict``. IDs too long
+    to store raise ``InvalidApplication``.
+    """
+    _validate(job_id, resume_id)
+    idempotency_key = _stored_key(idempotency_key)
+    if idempotency_key:
+        existing = Application.objects.filter(applicant=applicant, idempotency_key=idempotency_key).first()
+        if existing:
+            return _replayed(existing, job_id)
+    try:
+        with transaction.atomic():
+            application = _build(applicant, job_id, cover_letter, resume_id, idempotency_key)
+            application.save()
+            _bump_counts(applicant, {application.status: 1})
+    except IntegrityError:
+        if not idempotency_key:
+            raise
+        # A concurrent retry with the same key won the race
+        return _replayed(Application.objects.get(applicant=applicant, idempotency_key=idempotency_key), job_id)
+    return application, True
+
+
+def submit_many(applicant, items, idempotency_key=None):
+    """Create applications for several jobs with one batched INSERT.
+
+    ``items`` are dicts with ``job_id`` and optional ``cover_letter``,
+    ``resume_id`` and ``idempotency_key``. Items without their own key get
+    ``<idempotency_key>:<job_id>`` when a request-level key is given, so a
+    retried batch only inserts what is missing. Returns (applications in
+    item order, number created); raises like ``submit``.
+    """
+    keyed, jobs_by_key = [], {}
+    for item in items:
+        _validate(item['job_id'], item.get('resume_id'))
+        key = item.get('idempotency_key') or (f"{idempotency_key}:{item['job_id']}" if idempotency_key else None)
+        key = _stored_key(key) or f'auto:{uuid.uuid4().hex}'
+        if key in jobs_by_key:
+            if jobs_by_key[key] != str(item['job_id']):
+                raise IdempotencyConflict(f'Idempotency key used for jobs {jobs_by_key[key]} and {item["job_id"]}')
+            continue  # The same application twice in one batch
+        jobs_by_key[key] = str(item['job_id'])
+        keyed.append((item, key))
+
+    for attempt in range(2):
+        keys = [key for _, key in keyed]
+        existing = {
+            application.idempotency_key: application
+            for application in Application.objects.filter(applicant=applicant, idempotency_key__in=keys)
+        }
+        for item, key in keyed:
+            if key in existing:
+                _replayed(existing[key], item['job_id'])
+        pending = [
+            _build(applicant, item['job_id'], item.get('cover_letter'), item.get('resume_id'), key)
+            for item, key in keyed if key not in existing
+        ]
+        try:
+            with transaction.atomic():
+                Application.objects.bulk_create(pending)
+                _bump_counts(applicant, Counter(application.status for application in pending))
+            break
+        except IntegrityError:
+            if attempt:
+                raise
+            # Part of the batch was inserted concurrently; recompute what is missing
+
+    if pending and pending[0].pk is None:
+        # Backends that do not return primary keys from bulk_create
+        existing = {
+            application.idempotency_key: application
+            for application in Application.objects.filter(applicant=applicant, idempotency_key__in=keys)
+        }
+    else:
+        existing.update({application.idempotency_key: application for application in pending})
+    return [existing[key] for _, key in keyed if key in existing], len(pending)
+
+
+@transaction.atomic
+def set_status(application, status_name):
+    """Move an application to another status, keeping the per-status counts in step"""
+    previous = Application.objects.select_for_update().values_list('status', flat=True).get(pk=application.pk)
+    if previous == status_name:
+        return application
+    Application.objects.filter(pk=application.pk).update(status=status_name)
+    _bump_counts(application.applicant, {previous: -1, status_name: 1})
+    application.status = status_name
+    return application
+
+
+def status_counts(applicant):
+    return dict(
+        ApplicationStatusCount.objects.filter(applicant=applicant, count__gt=0).values_list('status', 'count')
+    )
+
+
+def encode_cursor(application):
+    raw = f'{application.applied_at.isoformat()}|{application.pk}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """(applied_at, id) from a cursor; raises ValueError if it is malformed"""
+    try:
+        applied_at, pk = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(applied_at), int(pk)
+    except (UnicodeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def history(applicant, cursor=None, limit=PAGE_SIZE):
+    """One page of an applicant's applications, newest first; returns (applications, next cursor)"""
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    applications = Application.objects.filter(applicant=applicant)
+    if cursor:
+        applied_at, pk = decode_cursor(cursor)
+        applications = applications.filter(Q(applied_at__lt=applied_at) | Q(applied_at=applied_at, pk__lt=pk))
+    page = list(applications.order_by('-applied_at', '-id')[:limit + 1])
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    return page[:limit], next_cursor
+
+
+def serialize(application):
+    return {
+        'id': application.pk,
+        'job_id': application.job_id,
+        'job_title': application.job_title,
+        'company': application.company,
+        'applied_date': application.applied_at.date().isoformat(),
+        'applied_at': application.applied_at.isoformat(),
+        'status': application.status,
+        'cover_letter': application.cover_letter,
+        'resume_id': application.resume_id,
+    }
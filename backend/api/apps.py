@@ -4,3 +4,18 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from django.conf import settings
+
+        if settings.WARM_UP_IMPORTS:
+            from .providers import warm_up
+            warm_up()
+
+        if settings.JOB_SNAPSHOT['LOAD_ON_START']:
+            from .snapshot import load_snapshot
+            load_snapshot()
+
+        if settings.JOB_INGESTION['AUTOSTART']:
+            from .ingestion import start_scheduler
+            start_scheduler()
@@ -0,0 +1,197 @@
+"""Native async versions of the AI views, routed instead of views.py when AI_VIEWS_ASYNC is on.
+
+Served over ASGI (see gunicorn.conf.py), a worker keeps many of these in
+flight at once while they wait on Gemini or Perplexity, instead of holding a
+thread per request. DRF's ``@api_view`` cannot wrap coroutines, so these are
+plain Django async views with the same request and response shapes as their
+sync counterparts; prompts and response data come from the same helpers.
+"""
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from rest_framework.authentication import CSRFCheck
+
+from .market import market_stats
+from .profiles import set_profile_cookie
+from .prompts import (
+    career_advice_prompt, company_research_prompt, experience_level_prompt, job_types_for, market_search_prompt,
+    market_summary_prompt, personal_info_prompt, recommendation_prompt, resume_analysis_prompt, resume_assessment_prompt,
+)
+from .providers import ProviderError, gemini_generate_async, perplexity_chat_async, perplexity_configured
+from .renderers import JSONResponse, loads
+from .tracing import span
+from .views import job_matches_result, match_limit, personal_info_from_reply, resume_analysis_result
+
+
+def _error(message, status):
+    return JSONResponse({'status': 'error', 'message': message}, status=status)
+
+
+def _with_profile(data, profile):
+    token = profile.token()
+    data['profile_token'] = token
+    return set_profile_cookie(JSONResponse(data), token)
+
+
+async def _csrf_failure(request):
+    """As DRF's SessionAuthentication: a request from a logged-in session needs a CSRF token"""
+    user = getattr(request, 'user', None)
+    if user is None or not await sync_to_async(lambda: user.is_active)():
+        return None
+    check = CSRFCheck(lambda request: None)
+    check.process_request(request)
+    return check.process_view(request, None, (), {})
+
+
+def async_api_view(view):
+    """POST-only async JSON view; ``view(request, data)`` gets the parsed body like DRF's request.data"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'POST':
+            return JSONResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+        reason = await _csrf_failure(request)
+        if reason:
+            return JSONResponse({'detail': f'CSRF Failed: {reason}'}, status=403)
+        if request.content_type == 'application/json':
+            try:
+                data = loads(request.body or b'{}')
+            except ValueError as e:
+                return JSONResponse({'detail': f'JSON parse error - {e}'}, status=400)
+        else:
+            data = request.POST.dict()
+        if not isinstance(data, dict):
+            return JSONResponse({'detail': 'Expected a JSON object.'}, status=400)
+        return await view(request, data, *args, **kwargs)
+
+    # As @api_view does (CSRF is checked above instead); set directly so the view stays a coroutine function
+    wrapper.csrf_exempt = True
+    return wrapper
+
+
+@async_api_view
+async def analyze_resume(request, data):
+    """Analyze resume with Gemini AI"""
+    resume_text = data.get('resume_text', '')
+    if not resume_text:
+        return _error('No resume text provided', 400)
+    try:
+        response_text = await gemini_generate_async(resume_analysis_prompt(resume_text))
+    except Exception as e:
+        return _error(f'Analysis failed: {str(e)}', 500)
+    return JSONResponse({
+        'status': 'success',
+        'message': 'Resume analyzed successfully',
+        'analysis': response_text
+    })
+
+
+@async_api_view
+async def ai_analyze_resume(request, data):
+    """AI Resume Analysis; the extraction and assessment calls run concurrently"""
+    resume_text = data.get('resume_text', '')
+    analysis_type = data.get('analysis_type', 'comprehensive')
+    target_role = data.get('target_role', '')
+    if not resume_text:
+        return _error('No resume text provided', 400)
+    try:
+        extraction_text, analysis_text = await asyncio.gather(
+            gemini_generate_async(personal_info_prompt(resume_text)),
+            gemini_generate_async(resume_assessment_prompt(resume_text, target_role)),
+        )
+        extracted_info = personal_info_from_reply(extraction_text, resume_text)
+        result, profile = resume_analysis_result(extracted_info, analysis_text, analysis_type, target_role, resume_text)
+    except Exception as e:
+        return _error(f'AI analysis failed: {str(e)}', 500)
+    return _with_profile(result, profile)
+
+
+@async_api_view
+async def ai_match_jobs(request, data):
+    """AI Job Matching endpoint with accurate fresh graduate recommendations"""
+    resume_text = data.get('resume_text', '')
+    preferences = data.get('preferences', {})
+    use_perplexity = data.get('use_perplexity', True)
+    limit = match_limit(data.get('limit', 10))
+    if limit is None:
+        return _error('limit must be a number', 400)
+    try:
+        with span('classify_experience'):
+            experience_level = (await gemini_generate_async(experience_level_prompt(resume_text))).strip()
+        job_types, experience_filter = job_types_for(experience_level, resume_text)
+
+        jobs_from_perplexity = []
+        if use_perplexity and perplexity_configured():
+            try:
+                with span('market_search'):
+                    jobs_from_perplexity = await perplexity_chat_async(
+                        market_search_prompt(experience_filter, job_types), timeout=30
+                    )
+            except ProviderError as perplexity_error:
+                print(f"Perplexity API error: {perplexity_error}")
+
+        job_prompt = recommendation_prompt(
+            resume_text, experience_level, limit, experience_filter, job_types, jobs_from_perplexity
+        )
+        with span('generate_recommendations', {'ai.grounded': bool(jobs_from_perplexity)}):
+            job_text = await gemini_generate_async(job_prompt)
+
+        # Local ranking is CPU-bound and reads the shared catalogue; keep it off the event loop
+        result, user_profile = await sync_to_async(job_matches_result, thread_sensitive=False)(
+            resume_text, preferences, experience_level, job_types, job_text, limit, bool(jobs_from_perplexity)
+        )
+    except Exception as e:
+        return _error(f'Job matching failed: {str(e)}', 500)
+    return _with_profile(result, user_profile)
+
+
+@async_api_view
+async def ai_career_advice(request, data):
+    """AI Career Advice endpoint"""
+    prompt = career_advice_prompt(
+        data.get('resume_text', ''), data.get('career_goals', ''), data.get('current_challenges', '')
+    )
+    try:
+        response_text = await gemini_generate_async(prompt)
+    except Exception as e:
+        return _error(f'Career advice failed: {str(e)}', 500)
+    return JSONResponse({'status': 'success', 'advice': response_text})
+
+
+@async_api_view
+async def ai_research_market(request, data):
+    """AI Market Research endpoint, answered from catalogue aggregates"""
+    industry = data.get('industry', '')
+    location = data.get('location', '')
+    role = data.get('role', '')
+    try:
+        bucket, stats = market_stats.lookup(role=role, location=location, industry=industry)
+        if stats is None:
+            return _error('No market data available yet; the job catalogue is empty', 503)
+        research = {
+            'query': {'industry': industry, 'location': location, 'role': role},
+            'matched_bucket': dict(zip(('role', 'location', 'industry'), bucket)),
+            **stats
+        }
+        summary = None
+        if str(data.get('narrative', '')).strip().lower() in ('true', '1', 'yes', 'on'):
+            summary = await gemini_generate_async(market_summary_prompt(industry, location, role, stats))
+    except Exception as e:
+        return _error(f'Market research failed: {str(e)}', 500)
+    return JSONResponse({
+        'status': 'success',
+        'source': 'catalogue',
+        'research': research,
+        'narrative': summary
+    })
+
+
+@async_api_view
+async def ai_research_company(request, data):
+    """AI Company Research endpoint"""
+    prompt = company_research_prompt(data.get('company_name', ''), data.get('detailed', False))
+    try:
+        response_text = await gemini_generate_async(prompt)
+    except Exception as e:
+        return _error(f'Company research failed: {str(e)}', 500)
+    return JSONResponse({'status': 'success', 'company_research': response_text})
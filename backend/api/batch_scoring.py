@@ -0,0 +1,304 @@
+"""Recruiter batch scoring: rank a large batch of resumes against one job.
+
+1. Every resume is scored locally in one vectorised pass
+   (``comparison.job_scores``: TF-IDF similarity and skill coverage).
+2. Only the ``top_k`` best go to the provider. Resumes of at most
+   PACK_RESUME_MAX_CHARS are packed up to PACK_SIZE per prompt (and
+   PACK_MAX_CHARS in total) under opaque labels; longer ones go alone. A
+   packed reply that does not score every label exactly once is retried
+   one resume per prompt, so a confused reply never misattributes a score.
+3. Each prompt's scores are written to a checkpoint as they arrive (one
+   ``BatchScore`` row per resume, so any worker sees them and concurrent
+   runs of the same batch only add to each other). The batch ID is derived
+   from the job and the resumes, so running the same batch again after a
+   crash only scores what is still missing.
+
+``BatchScorer.run`` yields progress events for streaming; the last one
+carries the ranking.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .comparison import job_scores
+from .metrics import batch_scored_resumes
+from .models import BatchScore
+from .prompts import batch_scoring_prompt
+from .providers import ProviderError, gemini_generate
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+PRUNE_CACHE_KEY = 'batch_scoring:pruned'
+DECIMALS = 3
+
+
+def batch_id_for(job, resumes):
+    """Deterministic batch ID over the job's scored fields and every resume's ID and text"""
+    digest = hashlib.sha256()
+    for field in ('title', 'description', 'requirements'):
+        digest.update(str(job.get(field) or '').encode('utf-8') + b'\x1f')
+    digest.update('\x1f'.join(sorted(str(skill) for skill in job.get('skills_required') or [])).encode('utf-8'))
+    for resume in resumes:
+        digest.update(b'\x1e' + resume['id'].encode('utf-8') + b'\x1f' + resume['text'].encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+class DatabaseCheckpoint:
+    """Provider scores of a batch as ``BatchScore`` rows, where any worker can pick the batch up.
+
+    Rows are inserted, never rewritten: a resume scored by two concurrent
+    runs of the batch keeps the first score. Scores older than ``timeout``
+    seconds are ignored and deleted.
+    """
+
+    def __init__(self, batch_id, timeout=None):
+        self.batch_id = batch_id
+        self.timeout = timeout or settings.BATCH_SCORING['CHECKPOINT_TIMEOUT']
+
+    def _cutoff(self):
+        return timezone.now() - timedelta(seconds=self.timeout)
+
+    def load(self):
+        if cache.add(PRUNE_CACHE_KEY, True, settings.BATCH_SCORING['PRUNE_INTERVAL']):
+            BatchScore.objects.filter(created_at__lt=self._cutoff()).delete()
+        rows = BatchScore.objects.filter(batch_id=self.batch_id, created_at__gte=self._cutoff())
+        return {resume_id: {'score': score, 'reason': reason}
+                for resume_id, score, reason in rows.values_list('resume_id', 'score', 'reason')}
+
+    def add(self, results):
+        BatchScore.objects.bulk_create([
+            BatchScore(batch_id=self.batch_id, resume_id=resume_id, score=result['score'], reason=result['reason'])
+            for resume_id, result in results.items()
+        ], ignore_conflicts=True)
+
+
+class FileCheckpoint:
+    """Provider scores of a batch as JSON lines appended to ``path``, one line per prompt"""
+
+    def __init__(self, path, batch_id):
+        self.path = path
+        self.batch_id = batch_id
+
+    def load(self):
+        results = {}
+        try:
+            with open(self.path) as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return results
+        except ValueError:
+            # A line cut short by a crash; everything before it still counts
+            lines = self._intact_lines()
+        if lines and lines[0].get('batch_id') != self.batch_id:
+            raise ValueError(f'{self.path} is the checkpoint of another batch ({lines[0].get("batch_id")})')
+        for line in lines[1:]:
+            results.update(line['results'])
+        return results
+
+    def _intact_lines(self):
+        lines = []
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    lines.append(json.loads(line))
+                except ValueError:
+                    break
+        return lines
+
+    def add(self, results):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        new = not os.path.exists(self.path) or not os.path.getsize(self.path)
+        with open(self.path, 'a') as f:
+            if new:
+                f.write(json.dumps({'batch_id': self.batch_id}) + '\n')
+            f.write(json.dumps({'results': results}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _packs(candidates):
+    """Group (resume ID, text) pairs into prompts: short resumes together, long ones alone"""
+    options = settings.BATCH_SCORING
+    packs, pack, size = [], [], 0
+    for resume_id, text in candidates:
+        if len(text) > options['PACK_RESUME_MAX_CHARS']:
+            packs.append([(resume_id, text)])
+            continue
+        if pack and (len(pack) >= options['PACK_SIZE'] or size + len(text) > options['PACK_MAX_CHARS']):
+            packs.append(pack)
+            pack, size = [], 0
+        pack.append((resume_id, text))
+        size += len(text)
+    if pack:
+        packs.append(pack)
+    return packs
+
+
+def _parse_scores(reply, labels):
+    """{label: {'score', 'reason'}} if the reply scores every label exactly once, else None"""
+    match = re.search(r'\[.*\]', reply, re.DOTALL)
+    if not match:
+        return None
+    try:
+        items = json.loads(match.group())
+    except ValueError:
+        return None
+    scores = {}
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            return None
+        label, score = str(item.get('candidate', '')).strip(), item.get('score')
+        if label not in labels or label in scores or not isinstance(score, (int, float)) or not 0 <= score <= 10:
+            return None
+        scores[label] = {'score': float(score), 'reason': str(item.get('reason') or '')}
+    return scores if len(scores) == len(labels) else None
+
+
+class BatchScorer:
+    """Score ``resumes`` (dicts with ``id`` and ``text``) against ``job`` as described in the module docstring.
+
+    ``checkpoint`` defaults to a ``DatabaseCheckpoint`` for the batch ID;
+    ``generate`` is the provider call (a prompt in, reply text out).
+    """
+
+    def __init__(self, job, resumes, top_k=None, checkpoint=None, generate=gemini_generate, parallelism=None):
+        self.job = job
+        self.resumes = resumes
+        self.top_k = min(top_k or settings.BATCH_SCORING['TOP_K'], len(resumes))
+        self.batch_id = batch_id_for(job, resumes)
+        self.checkpoint = checkpoint or DatabaseCheckpoint(self.batch_id)
+        self.generate = generate
+        self.parallelism = parallelism or settings.BATCH_SCORING['PARALLELISM']
+        self.calls = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def _count(self, attribute):
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def _score_pack(self, pack):
+        """({resume ID: {'score', 'reason'}}, {resume ID: error}) for one prompt's worth of resumes.
+
+        An unusable packed reply is retried one resume per prompt.
+        """
+        labels = {f'C{i + 1}': resume_id for i, (resume_id, _) in enumerate(pack)}
+        self._count('calls')
+        try:
+            reply = self.generate(batch_scoring_prompt(self.job, [(label, text) for label, (_, text) in zip(labels, pack)]))
+        except ProviderError as e:
+            return {}, {resume_id: str(e) for resume_id, _ in pack}
+        scores = _parse_scores(reply, set(labels))
+        if scores is not None:
+            return {labels[label]: result for label, result in scores.items()}, {}
+        if len(pack) == 1:
+            return {}, {pack[0][0]: 'Unusable batch scoring reply'}
+        self._count('fallbacks')
+        results, errors = {}, {}
+        for resume in pack:
+            scored, failed = self._score_pack([resume])
+            results.update(scored)
+            errors.update(failed)
+        return results, errors
+
+    def run(self):
+        """Generator of progress events: started, prefiltered, scored (per prompt), done"""
+        started = time.monotonic()
+        done = self.checkpoint.load()
+        yield {'event': 'started', 'batch_id': self.batch_id, 'resumes': len(self.resumes),
+               'top_k': self.top_k, 'checkpointed': len(done)}
+
+        with span('batch_prefilter', {'batch.resumes': len(self.resumes)}):
+            score, text, coverage, matched, job_skills = job_scores(self.resumes, self.job)
+        order = sorted(range(len(self.resumes)), key=lambda i: (-score[i], i))
+        shortlist = order[:self.top_k]
+        prefilter_seconds = time.monotonic() - started
+        batch_scored_resumes.inc(len(self.resumes), stage='prefilter')
+        yield {'event': 'prefiltered', 'shortlisted': len(shortlist), 'seconds': round(prefilter_seconds, 3),
+               'resumes_per_minute': _per_minute(len(self.resumes), prefilter_seconds)}
+
+        pending = [(self.resumes[i]['id'], self.resumes[i]['text']) for i in shortlist
+                   if self.resumes[i]['id'] not in done]
+        batch_scored_resumes.inc(len(shortlist) - len(pending), stage='checkpoint')
+        failed = {}
+        provider_started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=self.parallelism, thread_name_prefix='batch-score')
+        # Each prompt runs in a copy of this context, so its spans join the request's trace
+        futures = {executor.submit(copy_context().run, self._score_pack, pack) for pack in _packs(pending)}
+        scored_now = 0
+        try:
+            while futures:
+                finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    results, errors = future.result()
+                    if errors:
+                        failed.update(errors)
+                        logger.warning('Batch scoring failed for %d resume(s) in %s: %s',
+                                       len(errors), self.batch_id, next(iter(errors.values())))
+                    if not results:
+                        continue
+                    self.checkpoint.add(results)
+                    done.update(results)
+                    scored_now += len(results)
+                    batch_scored_resumes.inc(len(results), stage='provider')
+                    elapsed = time.monotonic() - provider_started
+                    yield {'event': 'scored', 'scored': sum(1 for i in shortlist if self.resumes[i]['id'] in done),
+                           'total': len(shortlist), 'failed': len(failed), 'calls': self.calls,
+                           'resumes_per_minute': _per_minute(scored_now, elapsed)}
+        finally:
+            # A client that stops reading abandons the prompts not yet sent
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        ranking = []
+        for rank, i in enumerate(shortlist, 1):
+            resume_id = self.resumes[i]['id']
+            result = done.get(resume_id)
+            ranking.append({
+                'id': resume_id,
+                'prefilter_rank': rank,
+                'local_score': round(float(score[i]), DECIMALS),
+                'text_similarity': round(float(text[i]), DECIMALS),
+                'skill_coverage': round(float(coverage[i]), DECIMALS),
+                'matched_skills': sorted(matched[i]),
+                'missing_skills': sorted(job_skills - matched[i]),
+                'ai_score': result['score'] if result else None,
+                'ai_reason': result['reason'] if result else None,
+                'error': failed.get(resume_id),
+            })
+        ranking.sort(key=lambda entry: (entry['ai_score'] is None, -(entry['ai_score'] or 0), -entry['local_score']))
+
+        elapsed = time.monotonic() - started
+        provider_seconds = time.monotonic() - provider_started
+        yield {
+            'event': 'done',
+            'batch_id': self.batch_id,
+            'ranking': ranking,
+            'stats': {
+                'resumes': len(self.resumes),
+                'shortlisted': len(shortlist),
+                'scored': scored_now,
+                'from_checkpoint': len(shortlist) - len(pending),
+                'failed': len(failed),
+                'provider_calls': self.calls,
+                'unpacked_retries': self.fallbacks,
+                'seconds': round(elapsed, 3),
+                'resumes_per_minute': _per_minute(len(self.resumes), elapsed),
+                'provider_resumes_per_minute': _per_minute(scored_now, provider_seconds),
+            },
+        }
+
+
+def _per_minute(count, seconds):
+    return round(count * 60 / seconds, 1) if seconds > 0 else None
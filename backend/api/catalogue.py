@@ -0,0 +1,253 @@
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import cache_requests
+from .records import JobRecord
+
+# Namespace for content-derived job IDs. Never change this: every cached job,
+# bookmarked URL and application record keys on the IDs derived from it.
+JOB_ID_NAMESPACE = uuid.UUID('5b0d6c1e-8f3a-4d2b-9c7e-2a1f4e6b8d90')
+
+JOB_CACHE_PREFIX = 'job:'
+JOB_CACHE_TIMEOUT = 60 * 60 * 24 * 7  # Keep addressable jobs for a week
+
+# (token, [job IDs]) of the ingested catalogue most recently published by the
+# ingestion sweep; workers compare tokens to know when to sync.
+PUBLISHED_CATALOGUE_KEY = 'catalogue:published'
+
+
+def _canonical(value):
+    """Lower-case and collapse whitespace so cosmetic differences hash alike"""
+    return re.sub(r'\s+', ' ', str(value or '')).strip().lower()
+
+
+def _canonical_url(url):
+    """Drop scheme, query string and trailing slash from a source URL"""
+    url = _canonical(url)
+    url = re.sub(r'^https?://(www\.)?', '', url)
+    return url.split('?')[0].split('#')[0].rstrip('/')
+
+
+def stable_job_id(company, title, location, source_url=''):
+    """Deterministic job ID derived from the identifying fields of a posting"""
+    canonical = '\x1f'.join([
+        _canonical(company),
+        _canonical(title),
+        _canonical(location),
+        _canonical_url(source_url),
+    ])
+    return str(uuid.uuid5(JOB_ID_NAMESPACE, canonical))
+
+
+class JobCatalogue:
+    """In-process catalogue of every job this worker has produced or ingested.
+
+    Jobs are held as compact ``JobRecord`` mappings (``dict(job)`` gives the
+    API JSON back) and are also written to Django's cache, as plain dicts,
+    under their stable ID so that other workers can resolve ``jobs_detail``
+    and ``jobs_apply`` lookups.
+    Indexes built over the catalogue register with ``subscribe`` and are told
+    about every job that is added, changed or removed.
+
+    Jobs outside the published set are evicted, least recently refreshed
+    first, once there are more than ``JOB_CATALOGUE['MAX_JOBS']`` of them or
+    a job has not been refreshed for ``JOB_CATALOGUE['MAX_AGE_SECONDS']``.
+
+    Request threads and the ingestion scheduler share the catalogue, so
+    every read and write of its state, and every listener notification,
+    happens under one re-entrant lock. Cache round trips stay outside it.
+    """
+
+    def __init__(self):
+        self._jobs = OrderedDict()  # In refresh order, oldest first
+        self._refreshed = {}  # job ID -> time.monotonic() of the last add
+        self._listeners = []
+        self._published_ids = set()
+        self._published_token = None
+        self.version = 0  # Bumped whenever the set of jobs changes
+        self._lock = threading.RLock()
+
+    def subscribe(self, listener):
+        """Register an object with ``jobs_added(jobs)`` / ``jobs_removed(jobs)`` hooks"""
+        with self._lock:
+            self._listeners.append(listener)
+            if self._jobs:
+                listener.jobs_added(self.all())
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __contains__(self, job_id):
+        return job_id in self._jobs
+
+    def add(self, jobs):
+        """Add or refresh jobs; returns them unchanged for chaining"""
+        with self._lock:
+            self._store(jobs)
+        cache.set_many(
+            {f"{JOB_CACHE_PREFIX}{job['id']}": dict(job) for job in jobs},
+            JOB_CACHE_TIMEOUT,
+        )
+        return jobs
+
+    def refresh(self, job_ids):
+        """Mark unchanged jobs as still current and renew their shared cache entries"""
+        with self._lock:
+            jobs = [self._jobs[job_id] for job_id in job_ids if job_id in self._jobs]
+            for job in jobs:
+                self._touch(job['id'])
+        cache.set_many({f"{JOB_CACHE_PREFIX}{job['id']}": dict(job) for job in jobs}, JOB_CACHE_TIMEOUT)
+        return jobs
+
+    def restore(self, jobs):
+        """Load a catalogue snapshot as the published set.
+
+        The jobs are not re-shared through the cache (they came from the
+        snapshot every worker reads); the next ``sync`` applies whatever was
+        published after the snapshot was written.
+        """
+        jobs = list(jobs)
+        with self._lock:
+            self._published_ids = {job['id'] for job in jobs}
+            self._store(jobs)
+
+    def _store(self, jobs):
+        """Add new and changed jobs, telling the listeners before the catalogue changes (lock held).
+
+        A listener that fails leaves the catalogue as it was, so the next
+        add of the same jobs sees the change again and retries it instead of
+        leaving the catalogue and its indexes out of step.
+        """
+        changed = {}
+        for job in jobs:
+            if self._jobs.get(job['id']) != job:
+                changed[job['id']] = JobRecord.from_dict(job)  # The last copy of a repeated ID wins
+        if changed:
+            replaced = [self._jobs[job_id] for job_id in changed if job_id in self._jobs]
+            if replaced:
+                self._notify('jobs_removed', replaced)
+            self._notify('jobs_added', list(changed.values()))
+            self._jobs.update(changed)
+            self.version += 1
+        for job in jobs:
+            self._touch(job['id'])
+        self._evict()
+
+    def _touch(self, job_id):
+        self._jobs.move_to_end(job_id)
+        self._refreshed[job_id] = time.monotonic()
+
+    def _evict(self):
+        """Drop the least recently refreshed unpublished jobs over the size or age limit (lock held)"""
+        options = settings.JOB_CATALOGUE
+        stale_before = time.monotonic() - options['MAX_AGE_SECONDS']
+        excess = len(self._jobs) - len(self._published_ids) - options['MAX_JOBS']
+        doomed = []
+        for job_id in self._jobs:
+            if excess <= 0 and self._refreshed.get(job_id, 0) >= stale_before:
+                break  # Everything after this was refreshed more recently
+            if job_id in self._published_ids:
+                continue  # The published set is bounded by ingestion expiry instead
+            doomed.append(job_id)
+            excess -= 1
+        evicted = [self._jobs.pop(job_id) for job_id in doomed]
+        for job_id in doomed:
+            del self._refreshed[job_id]
+        if evicted:
+            self.version += 1
+            self._notify('jobs_removed', evicted)
+
+    def remove(self, job_ids):
+        """Drop jobs (e.g. expired postings); returns the jobs that were removed"""
+        job_ids = list(job_ids)
+        with self._lock:
+            removed = [self._jobs.pop(job_id) for job_id in job_ids if job_id in self._jobs]
+            for job in removed:
+                self._refreshed.pop(job['id'], None)
+            if removed:
+                self.version += 1
+                self._notify('jobs_removed', removed)
+        cache.delete_many([f'{JOB_CACHE_PREFIX}{job_id}' for job_id in job_ids])
+        return removed
+
+    def get(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            cache_requests.inc(cache='catalogue', result='hit')
+            return job
+        job = cache.get(f'{JOB_CACHE_PREFIX}{job_id}')
+        cache_requests.inc(cache='catalogue', result='miss' if job is None else 'shared_hit')
+        if job is None:
+            return None
+        with self._lock:
+            if job_id in self._jobs:
+                return self._jobs[job_id]  # Filled by another thread meanwhile
+            job = JobRecord.from_dict(job)
+            self._notify('jobs_added', [job])
+            self._jobs[job_id] = job
+            self._touch(job_id)
+            self.version += 1
+            self._evict()
+        return job
+
+    def all(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def ingested(self):
+        """Jobs that belong to the published, pre-ingested catalogue"""
+        with self._lock:
+            return [self._jobs[job_id] for job_id in self._published_ids if job_id in self._jobs]
+
+    @property
+    def published_token(self):
+        """Token of the published catalogue this worker last synced to ('' if none)"""
+        return self._published_token or ''
+
+    def publish(self, job_ids):
+        """Record ``job_ids`` as the shared ingested catalogue for all workers"""
+        with self._lock:
+            self._published_ids = set(job_ids)
+            self._published_token = token = uuid.uuid4().hex
+        cache.set(PUBLISHED_CATALOGUE_KEY, (token, sorted(job_ids)), None)
+
+    def sync(self):
+        """Pull the latest published catalogue into this worker, if it changed.
+
+        Only the difference is applied: new IDs are fetched from the cache in
+        one round trip and IDs that were dropped from the published set are
+        removed. Jobs this worker generated on its own are left alone.
+        """
+        published = cache.get(PUBLISHED_CATALOGUE_KEY)
+        if not published or published[0] == self._published_token:
+            return False
+        token, job_ids = published
+        job_ids = set(job_ids)
+        missing = [job_id for job_id in job_ids if job_id not in self._jobs]
+        found = cache.get_many([f'{JOB_CACHE_PREFIX}{job_id}' for job_id in missing]) if missing else {}
+        with self._lock:
+            new_jobs = [JobRecord.from_dict(job) for job in found.values() if job['id'] not in self._jobs]
+            if new_jobs:
+                self._notify('jobs_added', new_jobs)
+                for job in new_jobs:
+                    self._jobs[job['id']] = job
+                    self._touch(job['id'])
+                self.version += 1
+            self.remove(self._published_ids - job_ids)
+            self._published_ids = job_ids
+            self._published_token = token
+            self._evict()
+        return True
+
+    def _notify(self, hook, jobs):
+        for listener in self._listeners:
+            getattr(listener, hook)(jobs)
+
+
+catalogue = JobCatalogue()
@@ -0,0 +1,234 @@
+"""Comparing a shortlist of resumes with each other and with job descriptions.
+
+Every document in the batch is tokenized once and turned into a row of a
+TF-IDF matrix (sublinear term frequency, IDF over the batch, L2-normalised),
+and into a row of a boolean skill matrix. The resume-to-job and
+resume-to-resume matrices are then a handful of matrix products: cosine
+similarity of the TF-IDF rows, the share of each job's skills a resume
+covers, and the skill Jaccard index between resumes. No LLM call is made.
+
+Terms that occur in a single document cannot contribute to any dot product,
+so they only count towards that row's norm and are left out of the matrix;
+this keeps its width to the vocabulary the documents actually share.
+"""
+from collections import Counter
+
+import numpy as np
+
+from .matching import MAX_SKILL_WORDS, SKILLS, extract_skill_ids, normalize_skill, tokenize
+
+TEXT_WEIGHT = 0.5  # Blend of text similarity and skill overlap in 'score'
+DECIMALS = 3
+MAX_JOB_SKILLS = 100
+MAX_SKILL_LENGTH = 100
+
+
+def _tfidf_entries(token_lists):
+    """Sparse TF-IDF weights as (rows, columns, weights, row norms, document frequency)"""
+    n = len(token_lists)
+    vocabulary, rows, cols, counts = {}, [], [], []
+    for row, tokens in enumerate(token_lists):
+        for term, count in Counter(tokens).items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    document_frequency = np.bincount(cols, minlength=len(vocabulary))
+    idf = (np.log((1 + n) / (1 + document_frequency)) + 1).astype(np.float32)
+    weights = (1 + np.log(np.asarray(counts, dtype=np.float32))) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n)).astype(np.float32)
+    return rows, cols, weights, norms, document_frequency
+
+
+def tfidf_matrix(token_lists):
+    """L2-normalised TF-IDF rows (float32) over the terms shared by at least two documents"""
+    n = len(token_lists)
+    rows, cols, weights, norms, document_frequency = _tfidf_entries(token_lists)
+    shared = document_frequency[cols] > 1
+    shared_terms = np.flatnonzero(document_frequency > 1)
+    column = np.full(len(document_frequency), -1, dtype=np.int64)
+    column[shared_terms] = np.arange(len(shared_terms))
+
+    matrix = np.zeros((n, len(shared_terms)), dtype=np.float32)
+    matrix[rows[shared], column[cols[shared]]] = weights[shared]
+    matrix /= np.where(norms == 0, 1, norms)[:, None]
+    return matrix
+
+
+def job_error(job):
+    """Why a request-supplied job object cannot be scored, or None if it can"""
+    for field in ('title', 'description', 'requirements'):
+        if job.get(field) is not None and not isinstance(job[field], str):
+            return f'{field} must be a string'
+    skills = job.get('skills_required')
+    if skills is None:
+        return None
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        return 'skills_required must be a list of strings'
+    if len(skills) > MAX_JOB_SKILLS or any(len(skill) > MAX_SKILL_LENGTH for skill in skills):
+        return f'List at most {MAX_JOB_SKILLS} skills of at most {MAX_SKILL_LENGTH} characters each'
+    return None
+
+
+def _job_text(job):
+    return ' '.join(str(job.get(field) or '') for field in ('title', 'description', 'requirements'))
+
+
+class RequestSkills:
+    """Skill IDs for one request's documents, without growing the shared ``SKILLS``.
+
+    Skills a request lists that ``SKILLS`` already knows keep their IDs;
+    the rest get negative IDs local to this object and are found in resumes
+    as whole 1-3 word phrases.
+    """
+
+    def __init__(self):
+        self._local = {}  # phrase -> negative ID
+        self._names = []
+
+    def listed(self, skills):
+        """IDs of a job's ``skills_required`` (a list of strings, validated by the caller)"""
+        ids = set()
+        for skill in skills or []:
+            name = normalize_skill(skill)
+            if not name:
+                continue
+            skill_id = SKILLS.ids.get(name)
+            if skill_id is None:
+                phrase = ' '.join(tokenize(name))
+                if not phrase:
+                    continue
+                skill_id = self._local.get(phrase)
+                if skill_id is None:
+                    self._names.append(name)
+                    skill_id = self._local[phrase] = -len(self._names)
+            ids.add(skill_id)
+        return ids
+
+    def found(self, tokens):
+        """IDs of the skills mentioned in tokenized text"""
+        found = extract_skill_ids(None, tokens)
+        if self._local:
+            phrases = {' '.join(tokens[start:start + n]) for n in range(1, MAX_SKILL_WORDS + 1)
+                       for start in range(len(tokens) - n + 1)}
+            found.update(skill_id for phrase, skill_id in self._local.items() if phrase in phrases)
+        return found
+
+    def name(self, skill_id):
+        return SKILLS.terms[skill_id] if skill_id >= 0 else self._names[-skill_id - 1]
+
+    def names(self, ids):
+        return sorted(self.name(skill_id) for skill_id in ids)
+
+
+def _job_skills(job, tokens, skills):
+    return skills.listed(job.get('skills_required')) | skills.found(tokens)
+
+
+def _rounded(matrix):
+    return np.round(matrix.astype(np.float64), DECIMALS).tolist()
+
+
+def compare(resumes, jobs):
+    """Similarity matrices and skill breakdowns for ``resumes`` x ``jobs`` and ``resumes`` x ``resumes``.
+
+    ``resumes`` are dicts with ``id`` and ``text``; ``jobs`` are job dicts
+    (``id``, ``title``, ``description``, optional ``skills_required``).
+    """
+    resume_tokens = [tokenize(resume['text']) for resume in resumes]
+    job_tokens = [tokenize(_job_text(job)) for job in jobs]
+
+    request_skills = RequestSkills()
+    job_skills = [_job_skills(job, tokens, request_skills) for job, tokens in zip(jobs, job_tokens)]
+    resume_skills = [request_skills.found(tokens) for tokens in resume_tokens]
+
+    skill_ids = sorted(set().union(*resume_skills, *job_skills))
+    column = {skill_id: i for i, skill_id in enumerate(skill_ids)}
+    resume_mask = np.zeros((len(resumes), len(skill_ids)), dtype=np.float32)
+    for row, skills in enumerate(resume_skills):
+        resume_mask[row, [column[skill_id] for skill_id in skills]] = 1.0
+    job_mask = np.zeros((len(jobs), len(skill_ids)), dtype=np.float32)
+    for row, skills in enumerate(job_skills):
+        job_mask[row, [column[skill_id] for skill_id in skills]] = 1.0
+
+    vectors = tfidf_matrix(resume_tokens + job_tokens)
+    resume_vectors, job_vectors = vectors[:len(resumes)], vectors[len(resumes):]
+
+    # Resume x resume: cosine similarity and skill Jaccard
+    peer_text = resume_vectors @ resume_vectors.T
+    np.fill_diagonal(peer_text, [1.0 if tokens else 0.0 for tokens in resume_tokens])  # Pruned terms still count
+    peer_shared = resume_mask @ resume_mask.T
+    resume_counts = resume_mask.sum(axis=1)
+    peer_union = resume_counts[:, None] + resume_counts[None, :] - peer_shared
+    peer_skills = np.divide(peer_shared, peer_union, out=np.zeros_like(peer_shared), where=peer_union > 0)
+    peer_score = TEXT_WEIGHT * peer_text + (1 - TEXT_WEIGHT) * peer_skills
+
+    # Resume x job: cosine similarity and the share of each job's skills covered
+    job_text = resume_vectors @ job_vectors.T
+    job_counts = job_mask.sum(axis=1)
+    coverage = np.divide(resume_mask @ job_mask.T, job_counts[None, :],
+                         out=np.zeros((len(resumes), len(jobs)), dtype=np.float32), where=job_counts[None, :] > 0)
+    job_score = TEXT_WEIGHT * job_text + (1 - TEXT_WEIGHT) * coverage
+
+    closest = peer_score.copy()
+    np.fill_diagonal(closest, -np.inf)
+    best_jobs = job_score.argmax(axis=1) if len(jobs) else None
+    closest_peers = closest.argmax(axis=1) if len(resumes) > 1 else None
+
+    names = request_skills.names
+
+    return {
+        'resumes': [{
+            'id': resume['id'],
+            'skills': names(resume_skills[i]),
+            'best_job': jobs[best_jobs[i]]['id'] if best_jobs is not None else None,
+            'closest_resume': resumes[closest_peers[i]]['id'] if closest_peers is not None else None,
+        } for i, resume in enumerate(resumes)],
+        'jobs': [{'id': job['id'], 'title': job.get('title', ''), 'skills': names(job_skills[j])}
+                 for j, job in enumerate(jobs)],
+        'resume_job': {
+            'score': _rounded(job_score),
+            'text': _rounded(job_text),
+            'skills': _rounded(coverage),
+            'breakdown': [[{
+                'shared': names(resume_skills[i] & job_skills[j]),
+                'missing': names(job_skills[j] - resume_skills[i]),
+            } for j in range(len(jobs))] for i in range(len(resumes))],
+        },
+        'resume_resume': {
+            'score': _rounded(peer_score),
+            'text': _rounded(peer_text),
+            'skills': _rounded(peer_skills),
+        },
+    }
+
+
+def job_scores(resumes, job):
+    """Local score of every resume against one job, in one vectorised pass.
+
+    The same blend as ``compare``'s resume x job scores, but only the dot
+    products with the job's vector are formed, so memory stays linear in the
+    batch size. Returns numpy arrays (score, text similarity, skill
+    coverage), the names of the job's skills each resume has, and the names
+    of the job's skills.
+    """
+    resume_tokens = [tokenize(resume['text']) for resume in resumes]
+    job_tokens = tokenize(_job_text(job))
+    rows, cols, weights, norms, document_frequency = _tfidf_entries(resume_tokens + [job_tokens])
+
+    job_row = len(resumes)
+    job_vector = np.zeros(len(document_frequency), dtype=np.float32)
+    on_job = rows == job_row
+    job_vector[cols[on_job]] = weights[on_job]
+    dots = np.bincount(rows, weights=weights * job_vector[cols], minlength=job_row + 1)[:job_row]
+    norms = np.where(norms == 0, 1, norms)
+    text = (dots / (norms[:job_row] * norms[job_row])).astype(np.float32)
+
+    skills = RequestSkills()
+    job_skills = _job_skills(job, job_tokens, skills)
+    matched = [skills.found(tokens) & job_skills for tokens in resume_tokens]
+    coverage = np.asarray([len(ids) for ids in matched], dtype=np.float32) / max(len(job_skills), 1)
+    score = TEXT_WEIGHT * text + (1 - TEXT_WEIGHT) * coverage
+    return (score, text, coverage, [{skills.name(skill_id) for skill_id in ids} for ids in matched],
+            {skills.name(skill_id) for skill_id in job_skills})
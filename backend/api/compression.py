@@ -0,0 +1,57 @@
+"""Negotiated response compression: brotli when installed and accepted, else gzip.
+
+gzip output carries the random-length filename padding Django's
+``GZipMiddleware`` adds against BREACH; brotli has no header field to pad.
+"""
+from django.conf import settings
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'application/xml', 'image/svg+xml')
+GZIP_MAX_RANDOM_BYTES = 100  # As GZipMiddleware
+
+
+def available_encodings():
+    """Supported content codings, most preferred first"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encoding, encodings=None):
+    """The first of ``encodings`` with the highest non-zero q-value in ``accept_encoding``, or None"""
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, *params = item.split(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in encodings or available_encodings():
+        weight = weights.get(coding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compressible(response):
+    content_type = response.get('Content-Type', '').partition(';')[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=settings.COMPRESSION['BROTLI_QUALITY'])
+    return compress_string(content, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
@@ -0,0 +1,84 @@
+"""Single-pass filtering and facet counting for job search.
+
+One walk over the candidate jobs records which jobs match the text query and
+which pass each filter (as boolean bitmaps, one entry per job) and the
+posting list of jobs carrying each facet value. Counts for every facet value
+then come from bitmap ANDs gathered over those posting lists. A facet's
+count ignores that facet's own filter, so the UI can show how many results
+each alternative value would give.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+FACET_FIELDS = ('location', 'job_type', 'experience_level')
+
+SearchResult = namedtuple('SearchResult', ['jobs', 'facets'])
+
+
+def _matches_query(job, query):
+    return (query in job.get('title', '').lower()
+            or query in job.get('company', '').lower()
+            or any(query in skill.lower() for skill in job.get('skills_required', [])))
+
+
+def _passes_filter(job, field, value):
+    if field == 'location':
+        return value in job.get('location', '').lower()
+    return value == str(job.get(field, '')).lower()
+
+
+class FacetedSearch:
+    def __init__(self, jobs, fields=FACET_FIELDS):
+        self.jobs = list(jobs)
+        self.fields = fields
+
+    def search(self, query='', filters=None, predicate=None):
+        """Filter the jobs and count facet values in the same pass.
+
+        ``filters`` maps facet fields to the requested value (empty means no
+        filter); ``predicate`` is an optional extra per-job condition, such as
+        a salary floor, that applies to both results and counts.
+        """
+        query = query.lower()
+        filters = {field: str(value).lower() for field, value in (filters or {}).items() if value}
+        size = len(self.jobs)
+
+        base = np.ones(size, dtype=bool)  # Jobs matching the query and predicate
+        passing = {field: np.ones(size, dtype=bool) for field in filters}
+        postings = {field: {} for field in self.fields}
+        labels = {field: {} for field in self.fields}
+
+        for position, job in enumerate(self.jobs):
+            if (query and not _matches_query(job, query)) or (predicate is not None and not predicate(job)):
+                base[position] = False
+            for field, value in filters.items():
+                if not _passes_filter(job, field, value):
+                    passing[field][position] = False
+            for field in self.fields:
+                label = str(job.get(field) or '').strip()
+                if label:
+                    key = label.lower()
+                    postings[field].setdefault(key, []).append(position)
+                    labels[field].setdefault(key, label)
+
+        selected = base.copy()
+        for bits in passing.values():
+            selected &= bits
+
+        facets = {}
+        for field in self.fields:
+            scope = base.copy()
+            for other, bits in passing.items():
+                if other != field:
+                    scope &= bits
+            counts = [
+                {'value': labels[field][key], 'count': int(np.count_nonzero(scope[positions]))}
+                for key, positions in postings[field].items()
+            ]
+            facets[field] = sorted(
+                (entry for entry in counts if entry['count']),
+                key=lambda entry: (-entry['count'], entry['value']),
+            )
+
+        return SearchResult([self.jobs[i] for i in np.flatnonzero(selected)], facets)
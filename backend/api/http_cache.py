@@ -0,0 +1,91 @@
+"""Response caching with strong ETags and conditional GET for read endpoints.
+
+``cached_response`` stores each view's response data in Django's cache under
+a key built from the path, the normalised query string (parameters sorted,
+values lower-cased), an optional per-user fingerprint and an optional data
+version. A repeat request is answered from the cache, and a request whose
+``If-None-Match`` names the cached ETag gets a 304 without the view running.
+"""
+import hashlib
+from functools import wraps
+
+from django.core.cache import cache
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+
+from .metrics import cache_requests
+from .renderers import dumps
+from .tracing import current_span
+
+RESPONSE_CACHE_PREFIX = 'response:'
+
+
+def _digest(value):
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def normalized_query(request):
+    """Query parameters as a canonical string: keys sorted, values lower-cased, blanks dropped"""
+    items = sorted(
+        (key, value.strip().lower())
+        for key, values in request.GET.lists()
+        for value in values
+        if value.strip()
+    )
+    return '&'.join(f'{key}={value}' for key, value in items)
+
+
+def response_etag(data):
+    """Strong ETag over the canonical JSON form of the response data"""
+    return f'"{hashlib.sha256(dumps(data, sort_keys=True)).hexdigest()[:32]}"'
+
+
+def _not_modified(request, etag):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    # Weak comparison: compression weakens the ETag on its way out (W/"...")
+    etags = [tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(if_none_match)]
+    return '*' in etags or etag in etags
+
+
+def cached_response(timeout, fingerprint=None, version=None, vary=('Accept',)):
+    """Cache a GET view's 200 responses and answer conditional requests.
+
+    ``fingerprint(request)`` distinguishes users whose responses differ (its
+    result is part of the key, and responses become ``private``);
+    ``version()`` identifies the current state of the underlying data so a
+    change invalidates every entry at once. A view can opt a response out by
+    setting ``Cache-Control: no-store`` on it.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+
+            user = fingerprint(request) if fingerprint else ''
+            parts = [request.path, normalized_query(request), user, str(version() if version else '')]
+            key = RESPONSE_CACHE_PREFIX + _digest('\x1f'.join(parts))
+
+            entry = cache.get(key)
+            result = 'miss' if entry is None else 'hit'
+            cache_requests.inc(cache='response', result=result)
+            current_span().set_attribute('http.response_cache', result)
+            if entry is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or 'no-store' in response.get('Cache-Control', ''):
+                    return response
+                entry = (response_etag(response.data), response.data)
+                cache.set(key, entry, timeout)
+
+            etag, data = entry
+            response = HttpResponseNotModified() if _not_modified(request, etag) else Response(data)
+            response['ETag'] = etag
+            patch_cache_control(response, max_age=timeout, **({'private': True} if user else {'public': True}))
+            patch_vary_headers(response, vary + (('Cookie',) if fingerprint else ()))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,217 @@
+"""Scheduled ingestion of job postings into the shared job catalogue.
+
+A sweep runs every configured query against every configured location
+through the AI providers, parses the postings and adds them to the
+catalogue, then publishes the resulting set of IDs so every worker can
+``catalogue.sync()`` to it. Each (query, location) pair keeps a watermark
+(the newest posted date seen so far) so a sweep only re-processes postings
+that are newer than the previous run, and postings that have not been seen
+for ``EXPIRE_AFTER_SECONDS`` are expired.
+"""
+import hashlib
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .catalogue import catalogue
+from .memory import MemoryBudgetExceeded
+from .parsing import parse_jobs_from_ai_response
+from .providers import ProviderError, gemini_configured, gemini_generate, perplexity_chat
+from .snapshot import write_snapshot
+
+WATERMARK_PREFIX = 'ingest:watermark:'
+LAST_SEEN_KEY = 'ingest:last_seen'
+SWEEP_LOCK_KEY = 'ingest:lock'
+
+INGESTION_PROMPT = """Find up to {limit} current job postings for "{query}" in {location}.
+Prefer the most recently published postings from company career pages, LinkedIn and other job boards.
+
+Return ONLY a valid JSON array. Each element must have:
+title, company, location, job_type, experience_level, salary (as written in the posting),
+description (1-2 sentences), skills_required (list), apply_url, posted_date (YYYY-MM-DD)."""
+
+
+def fetch_postings(query, location, limit=25, timeout=30):
+    """Parsed (not yet catalogued) postings for one query/location pair"""
+    prompt = INGESTION_PROMPT.format(query=query, location=location, limit=limit)
+    try:
+        content = perplexity_chat(
+            prompt,
+            system="You are a job search assistant that finds real, current job listings from the web. Always return valid JSON data.",
+            timeout=timeout,
+            max_tokens=4000,
+            temperature=0.2,
+        )
+    except ProviderError:
+        if not gemini_configured():
+            raise
+        content = gemini_generate(prompt)
+    return parse_jobs_from_ai_response(content, remember=False)
+
+
+def watermark_key(query, location):
+    canonical = f'{str(query).strip().lower()}\x1f{str(location).strip().lower()}'
+    return WATERMARK_PREFIX + hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def collect(queries, locations, limit=50, fetch=fetch_postings, parallelism=None, deadline=None):
+    """Fetch every (query, location) pair concurrently and merge the postings.
+
+    At most ``parallelism`` provider calls run at once. Postings are
+    deduplicated by their stable ID as each pair completes; once ``deadline``
+    seconds have passed, pairs still outstanding are abandoned and whatever
+    has arrived is returned. Pairs beyond ``MAX_PAIRS`` are not fetched and
+    are counted as ``dropped``. Returns (jobs, stats).
+    """
+    options = settings.JOB_COLLECTION
+    parallelism = parallelism or options['PARALLELISM']
+    deadline = deadline or options['DEADLINE_SECONDS']
+    pairs = [(str(query).strip(), str(location).strip()) for query in queries for location in locations]
+    dropped = pairs[options['MAX_PAIRS']:]
+    pairs = pairs[:options['MAX_PAIRS']]
+    per_pair = max(5, math.ceil(limit / max(len(pairs), 1)))
+    started = time.monotonic()
+    # No single provider call may outlive the overall deadline
+    timeout = min(30, deadline)
+
+    merged = {}
+    stats = {'pairs': len(pairs), 'completed': 0, 'failed': 0, 'timed_out': 0, 'duplicates': 0,
+             'dropped': len(dropped)}
+    if dropped:
+        print(f"Collection limited to {len(pairs)} query/location pairs; dropped {len(dropped)}, "
+              f"from {dropped[0]!r}")
+    executor = ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix='job-collect')
+    # Each call runs in a copy of this context, so its spans join the request's trace
+    pending = {executor.submit(copy_context().run, fetch, query, location, per_pair, timeout): (query, location)
+               for query, location in pairs}
+    try:
+        while pending:
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                query, location = pending.pop(future)
+                try:
+                    postings = future.result()
+                except (ProviderError, MemoryBudgetExceeded) as e:
+                    stats['failed'] += 1
+                    print(f"Collection failed for {query!r} in {location!r}: {e}")
+                    continue
+                stats['completed'] += 1
+                for job in postings:
+                    if job['id'] in merged:
+                        stats['duplicates'] += 1
+                    else:
+                        merged[job['id']] = job
+    finally:
+        stats['timed_out'] = len(pending)
+        # Don't block the response on stragglers; queued pairs never start
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    stats['elapsed_seconds'] = round(time.monotonic() - started, 2)
+    return list(merged.values())[:limit], stats
+
+
+def sweep(queries=None, locations=None, fetch=fetch_postings):
+    """Run one ingestion pass and publish the updated catalogue; returns counters"""
+    options = settings.JOB_INGESTION
+    queries = queries or options['QUERIES']
+    locations = locations or options['LOCATIONS']
+
+    catalogue.sync()
+    published = {job['id'] for job in catalogue.ingested()}
+    last_seen = cache.get(LAST_SEEN_KEY) or {}
+    now = time.time()
+    stats = {'pairs': 0, 'fetched': 0, 'ingested': 0, 'unchanged': 0, 'expired': 0, 'failed': 0}
+
+    for query in queries:
+        for location in locations:
+            stats['pairs'] += 1
+            key = watermark_key(query, location)
+            watermark = cache.get(key, '')
+            try:
+                postings = fetch(query, location)
+            except (ProviderError, MemoryBudgetExceeded) as e:
+                stats['failed'] += 1
+                print(f"Ingestion failed for {query!r} in {location!r}: {e}")
+                continue
+
+            fresh, unchanged = [], []
+            newest = watermark
+            for job in postings:
+                last_seen[job['id']] = now
+                published.add(job['id'])
+                # Already catalogued and not newer than the last run: nothing to redo
+                if job['id'] in catalogue and str(job['posted_date']) <= watermark:
+                    unchanged.append(job['id'])
+                    continue
+                fresh.append(job)
+                newest = max(newest, str(job['posted_date']))
+            catalogue.add(fresh)
+            # Still being published: keep their shared entries from expiring
+            catalogue.refresh(unchanged)
+            cache.set(key, newest, None)
+            stats['unchanged'] += len(unchanged)
+            stats['fetched'] += len(postings)
+            stats['ingested'] += len(fresh)
+
+    # Postings that have stopped appearing in any sweep expire
+    cutoff = now - options['EXPIRE_AFTER_SECONDS']
+    expired = [job_id for job_id, seen in last_seen.items() if seen < cutoff]
+    for job_id in expired:
+        del last_seen[job_id]
+    stats['expired'] = len(catalogue.remove(expired))
+
+    cache.set(LAST_SEEN_KEY, last_seen, None)
+    live = (published - set(expired)) & {job['id'] for job in catalogue.all()}
+    # Snapshot before publishing, so workers that sync to this set can map it
+    if settings.JOB_SNAPSHOT['PATH']:
+        try:
+            write_snapshot([catalogue.get(job_id) for job_id in live], settings.JOB_SNAPSHOT['PATH'])
+        except OSError as e:
+            print(f"Writing the catalogue snapshot failed: {e}")
+    catalogue.publish(live)
+    return stats
+
+
+class IngestionScheduler(threading.Thread):
+    """Daemon thread that sweeps every ``INTERVAL_SECONDS``.
+
+    A cache lock makes sure only one process per interval actually sweeps
+    when several workers run the scheduler against a shared cache.
+    """
+
+    daemon = True
+
+    def __init__(self, interval=None):
+        super().__init__(name='job-ingestion')
+        self.interval = interval or settings.JOB_INGESTION['INTERVAL_SECONDS']
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            if cache.add(SWEEP_LOCK_KEY, os.getpid(), self.interval):
+                try:
+                    stats = sweep()
+                    print(f"Job ingestion sweep finished: {stats}")
+                except Exception as e:
+                    print(f"Job ingestion sweep failed: {e}")
+            self.stopped.wait(self.interval)
+
+
+_scheduler = None
+
+
+def start_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = IngestionScheduler()
+        _scheduler.start()
+    return _scheduler
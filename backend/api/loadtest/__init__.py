@@ -0,0 +1,5 @@
+"""Load testing: fake AI providers, a gunicorn harness, traffic scenarios and JSON reports.
+
+``manage.py loadtest`` replays a traffic mix against a node and saves the
+report; ``manage.py bench_serving`` compares the gunicorn serving profiles.
+"""
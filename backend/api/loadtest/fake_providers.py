@@ -0,0 +1,262 @@
+"""A stand-in for the Gemini and Perplexity APIs with configurable latency and error rates.
+
+Point the app at it with ``GEMINI_API_BASE=http://host:port`` and
+``PERPLEXITY_API_URL=http://host:port/chat/completions``; any API key is
+accepted. Replies follow the prompt's requested shape (a JSON job array, a
+JSON object of personal details or of a section assessment, candidate
+scores, an experience level or free text), so the app's parsing and
+fallbacks run as they would in production. ``GET /stats`` returns the calls
+and injected errors per provider. Run it on its own with
+``python -m api.loadtest.fake_providers``.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+GEMINI_PATH = re.compile(r'^/v1beta/models/([^/:]+):generateContent$')
+PERPLEXITY_PATH = '/chat/completions'
+ERROR_STATUSES = (429, 500, 503)
+
+ANALYSIS = (
+    "1. Skill assessment: Python 8/10, Django 7/10, React 6/10, SQL 7/10.\n"
+    "2. Experience evaluation: two internships and several full-stack projects show practical delivery.\n"
+    "3. Strengths: backend fundamentals, API design, version control. Improve: testing, system design.\n"
+    "4. Career recommendations: Junior Backend Developer, Software Engineer Trainee, Associate Engineer.\n"
+    "5. Job match score for entry-level positions: 8/10.\n"
+) * 4
+
+PERSONAL_INFO = {
+    'name': 'Jane Doe',
+    'email': 'jane.doe@example.com',
+    'phone': '+91 98765 43210',
+    'skills': ['Python', 'Django', 'React', 'SQL', 'Docker', 'Git'],
+    'experience_years': 'Fresh graduate',
+    'education': 'B.Tech Computer Science',
+    'location': 'Bangalore',
+}
+
+SECTION_ASSESSMENT = {
+    'score': 7,
+    'strengths': ['Concrete, measurable outcomes', 'Relevant backend stack'],
+    'improvements': ['Quantify the scale of each project', 'Lead with the most recent work'],
+    'summary': 'Solid for entry-level backend roles; more specifics on impact would strengthen it.',
+}
+
+
+def _jobs(count):
+    return [{
+        'title': f'Junior Software Developer {i}',
+        'company': f'Example Technologies {i % 7}',
+        'location': ('Bangalore, India', 'Remote', 'Pune, India')[i % 3],
+        'job_type': 'Full-time',
+        'experience_level': 'Entry Level',
+        'salary_range': f'{4 + i % 5}-{8 + i % 5} LPA',
+        'description': 'Build and operate Django services and REST APIs with a small product team. ' * 3,
+        'skills_required': ['Python', 'Django', 'SQL', 'Git'],
+        'apply_url': f'https://careers.example.com/jobs/{i}',
+    } for i in range(count)]
+
+
+def _candidate_scores(prompt):
+    """A stable score for every <<<LABEL ... LABEL>>> resume in a batch scoring prompt"""
+    return [{
+        'candidate': label,
+        'score': 1 + zlib.crc32(text.encode()) % 10,
+        'reason': 'Relevant backend experience; limited production scale.',
+    } for label, text in re.findall(r'<<<(\w+)\n(.*?)\n\1>>>', prompt, re.DOTALL)]
+
+
+def reply_text(prompt):
+    """A reply in the shape the prompt asks for"""
+    if 'Return ONLY one of these' in prompt:
+        return 'Fresh Graduate'
+    if '"candidate"' in prompt:
+        return json.dumps(_candidate_scores(prompt))
+    if '"improvements"' in prompt:
+        return json.dumps(SECTION_ASSESSMENT)
+    if 'JSON object' in prompt:
+        return json.dumps(PERSONAL_INFO)
+    if 'JSON array' in prompt or 'array of job' in prompt:
+        return json.dumps(_jobs(10))
+    return ANALYSIS
+
+
+class Latency:
+    """Response delay distribution from a spec, in milliseconds.
+
+    ``300`` or ``fixed:300``; ``uniform:200:800``; ``lognormal:600:0.5``
+    (median and sigma; heavy-tailed, like real model latencies).
+    """
+
+    def __init__(self, spec):
+        kind, _, params = str(spec).partition(':')
+        if not params:
+            kind, params = 'fixed', kind
+        try:
+            values = [float(value) for value in params.split(':')]
+        except ValueError:
+            raise ValueError(f'Bad latency spec {spec!r}') from None
+        if kind not in ('fixed', 'uniform', 'lognormal') or len(values) != {'fixed': 1}.get(kind, 2):
+            raise ValueError(f'Bad latency spec {spec!r}')
+        self.spec, self.kind, self.values = str(spec), kind, values
+
+    def sample(self, rng):
+        """Seconds"""
+        if self.kind == 'fixed':
+            return self.values[0] / 1000
+        if self.kind == 'uniform':
+            return rng.uniform(*self.values) / 1000
+        median, sigma = self.values
+        return rng.lognormvariate(math.log(median), sigma) / 1000
+
+    def __str__(self):
+        return self.spec
+
+
+class FakeProvider:
+    def __init__(self, latency='500', error_rate=0.0):
+        self.latency = latency if isinstance(latency, Latency) else Latency(latency)
+        self.error_rate = error_rate
+
+    def describe(self):
+        return {'latency': str(self.latency), 'error_rate': self.error_rate}
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, as the real APIs and the app's pooled clients expect
+
+    def do_GET(self):
+        if self.path == '/stats':
+            return self._send(200, self.server.stats())
+        self._send(404, {'error': {'message': f'No fake for {self.path}'}})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        if GEMINI_PATH.match(self.path):
+            name = 'gemini'
+            prompt = ''.join(part.get('text', '') for item in body.get('contents', []) for part in item.get('parts', []))
+        elif self.path == PERPLEXITY_PATH:
+            name = 'perplexity'
+            prompt = ''.join(message.get('content', '') for message in body.get('messages', []))
+        else:
+            return self._send(404, {'error': {'message': f'No fake for {self.path}'}})
+
+        status, delay = self.server.plan(name)
+        time.sleep(delay)
+        if status != 200:
+            return self._send(status, {'error': {'code': status, 'message': 'Injected by the fake provider'}})
+        text = reply_text(prompt)
+        tokens = {'input': max(1, len(prompt) // 4), 'output': max(1, len(text) // 4)}
+        if name == 'gemini':
+            self._send(200, {
+                'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}, 'finishReason': 'STOP'}],
+                'usageMetadata': {'promptTokenCount': tokens['input'], 'candidatesTokenCount': tokens['output']},
+            })
+        else:
+            self._send(200, {
+                'model': body.get('model', ''),
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text}, 'finish_reason': 'stop'}],
+                'usage': {'prompt_tokens': tokens['input'], 'completion_tokens': tokens['output']},
+            })
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeProviderServer(ThreadingHTTPServer):
+    """One thread per connection, so concurrent calls overlap their delays like a real API's would"""
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address=('127.0.0.1', 0), gemini=None, perplexity=None, seed=None):
+        super().__init__(address, FakeProviderHandler)
+        self.providers = {'gemini': gemini or FakeProvider(), 'perplexity': perplexity or FakeProvider()}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._calls = Counter()
+        self._errors = Counter()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def plan(self, name):
+        """(status, delay in seconds) for the next call to provider ``name``"""
+        provider = self.providers[name]
+        with self._lock:
+            delay = provider.latency.sample(self._rng)
+            failed = self._rng.random() < provider.error_rate
+            status = self._rng.choice(ERROR_STATUSES) if failed else 200
+            self._calls[name] += 1
+            if failed:
+                self._errors[name] += 1
+        return status, delay
+
+    def stats(self):
+        with self._lock:
+            return {
+                name: {**provider.describe(), 'calls': self._calls[name], 'errors': self._errors[name]}
+                for name, provider in self.providers.items()
+            }
+
+
+def add_arguments(parser):
+    """Provider options, shared with the load-test commands"""
+    parser.add_argument('--latency-ms', type=float, help='Fixed latency for both providers (shorthand)')
+    parser.add_argument('--gemini-latency', default='lognormal:800:0.4', help='Latency spec, see Latency')
+    parser.add_argument('--perplexity-latency', default='lognormal:2000:0.5')
+    parser.add_argument('--gemini-error-rate', type=float, default=0.0)
+    parser.add_argument('--perplexity-error-rate', type=float, default=0.0)
+
+
+def provider_arguments(options):
+    """Command-line arguments for ``main`` from parsed ``add_arguments`` options"""
+    fixed = options.get('latency_ms')
+    return [
+        '--gemini-latency', str(fixed) if fixed is not None else options['gemini_latency'],
+        '--perplexity-latency', str(fixed) if fixed is not None else options['perplexity_latency'],
+        '--gemini-error-rate', str(options['gemini_error_rate']),
+        '--perplexity-error-rate', str(options['perplexity_error_rate']),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--seed', type=int)
+    add_arguments(parser)
+    options = vars(parser.parse_args())
+    if options['latency_ms'] is not None:
+        options['gemini_latency'] = options['perplexity_latency'] = str(options['latency_ms'])
+    server = FakeProviderServer(
+        (options['host'], options['port']),
+        gemini=FakeProvider(options['gemini_latency'], options['gemini_error_rate']),
+        perplexity=FakeProvider(options['perplexity_latency'], options['perplexity_error_rate']),
+        seed=options['seed'],
+    )
+    print(f'Fake providers on {server.base_url}: {json.dumps(server.stats())}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Booting the fake providers and a gunicorn node for load tests"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from .fake_providers import provider_arguments
+
+# Serving profiles from gunicorn.conf.py, as (application, environment overrides)
+PROFILES = {
+    'threaded': ('job_backend.wsgi', {'GUNICORN_WORKER_CLASS': 'gthread', 'AI_VIEWS_ASYNC': 'False'}),
+    'async': ('job_backend.asgi', {'GUNICORN_WORKER_CLASS': 'uvicorn.workers.UvicornWorker', 'AI_VIEWS_ASYNC': 'True'}),
+}
+
+
+class HarnessError(Exception):
+    pass
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url, process, timeout=60):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            httpx.get(url, timeout=1)
+            return True
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    return False
+
+
+def _stop(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+@contextmanager
+def fake_provider_server(options, seed=None):
+    """Run ``api.loadtest.fake_providers`` in a subprocess; yields its base URL"""
+    port = free_port()
+    command = [sys.executable, '-m', 'api.loadtest.fake_providers', '--port', str(port), *provider_arguments(options)]
+    if seed is not None:
+        command += ['--seed', str(seed)]
+    process = subprocess.Popen(command, cwd=settings.BASE_DIR, stdout=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        if not wait_until_up(base_url, process):
+            raise HarnessError('Fake providers did not start')
+        yield base_url
+    finally:
+        _stop(process)
+
+
+def provider_environment(base_url):
+    """Environment pointing the app's provider clients at the fakes"""
+    return {
+        'GEMINI_API_BASE': base_url,
+        'GOOGLE_GEMINI_API_KEY': 'loadtest',
+        'PERPLEXITY_API_URL': f'{base_url}/chat/completions',
+        'PERPLEXITY_API_KEY': 'loadtest',
+    }
+
+
+@contextmanager
+def gunicorn_node(profile, workers, threads, environment=None):
+    """Boot the app under gunicorn with a profile from PROFILES; yields its base URL"""
+    app, overrides = PROFILES[profile]
+    port = free_port()
+    env = dict(
+        os.environ, **overrides,
+        GUNICORN_BIND=f'127.0.0.1:{port}',
+        GUNICORN_WORKERS=str(workers),
+        GUNICORN_THREADS=str(threads),
+        GUNICORN_MAX_REQUESTS='0',
+        DEBUG='False',
+        **(environment or {}),
+    )
+    with tempfile.TemporaryFile() as log:
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', app],
+            cwd=settings.BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+        base_url = f'http://127.0.0.1:{port}'
+        try:
+            if not wait_until_up(f'{base_url}/', process):
+                log.seek(0)
+                raise HarnessError(f'{profile} node did not start:\n{log.read().decode()[-2000:]}')
+            yield base_url
+        finally:
+            _stop(process)
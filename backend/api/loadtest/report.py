@@ -0,0 +1,122 @@
+"""Load-test reports: per-endpoint summaries, SLO checks and comparisons between saved runs"""
+import json
+import math
+import os
+from collections import Counter, defaultdict
+
+REPORT_VERSION = 1
+LATENCY_METRICS = ('mean', 'p50', 'p95', 'p99', 'max')
+TOTAL = 'all'
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+def is_error(outcome):
+    return not (isinstance(outcome, int) and 200 <= outcome < 400)
+
+
+def summarize(samples, window):
+    """Request counts, rates and latency percentiles (ms) over ``window`` seconds"""
+    latencies = sorted(sample.latency * 1000 for sample in samples if sample.outcome != 'client_saturated')
+    outcomes = Counter(str(sample.outcome) for sample in samples)
+    errors = sum(1 for sample in samples if is_error(sample.outcome))
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'throughput_rps': round(len(samples) / window, 2) if window else 0.0,
+        'goodput_rps': round((len(samples) - errors) / window, 2) if window else 0.0,
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+            'p50': round(percentile(latencies, 50), 1),
+            'p95': round(percentile(latencies, 95), 1),
+            'p99': round(percentile(latencies, 99), 1),
+            'max': round(latencies[-1], 1) if latencies else 0.0,
+        },
+        'outcomes': dict(sorted(outcomes.items())),
+    }
+
+
+def build(samples, elapsed, warmup, meta):
+    """The report for a run, leaving out requests sent during the first ``warmup`` seconds"""
+    measured = [sample for sample in samples if sample.sent >= warmup]
+    window = max(0.0, elapsed - warmup)
+    by_endpoint = defaultdict(list)
+    for sample in measured:
+        by_endpoint[sample.scenario].append(sample)
+    return {
+        'version': REPORT_VERSION,
+        'meta': dict(meta, measured_seconds=round(window, 2)),
+        'endpoints': {name: summarize(group, window) for name, group in sorted(by_endpoint.items())},
+        TOTAL: summarize(measured, window),
+        'slo': [],
+    }
+
+
+def parse_slo(spec):
+    """``endpoint:metric=limit``, e.g. ``jobs:p95=500`` (ms), ``all:error_rate=0.01``, ``match:throughput=5``"""
+    target, _, rest = spec.partition(':')
+    metric, _, limit = rest.partition('=')
+    if not target or metric not in LATENCY_METRICS + ('error_rate', 'throughput'):
+        raise ValueError(f'Bad SLO {spec!r}')
+    try:
+        return target, metric, float(limit)
+    except ValueError:
+        raise ValueError(f'Bad SLO limit in {spec!r}') from None
+
+
+def _value(summary, metric):
+    if metric == 'error_rate':
+        return summary['error_rate']
+    if metric == 'throughput':
+        return summary['goodput_rps']
+    return summary['latency_ms'][metric]
+
+
+def check_slos(report, slos):
+    """Record each (target, metric, limit) in ``report['slo']``; returns the ones that were missed"""
+    missed = []
+    for target, metric, limit in slos:
+        summary = report[TOTAL] if target == TOTAL else report['endpoints'].get(target)
+        actual = _value(summary, metric) if summary else None
+        met = actual is not None and (actual >= limit if metric == 'throughput' else actual <= limit)
+        result = {'target': target, 'metric': metric, 'limit': limit, 'actual': actual, 'met': met}
+        report['slo'].append(result)
+        if not met:
+            missed.append(result)
+    return missed
+
+
+def save(report, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    if report.get('version') != REPORT_VERSION:
+        raise ValueError(f'{path}: unsupported report version {report.get("version")!r}')
+    return report
+
+
+def compare(baseline, current):
+    """Rows of (target, metric, baseline value, current value, relative change) for both runs' targets"""
+    rows = []
+    targets = [(TOTAL, baseline[TOTAL], current[TOTAL])] + [
+        (name, baseline['endpoints'][name], current['endpoints'][name])
+        for name in sorted(set(baseline['endpoints']) & set(current['endpoints']))
+    ]
+    for target, before, after in targets:
+        for metric in ('throughput', 'error_rate', 'p50', 'p95', 'p99'):
+            old, new = _value(before, metric), _value(after, metric)
+            change = (new - old) / old if old else None
+            rows.append((target, metric, old, new, change))
+    return rows
@@ -0,0 +1,77 @@
+"""Replaying a traffic mix against a node with httpx"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class Sample:
+    scenario: str
+    sent: float  # Seconds since the start of the run
+    latency: float
+    outcome: object  # HTTP status, or the client-side exception name
+
+
+async def replay(base_url, scenarios, mix, duration, users=None, rate=None, think_ms=0.0, max_in_flight=1000,
+                 seed=None, timeout=120, transport=None):
+    """Send requests drawn from ``mix`` for ``duration`` seconds; returns (samples, elapsed seconds).
+
+    With ``users``, that many closed-loop clients each wait for their reply
+    (plus an exponential think time averaging ``think_ms``) before sending
+    again. With ``rate``, requests arrive open-loop as a Poisson process,
+    so a slow node sees its queue grow instead of the load easing off;
+    arrivals beyond ``max_in_flight`` outstanding requests are recorded as
+    ``client_saturated``. ``transport`` replaces the network, e.g. with
+    ``httpx.ASGITransport`` to drive an app in-process.
+    """
+    import httpx
+
+    rng = random.Random(seed)
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    samples = []
+    connections = users or max_in_flight
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout, transport=transport) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+
+        async def send(name):
+            method, path, kwargs = scenarios[name].request(rng)
+            sent = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                outcome = response.status_code
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            samples.append(Sample(name, sent - started, time.perf_counter() - sent, outcome))
+
+        if rate:
+            pending = set()
+            next_arrival = started
+            while True:
+                next_arrival += rng.expovariate(rate)
+                if next_arrival >= deadline:
+                    break
+                await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+                name = rng.choices(names, weights)[0]
+                if len(pending) >= max_in_flight:
+                    samples.append(Sample(name, next_arrival - started, 0.0, 'client_saturated'))
+                    continue
+                task = asyncio.create_task(send(name))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        else:
+            async def user():
+                while time.perf_counter() < deadline:
+                    await send(rng.choices(names, weights)[0])
+                    if think_ms:
+                        await asyncio.sleep(rng.expovariate(1000 / think_ms))
+
+            await asyncio.gather(*(user() for _ in range(users or 1)))
+
+        return samples, time.perf_counter() - started
@@ -0,0 +1,125 @@
+"""Request scenarios and the traffic mixes ``manage.py loadtest`` replays"""
+import io
+
+RESUMES = [
+    """Aarav Sharma
+aarav.sharma@example.com | +91 98450 12345 | Bangalore
+B.Tech Computer Science, 2025
+Skills: Python, Django, REST APIs, PostgreSQL, Docker, Git
+Internship: Backend intern, built Django services for an e-commerce catalogue
+Projects: Job board with React frontend and Django API; CLI expense tracker""",
+    """Priya Nair
+priya.nair@example.com | Pune
+B.E. Information Technology, 2023
+Experience: Software Developer, 2 years - React, TypeScript, Node.js, AWS Lambda
+Skills: JavaScript, React, Node.js, MongoDB, AWS, CI/CD""",
+    """Rahul Verma
+rahul.verma@example.com | Hyderabad
+M.Tech Data Science, 2019
+Experience: Senior Data Engineer, 5 years - Spark, Airflow, Kafka, Python, SQL
+Led migration of batch pipelines to streaming; mentored four engineers""",
+]
+
+JOB_QUERIES = [
+    {},
+    {'search': 'python'},
+    {'search': 'react', 'location': 'Remote'},
+    {'location': 'Bangalore'},
+    {'experience_level': 'Entry Level'},
+    {'job_type': 'Full-time', 'sort': '-salary'},
+    {'search': 'data', 'salary_min': '50000'},
+]
+
+TARGET_ROLES = ['Backend Developer', 'Frontend Developer', 'Data Engineer', '']
+
+
+def _resume_docx(text):
+    import docx
+
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class Scenario:
+    """One kind of user request; ``request(rng)`` returns (method, path, httpx request kwargs)"""
+
+    name = None
+
+    def prepare(self):
+        """Build any fixtures once, before the run"""
+
+    def request(self, rng):
+        raise NotImplementedError
+
+
+class UploadResume(Scenario):
+    name = 'upload'
+
+    def prepare(self):
+        self.files = [_resume_docx(text) for text in RESUMES]
+
+    def request(self, rng):
+        index = rng.randrange(len(self.files))
+        files = {'resume': (f'resume-{index}.docx', self.files[index],
+                            'application/vnd.openxmlformats-officedocument.wordprocessingml.document')}
+        return 'POST', '/api/upload-resume/', {'files': files}
+
+
+class AnalyzeResume(Scenario):
+    name = 'analyze'
+
+    def request(self, rng):
+        return 'POST', '/api/ai/analyze-resume/', {'json': {
+            'resume_text': rng.choice(RESUMES),
+            'analysis_type': 'comprehensive',
+            'target_role': rng.choice(TARGET_ROLES),
+        }}
+
+
+class MatchJobs(Scenario):
+    name = 'match'
+
+    def request(self, rng):
+        return 'POST', '/api/ai/match-jobs/', {'json': {
+            'resume_text': rng.choice(RESUMES),
+            'preferences': {'location': rng.choice(['Bangalore', 'Remote', ''])},
+            'use_perplexity': rng.random() < 0.5,
+            'limit': 10,
+        }}
+
+
+class ListJobs(Scenario):
+    name = 'jobs'
+
+    def request(self, rng):
+        params = dict(rng.choice(JOB_QUERIES))
+        if rng.random() < 0.3:
+            params['page'] = str(rng.randint(2, 4))
+        return 'GET', '/api/jobs/', {'params': params}
+
+
+SCENARIOS = {scenario.name: scenario for scenario in (UploadResume, AnalyzeResume, MatchJobs, ListJobs)}
+
+# Mostly browsing, with a resume analysed and matched about once per three job-list views
+DEFAULT_MIX = 'jobs=5,analyze=2,match=2,upload=1'
+
+
+def parse_mix(spec):
+    """{scenario name: weight} from ``name=weight,...``"""
+    mix = {}
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f'Unknown scenario {name!r} (choose from {", ".join(SCENARIOS)})')
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f'Bad weight for {name!r}: {weight!r}') from None
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError('The mix needs at least one scenario with a positive weight')
+    return mix
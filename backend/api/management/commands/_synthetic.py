@@ -0,0 +1,46 @@
+"""Synthetic job postings for the benchmark commands"""
+import random
+
+from api.catalogue import stable_job_id
+from api.matching import COMMON_SKILLS
+
+TITLES = [
+    'Software Engineer', 'Backend Developer', 'Frontend Developer', 'Data Analyst',
+    'Data Scientist', 'DevOps Engineer', 'QA Engineer', 'Machine Learning Engineer',
+    'Full Stack Developer', 'Cloud Engineer', 'Mobile Developer', 'Product Manager',
+]
+PREFIXES = ['', 'Junior ', 'Senior ', 'Lead ', 'Associate ', 'Staff ']
+LEVELS = ['Entry Level', 'Mid Level', 'Senior', 'Internship']
+LOCATIONS = [
+    'Remote', 'Bangalore, India', 'Hyderabad, India', 'Pune, India', 'New York, NY',
+    'San Francisco, CA', 'Austin, TX', 'London, UK', 'Berlin, Germany', 'Toronto, Canada',
+]
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship']
+
+
+def synthetic_jobs(count, seed=0):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        title = rng.choice(PREFIXES) + rng.choice(TITLES)
+        company = f'Company {rng.randrange(count // 4 + 1)}'
+        location = rng.choice(LOCATIONS)
+        url = f'https://careers.example.com/{i}'
+        low = rng.randrange(40, 160) * 1000
+        jobs.append({
+            'id': stable_job_id(company, title, location, url),
+            'title': title,
+            'company': company,
+            'location': location,
+            'job_type': rng.choice(JOB_TYPES),
+            'experience_level': rng.choice(LEVELS),
+            'salary_min': low,
+            'salary_max': low + rng.randrange(10, 60) * 1000,
+            'description': f'{title} working on ' + ', '.join(rng.sample(COMMON_SKILLS, 4)),
+            'skills_required': rng.sample(COMMON_SKILLS, rng.randint(3, 8)),
+            'posted_date': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            'source': 'api',
+            'is_remote': location == 'Remote',
+            'apply_url': url,
+        })
+    return jobs
@@ -0,0 +1,66 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from api.ann import HashingVectorizer, IVFIndex
+
+from ._synthetic import synthetic_jobs
+
+
+class Command(BaseCommand):
+    help = 'Benchmark recall@k and QPS of the IVF job index against exact search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=50000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--k', type=int, default=10)
+        parser.add_argument('--nlist', type=int, default=128)
+        parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+
+    def handle(self, *args, **options):
+        k = options['k']
+        vectorizer = HashingVectorizer()
+        jobs = synthetic_jobs(options['jobs'])
+
+        started = time.perf_counter()
+        vectors = np.stack([vectorizer.vector(vectorizer.job_features(job)) for job in jobs])
+        embed_s = time.perf_counter() - started
+
+        index = IVFIndex(vectorizer.dim, nlist=options['nlist'])
+        started = time.perf_counter()
+        index.add([job['id'] for job in jobs], vectors)
+        build_s = time.perf_counter() - started
+
+        queries = np.stack([
+            vectorizer.vector(vectorizer.resume_features(
+                f"{job['title']} {' '.join(job['skills_required'][:3])} {job['location']}"))
+            for job in synthetic_jobs(options['queries'], seed=1)
+        ])
+
+        # Ground truth from brute force over the full matrix
+        keys = [job['id'] for job in jobs]
+        started = time.perf_counter()
+        exact = []
+        for query in queries:
+            scores = vectors @ query
+            exact.append({keys[i] for i in np.argpartition(-scores, k - 1)[:k]})
+        exact_qps = len(queries) / (time.perf_counter() - started)
+
+        self.stdout.write(f'jobs: {len(jobs)}  dim: {vectorizer.dim}  nlist: {index.nlist}')
+        self.stdout.write(f'embed: {embed_s:.2f} s  add+train: {build_s:.2f} s')
+        self.stdout.write(f'exact search: {exact_qps:8.0f} QPS  recall@{k} 1.000')
+        for nprobe in options['nprobe']:
+            started = time.perf_counter()
+            found = [{key for key, _ in index.search(query, k=k, nprobe=nprobe)} for query in queries]
+            qps = len(queries) / (time.perf_counter() - started)
+            recall = np.mean([len(f & e) / k for f, e in zip(found, exact)])
+            self.stdout.write(f'nprobe={nprobe:<4}    {qps:8.0f} QPS  recall@{k} {recall:.3f}')
+
+        # Incremental maintenance: expire 10% of the jobs and re-insert them
+        expired = keys[::10]
+        started = time.perf_counter()
+        index.remove(expired)
+        index.add(expired, vectors[::10])
+        churn_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(f'remove+re-add {len(expired)} jobs: {churn_ms:.0f} ms')
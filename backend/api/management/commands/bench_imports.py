@@ -0,0 +1,73 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a worker imports before it can serve its first request
+BOOT_SCRIPT = (
+    'import django; django.setup(); '
+    'from django.conf import settings; import importlib; importlib.import_module(settings.ROOT_URLCONF)'
+)
+
+# Must not be imported before first use unless WARM_UP_IMPORTS is on. (requests is
+# left out: Django REST framework's compat module imports it whenever it is installed.)
+LAZY_MODULES = ('google.generativeai', 'PyPDF2', 'docx')
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure(script=BOOT_SCRIPT):
+    """Run ``script`` under ``-X importtime`` in a fresh interpreter; returns {module: (self us, cumulative us, depth)}"""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'job_backend.settings'))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise CommandError(f'Boot script failed:\n{result.stderr[-2000:]}')
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return modules
+
+
+class Command(BaseCommand):
+    help = 'Measure cold-start import time with -X importtime and enforce a budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=float, default=settings.COLD_START_BUDGET_MS,
+                            help='Fail if the boot imports take longer than this (best of --runs)')
+        parser.add_argument('--runs', type=int, default=3)
+        parser.add_argument('--top', type=int, default=10, help='Packages to list by import time')
+
+    def handle(self, *args, **options):
+        runs = [measure() for _ in range(max(1, options['runs']))]
+        totals = [sum(cumulative for _, cumulative, depth in run.values() if depth == 0) for run in runs]
+        best = min(range(len(runs)), key=totals.__getitem__)
+        modules, total_ms = runs[best], totals[best] / 1000
+
+        packages = defaultdict(int)
+        for name, (self_us, _, _) in modules.items():
+            packages[name.split('.')[0]] += self_us
+        self.stdout.write(f'{len(modules)} modules imported; best of {len(runs)}: {total_ms:.1f} ms '
+                          f'(runs: {", ".join(f"{total / 1000:.0f}" for total in totals)} ms)')
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'  {package:<32} {self_us / 1000:8.1f} ms')
+
+        problems = []
+        eager = [name for name in LAZY_MODULES if name in modules]
+        if eager and not settings.WARM_UP_IMPORTS:
+            problems.append(f'lazily loaded modules imported at boot: {", ".join(eager)}')
+        if options['budget_ms'] and total_ms > options['budget_ms']:
+            problems.append(f'boot imports took {total_ms:.1f} ms, over the {options["budget_ms"]:.0f} ms budget')
+        if problems:
+            raise CommandError('; '.join(problems))
+        if options['budget_ms']:
+            self.stdout.write(self.style.SUCCESS(f'Within the {options["budget_ms"]:.0f} ms cold-start budget'))
@@ -0,0 +1,50 @@
+import gc
+import json
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from api.records import JobRecord, skill_table
+
+from ._synthetic import synthetic_jobs
+
+
+def _traced(build):
+    """(result, bytes still allocated by ``build`` once it returns)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+class Command(BaseCommand):
+    help = 'Compare the memory footprint of catalogue jobs held as dicts and as JobRecords'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        # Round-trip through JSON so every job owns its strings, as parsed provider output does
+        payload = json.dumps(synthetic_jobs(options['jobs']))
+
+        dicts, dict_bytes = _traced(lambda: json.loads(payload))
+        del dicts
+
+        def records():
+            return [JobRecord.from_dict(job) for job in json.loads(payload)]
+
+        records, record_bytes = _traced(records)
+
+        sample = json.loads(payload)[:1000]
+        assert [dict(JobRecord.from_dict(job)) for job in sample] == sample, 'round trip is lossy'
+
+        count = len(records)
+        self.stdout.write(f'jobs:          {count}')
+        self.stdout.write(f'dicts:         {dict_bytes / 2**20:8.1f} MiB  ({dict_bytes / count:6.0f} B/job)')
+        self.stdout.write(f'JobRecords:    {record_bytes / 2**20:8.1f} MiB  ({record_bytes / count:6.0f} B/job)'
+                          f'  incl. {len(skill_table)} shared skill names')
+        self.stdout.write(f'saving:        {1 - record_bytes / dict_bytes:8.1%}')
@@ -0,0 +1,118 @@
+import random
+import statistics
+import time
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from api import compression, renderers, views
+from api.catalogue import catalogue
+
+from ._synthetic import synthetic_jobs
+
+SENTENCES = [
+    'You will design, build and operate services used by millions of job seekers.',
+    'The team owns the APIs behind search, recommendations and applications.',
+    'We value clear written communication, code review and pragmatic testing.',
+    'Experience with cloud infrastructure, containers and CI pipelines is a plus.',
+    'You will pair with senior engineers and take ownership of features end to end.',
+    'Benefits include health insurance, a learning budget and flexible hours.',
+    'Our stack is Python, Django, PostgreSQL, Redis, React and Kubernetes.',
+    'Strong fundamentals in data structures, algorithms and databases are expected.',
+]
+
+RESUME = """Jane Doe
+jane.doe@example.com | +91 98765 43210 | Bangalore
+B.Tech Computer Science, 2025
+Skills: Python, Django, React, SQL, Docker, Git, REST APIs, AWS
+Internship: Backend developer intern building Django services on AWS
+"""
+
+
+def _describe(rng, words):
+    text = []
+    while sum(len(sentence.split()) for sentence in text) < words:
+        text.append(rng.choice(SENTENCES))
+    return ' '.join(text)
+
+
+def jobs_list_payload(jobs, description_words):
+    rng = random.Random(1)
+    catalogue.restore(dict(job, description=_describe(rng, description_words)) for job in synthetic_jobs(jobs))
+    response = views.jobs_list(APIRequestFactory().get('/api/jobs/'))
+    return response.data
+
+
+def analyze_resume_payload(analysis_words):
+    rng = random.Random(2)
+    skills = ['Python', 'Django', 'React', 'SQL', 'Docker', 'Git', 'REST APIs', 'AWS']
+    sections = []
+    for number, heading in enumerate(['Skill assessment', 'Experience evaluation', 'Strengths and improvement areas',
+                                      'Career recommendations', 'Job match score'], 1):
+        lines = [f'- **{skill}**: {rng.randint(5, 9)}/10. ' + _describe(rng, 15) for skill in rng.sample(skills, 4)]
+        sections.append(f'## {number}. {heading}\n' + '\n'.join(lines))
+    analysis = '\n\n'.join(sections)
+    while len(analysis.split()) < analysis_words:
+        analysis += '\n' + _describe(rng, 40)
+    info = {
+        'name': 'Jane Doe', 'email': 'jane.doe@example.com', 'phone': '+91 98765 43210', 'skills': skills,
+        'experience_years': 'Fresh graduate', 'education': 'B.Tech Computer Science', 'location': 'Bangalore',
+    }
+    data, profile = views.resume_analysis_result(info, analysis, 'comprehensive', 'Backend Developer', RESUME)
+    data['profile_token'] = profile.token()
+    return data
+
+
+def _time(function, repeat):
+    function()  # Warm up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6
+
+
+class Command(BaseCommand):
+    help = 'Benchmark JSON rendering, parsing and compression on jobs_list and ai_analyze_resume payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=2000, help='Catalogue size behind jobs_list')
+        parser.add_argument('--description-words', type=int, default=150)
+        parser.add_argument('--analysis-words', type=int, default=1200, help='Length of the AI assessment text')
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        payloads = {
+            'jobs_list': jobs_list_payload(options['jobs'], options['description_words']),
+            'ai_analyze_resume': analyze_resume_payload(options['analysis_words']),
+        }
+        repeat = options['repeat']
+        stock_renderer, fast_renderer = JSONRenderer(), renderers.FastJSONRenderer()
+        stock_parser, fast_parser = JSONParser(), renderers.FastJSONParser()
+        self.stdout.write(f'JSON backend: {renderers.BACKEND}; encodings: {", ".join(compression.available_encodings())}')
+
+        for name, data in payloads.items():
+            stock = stock_renderer.render(data, 'application/json')
+            fast = fast_renderer.render(data, 'application/json')
+            assert renderers.loads(stock) == renderers.loads(fast), f'{name}: renderers disagree'
+
+            render_stock = _time(lambda: stock_renderer.render(data, 'application/json'), repeat)
+            render_fast = _time(lambda: fast_renderer.render(data, 'application/json'), repeat)
+            parse_stock = _time(lambda: stock_parser.parse(BytesIO(stock)), repeat)
+            parse_fast = _time(lambda: fast_parser.parse(BytesIO(stock)), repeat)
+
+            self.stdout.write(f'\n{name}: {len(stock) / 1024:.1f} KiB')
+            self.stdout.write(f'  render:  {render_stock:8.0f} us -> {render_fast:6.0f} us  '
+                              f'({render_stock / render_fast:.1f}x, {render_stock - render_fast:.0f} us saved)')
+            self.stdout.write(f'  parse:   {parse_stock:8.0f} us -> {parse_fast:6.0f} us  '
+                              f'({parse_stock / parse_fast:.1f}x, {parse_stock - parse_fast:.0f} us saved)')
+            for encoding in compression.available_encodings():
+                compressed = compression.compress(fast, encoding)
+                cost = _time(lambda: compression.compress(fast, encoding), repeat)
+                self.stdout.write(f'  {encoding + ":":<8} {len(compressed) / 1024:8.1f} KiB '
+                                  f'({len(compressed) / len(fast):.0%} of identity, '
+                                  f'{(len(fast) - len(compressed)) / 1024:.1f} KiB saved) in {cost:.0f} us')
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import statistics
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.loadtest.harness import PROFILES, HarnessError, fake_provider_server, gunicorn_node, provider_environment
+
+ENDPOINT = '/api/ai/career-advice/'
+PAYLOAD = {
+    'resume_text': 'B.Tech Computer Science, 2025. Skills: Python, Django, React, SQL',
+    'career_goals': 'Backend engineering',
+    'current_challenges': 'No full-time experience yet',
+}
+
+
+async def drive(url, payload, concurrency, duration):
+    """Keep ``concurrency`` requests in flight for ``duration`` seconds; returns (latencies, outcomes, elapsed)"""
+    import httpx
+
+    latencies, outcomes = [], Counter()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=300) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+
+        async def user():
+            while time.perf_counter() < deadline:
+                sent = time.perf_counter()
+                try:
+                    response = await client.post(url, json=payload)
+                    outcome = response.status_code
+                except httpx.HTTPError as e:
+                    outcome = type(e).__name__
+                latencies.append(time.perf_counter() - sent)
+                outcomes[outcome] += 1
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        return latencies, outcomes, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = 'Compare the threaded and async gunicorn profiles on an AI endpoint against a fake provider'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', choices=sorted(PROFILES), action='append',
+                            help='Profile to run (repeatable; default: all)')
+        parser.add_argument('--latency-ms', type=float, default=500, help='Fake provider response time')
+        parser.add_argument('--concurrency', type=int, default=200, help='Requests kept in flight by the client')
+        parser.add_argument('--duration', type=float, default=20, help='Seconds of load per profile')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Gunicorn workers for both profiles (default: one per core)')
+        parser.add_argument('--threads', type=int, default=4, help='Threads per worker for the threaded profile')
+
+    def handle(self, *args, **options):
+        cores = os.cpu_count() or 1
+        fixed_latency = {
+            'latency_ms': options['latency_ms'], 'gemini_error_rate': 0.0, 'perplexity_error_rate': 0.0,
+        }
+        try:
+            with fake_provider_server(fixed_latency) as provider_base:
+                self.stdout.write(f'{ENDPOINT} with {options["latency_ms"]:.0f} ms provider latency, '
+                                  f'{options["concurrency"]} concurrent clients, {options["workers"]} workers on {cores} cores')
+                for name in options['profile'] or PROFILES:
+                    self._run_profile(name, provider_base, cores, options)
+        except HarnessError as e:
+            raise CommandError(str(e)) from e
+
+    def _run_profile(self, name, provider_base, cores, options):
+        node = gunicorn_node(name, options['workers'], options['threads'], provider_environment(provider_base))
+        with node as base_url:
+            url = f'{base_url}{ENDPOINT}'
+            asyncio.run(drive(url, PAYLOAD, min(options['workers'] * 2, options['concurrency']), 2))  # Warm up
+            latencies, outcomes, elapsed = asyncio.run(drive(url, PAYLOAD, options['concurrency'], options['duration']))
+
+        ok = outcomes.get(200, 0)
+        throughput = ok / elapsed
+        mean = statistics.fmean(latencies) if latencies else 0
+        ordered = sorted(latencies)
+        p95 = ordered[int(len(ordered) * 0.95)] if ordered else 0
+        # Little's law (L = lambda * W) over the provider wait: calls the server keeps in flight
+        in_flight = throughput * options['latency_ms'] / 1000
+        errors = {str(outcome): count for outcome, count in outcomes.items() if outcome != 200}
+        self.stdout.write(f'\n{name} ({PROFILES[name][1]["GUNICORN_WORKER_CLASS"]})')
+        self.stdout.write(f'  throughput:          {throughput:.1f} req/s ({ok} ok in {elapsed:.1f} s)')
+        self.stdout.write(f'  latency:             mean {mean * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms')
+        self.stdout.write(f'  provider calls open: {in_flight:.1f} ({in_flight / cores:.1f} per core)')
+        if name == 'threaded':
+            self.stdout.write(f'  thread cap:          {options["workers"] * options["threads"]}')
+        if errors:
+            self.stdout.write(self.style.WARNING(f'  errors:              {errors}'))
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.ann import JobVectorIndex
+from api.records import JobRecord
+from api.snapshot import CatalogueSnapshot, write_snapshot
+
+from ._synthetic import synthetic_jobs
+
+
+class Command(BaseCommand):
+    help = 'Compare worker warm-up from raw jobs with mapping a catalogue snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=50000)
+
+    def handle(self, *args, **options):
+        jobs = synthetic_jobs(options['jobs'])
+
+        # Without a snapshot every worker embeds and indexes the whole catalogue itself
+        started = time.perf_counter()
+        cold = JobVectorIndex()
+        cold.jobs_added(jobs)
+        cold_ms = (time.perf_counter() - started) * 1000
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'catalogue.snap')
+            started = time.perf_counter()
+            write_snapshot(jobs, path, vector_index=cold)
+            write_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            snapshot = CatalogueSnapshot(path)
+            warm = JobVectorIndex()
+            warm.restore(*snapshot.inverted_lists())
+            map_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            records = [JobRecord.from_dict(job) for job in snapshot.jobs()]
+            records_ms = (time.perf_counter() - started) * 1000
+
+            assert [dict(record) for record in records[:1000]] == [snapshot.job(i) for i in range(1000)]
+            query = cold.vectorizer.vector(cold.vectorizer.job_features(jobs[0]))
+            assert warm.index.search(query, k=1)[0][0] == jobs[0]['id']
+
+            self.stdout.write(f'jobs:                 {len(jobs)}')
+            self.stdout.write(f'snapshot size:        {os.path.getsize(path) / 2**20:.1f} MiB '
+                              f'({snapshot.arrays["vectors"].nbytes / 2**20:.1f} MiB of vectors, shared)')
+            self.stdout.write(f'build (background):   {write_ms:8.0f} ms')
+            self.stdout.write(f'cold vector index:    {cold_ms:8.0f} ms per worker')
+            self.stdout.write(f'map snapshot + index: {map_ms:8.0f} ms per worker')
+            self.stdout.write(f'decode job records:   {records_ms:8.0f} ms per worker')
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.catalogue import catalogue
+from api.snapshot import write_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Write the published job catalogue to the memory-mapped snapshot file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=None, help='Override JOB_SNAPSHOT PATH')
+
+    def handle(self, *args, **options):
+        path = options['path'] or settings.JOB_SNAPSHOT['PATH']
+        if not path:
+            raise CommandError('JOB_SNAPSHOT PATH is not configured')
+        catalogue.sync()
+        count = write_snapshot(catalogue.ingested(), path)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {count} jobs to {path}'))
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.ingestion import IngestionScheduler, sweep
+
+
+class Command(BaseCommand):
+    help = 'Sweep the configured job queries x locations into the shared job catalogue'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--query', action='append', dest='queries', help='Override JOB_INGESTION QUERIES')
+        parser.add_argument('--location', action='append', dest='locations', help='Override JOB_INGESTION LOCATIONS')
+        parser.add_argument('--loop', action='store_true', help='Keep sweeping every INTERVAL_SECONDS')
+
+    def handle(self, *args, **options):
+        if options['loop']:
+            self.stdout.write(f"Sweeping every {settings.JOB_INGESTION['INTERVAL_SECONDS']}s")
+            scheduler = IngestionScheduler()
+            scheduler.run()
+            return
+        stats = sweep(options['queries'], options['locations'])
+        self.stdout.write(self.style.SUCCESS(f'Ingestion sweep finished: {stats}'))
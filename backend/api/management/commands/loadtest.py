@@ -0,0 +1,148 @@
+import asyncio
+import contextlib
+import os
+import platform
+import socket
+import subprocess
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.loadtest import fake_providers, report
+from api.loadtest.harness import PROFILES, HarnessError, fake_provider_server, gunicorn_node, provider_environment
+from api.loadtest.runner import replay
+from api.loadtest.scenarios import DEFAULT_MIX, SCENARIOS, parse_mix
+
+DEFAULT_SLOS = ['all:error_rate=0.01']
+
+
+def _commit():
+    """Short HEAD hash, with ``-dirty`` for uncommitted changes; None outside a git checkout"""
+    try:
+        head = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD'], cwd=settings.BASE_DIR).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return head + ('-dirty' if dirty else '')
+
+
+class Command(BaseCommand):
+    help = ('Boot the backend against fake AI providers, replay a traffic mix and report throughput, '
+            'latency percentiles and error rates per endpoint as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', help='Base URL of a running node to test instead of booting one '
+                                             '(it must already point at providers or fakes)')
+        parser.add_argument('--profile', choices=sorted(PROFILES), default='threaded')
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Scenario weights ({", ".join(SCENARIOS)})')
+        load = parser.add_mutually_exclusive_group()
+        load.add_argument('--users', type=int, default=50, help='Closed-loop virtual users')
+        load.add_argument('--rate', type=float, help='Open-loop arrivals per second (Poisson) instead of --users')
+        parser.add_argument('--think-ms', type=float, default=0.0, help='Mean pause between a user\'s requests')
+        parser.add_argument('--max-in-flight', type=int, default=1000, help='Open-loop cap on outstanding requests')
+        parser.add_argument('--duration', type=float, default=60)
+        parser.add_argument('--warmup', type=float, default=5, help='Leading seconds left out of the report')
+        parser.add_argument('--seed', type=int, default=0)
+        fake_providers.add_arguments(parser)
+        parser.add_argument('--slo', action='append', help='endpoint:metric=limit, e.g. jobs:p95=500 '
+                                                           f'(repeatable; default: {" ".join(DEFAULT_SLOS)})')
+        parser.add_argument('--output', help='Report path (default: var/loadtest/<time>-<commit>.json)')
+        parser.add_argument('--compare', metavar='REPORT', help='Print changes against an earlier report')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+            slos = [report.parse_slo(spec) for spec in options['slo'] or DEFAULT_SLOS]
+            baseline = report.load(options['compare']) if options['compare'] else None
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e)) from e
+        scenarios = {name: SCENARIOS[name]() for name in mix}
+        for scenario in scenarios.values():
+            scenario.prepare()
+
+        started_at = datetime.now(timezone.utc)
+        users = None if options['rate'] else options['users']
+        meta = {
+            'started_at': started_at.isoformat(timespec='seconds'),
+            'commit': _commit(),
+            'host': socket.gethostname(),
+            'cores': os.cpu_count(),
+            'python': platform.python_version(),
+            'target': options['target'] or {
+                'profile': options['profile'], 'workers': options['workers'],
+                'threads': options['threads'] if options['profile'] == 'threaded' else None,
+            },
+            'load': {'users': users, 'rate': options['rate'], 'think_ms': options['think_ms'],
+                     'duration': options['duration'], 'warmup': options['warmup'], 'seed': options['seed']},
+            'mix': mix,
+        }
+        try:
+            with contextlib.ExitStack() as stack:
+                if options['target']:
+                    base_url, providers_url = options['target'].rstrip('/'), None
+                else:
+                    providers_url = stack.enter_context(fake_provider_server(options, seed=options['seed']))
+                    base_url = stack.enter_context(gunicorn_node(
+                        options['profile'], options['workers'], options['threads'], provider_environment(providers_url),
+                    ))
+                self.stdout.write(f'Replaying {options["mix"]} against {base_url} for {options["duration"]:.0f} s '
+                                  + (f'at {options["rate"]} req/s' if options['rate'] else f'with {users} users'))
+                samples, elapsed = asyncio.run(replay(
+                    base_url, scenarios, mix, options['duration'], users=users, rate=options['rate'],
+                    think_ms=options['think_ms'], max_in_flight=options['max_in_flight'], seed=options['seed'],
+                ))
+                if providers_url:
+                    meta['providers'] = _provider_stats(providers_url)
+        except HarnessError as e:
+            raise CommandError(str(e)) from e
+
+        result = report.build(samples, elapsed, options['warmup'], meta)
+        missed = report.check_slos(result, slos)
+        path = options['output'] or os.path.join(
+            settings.BASE_DIR, 'var', 'loadtest',
+            f'{started_at:%Y%m%dT%H%M%S}-{meta["commit"] or "nogit"}.json',
+        )
+        report.save(result, path)
+
+        self._print(result)
+        if baseline is not None:
+            self._print_comparison(baseline, result)
+        self.stdout.write(f'\nReport saved to {path}')
+        if missed:
+            raise CommandError('SLOs missed: ' + '; '.join(
+                f'{slo["target"]} {slo["metric"]} {slo["actual"]} (limit {slo["limit"]:g})' for slo in missed
+            ))
+
+    def _print(self, result):
+        self.stdout.write(f'\n{"endpoint":<10} {"requests":>8} {"req/s":>8} {"errors":>7} '
+                          f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+        rows = list(result['endpoints'].items()) + [(report.TOTAL, result[report.TOTAL])]
+        for name, summary in rows:
+            latency = summary['latency_ms']
+            self.stdout.write(f'{name:<10} {summary["requests"]:>8} {summary["throughput_rps"]:>8.1f} '
+                              f'{summary["error_rate"]:>7.1%} {latency["p50"]:>8.0f} {latency["p95"]:>8.0f} '
+                              f'{latency["p99"]:>8.0f}')
+        for slo in result['slo']:
+            style = self.style.SUCCESS if slo['met'] else self.style.ERROR
+            bound = '>=' if slo['metric'] == 'throughput' else '<='
+            self.stdout.write(style(f'SLO {slo["target"]} {slo["metric"]} {bound} {slo["limit"]:g}: {slo["actual"]}'))
+
+    def _print_comparison(self, baseline, result):
+        base_meta = baseline['meta']
+        self.stdout.write(f'\nAgainst {base_meta.get("commit")} on {base_meta.get("host")} ({base_meta.get("started_at")}):')
+        for target, metric, old, new, change in report.compare(baseline, result):
+            delta = f'{change:+.1%}' if change is not None else 'n/a'
+            self.stdout.write(f'  {target:<10} {metric:<11} {old:>10g} -> {new:<10g} {delta}')
+
+
+def _provider_stats(base_url):
+    import httpx
+
+    try:
+        return httpx.get(f'{base_url}/stats', timeout=5).json()
+    except (httpx.HTTPError, ValueError):
+        return None
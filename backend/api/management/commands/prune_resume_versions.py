@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.resume_versions import prune_stale
+
+
+class Command(BaseCommand):
+    help = "Delete the stored resume versions of applicants who have not uploaded for RESUME_STORE['VERSIONS_MAX_AGE']"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age', type=int, default=settings.RESUME_STORE['VERSIONS_MAX_AGE'],
+                            help="Seconds since the applicant's last upload")
+
+    def handle(self, *args, **options):
+        deleted = prune_stale(options['max_age'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} resume version(s)'))
@@ -0,0 +1,117 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.batch_scoring import BatchScorer, FileCheckpoint, batch_id_for
+from api.catalogue import catalogue
+
+
+def _read_resumes(paths):
+    """(id, text) dicts from .txt files (named by file), .json lists and .jsonl lines of {id, text}"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)))
+        else:
+            files.append(path)
+    resumes = []
+    for path in files:
+        name, extension = os.path.splitext(os.path.basename(path))
+        with open(path, encoding='utf-8') as f:
+            if extension == '.txt':
+                resumes.append({'id': name, 'text': f.read()})
+            elif extension == '.json':
+                resumes.extend(json.load(f))
+            elif extension == '.jsonl':
+                resumes.extend(json.loads(line) for line in f if line.strip())
+    for i, resume in enumerate(resumes):
+        if not isinstance(resume, dict) or not str(resume.get('text') or '').strip():
+            raise ValueError(f'Resume {i + 1} has no text')
+        resume['id'], resume['text'] = str(resume.get('id') or f'resume-{i + 1}'), str(resume['text'])
+    return resumes
+
+
+class Command(BaseCommand):
+    help = ('Rank a batch of resumes against one job: local prefilter, provider scoring of the top K, '
+            'checkpointed so an interrupted run resumes where it stopped')
+
+    def add_arguments(self, parser):
+        parser.add_argument('resumes', nargs='+', help='.txt files (one resume each), .json/.jsonl files of '
+                                                       '{"id", "text"} objects, or directories of them')
+        job = parser.add_mutually_exclusive_group(required=True)
+        job.add_argument('--job', help='A job object as JSON, or a text file with the job description')
+        job.add_argument('--job-id', help='A job from the catalogue')
+        parser.add_argument('--top-k', type=int, default=settings.BATCH_SCORING['TOP_K'])
+        parser.add_argument('--parallelism', type=int, default=settings.BATCH_SCORING['PARALLELISM'])
+        parser.add_argument('--checkpoint', help='Checkpoint path (default: var/batch_scoring/<batch id>.jsonl)')
+        parser.add_argument('--output', help='Write the ranking and stats as JSON to this path')
+
+    def handle(self, *args, **options):
+        try:
+            resumes = _read_resumes(options['resumes'])
+            job = self._job(options)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e)) from e
+        if not resumes:
+            raise CommandError('No resumes found')
+        if len({resume['id'] for resume in resumes}) != len(resumes):
+            raise CommandError('Resume ids must be unique')
+
+        batch_id = batch_id_for(job, resumes)
+        path = options['checkpoint'] or os.path.join(settings.BASE_DIR, 'var', 'batch_scoring', f'{batch_id}.jsonl')
+        scorer = BatchScorer(job, resumes, top_k=options['top_k'], checkpoint=FileCheckpoint(path, batch_id),
+                             parallelism=options['parallelism'])
+        try:
+            for event in scorer.run():
+                result = self._report(event)
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        if options['output']:
+            os.makedirs(os.path.dirname(options['output']) or '.', exist_ok=True)
+            with open(options['output'], 'w') as f:
+                json.dump(result, f, indent=2)
+                f.write('\n')
+            self.stdout.write(f'Ranking written to {options["output"]}')
+        self.stdout.write(f'Checkpoint: {path}')
+
+    def _job(self, options):
+        if options['job_id']:
+            job = catalogue.get(options['job_id'])
+            if job is None:
+                raise ValueError(f'Job {options["job_id"]} not found')
+            return dict(job)
+        with open(options['job'], encoding='utf-8') as f:
+            content = f.read()
+        try:
+            job = json.loads(content)
+        except ValueError:
+            return {'id': 'job', 'description': content}
+        if not isinstance(job, dict):
+            raise ValueError(f'{options["job"]} must hold a job object or a description')
+        return job
+
+    def _report(self, event):
+        kind = event['event']
+        if kind == 'started':
+            self.stdout.write(f'Batch {event["batch_id"]}: {event["resumes"]} resumes, top {event["top_k"]} '
+                              f'to the provider ({event["checkpointed"]} already checkpointed)')
+        elif kind == 'prefiltered':
+            self.stdout.write(f'Prefiltered in {event["seconds"]:.2f} s ({event["resumes_per_minute"]:,.0f} resumes/min)')
+        elif kind == 'scored':
+            self.stdout.write(f'  {event["scored"]}/{event["total"]} scored, {event["failed"]} failed, '
+                              f'{event["calls"]} calls, {event["resumes_per_minute"] or 0:,.1f} resumes/min')
+        elif kind == 'done':
+            stats = event['stats']
+            for entry in event['ranking'][:10]:
+                ai_score = '-' if entry['ai_score'] is None else f'{entry["ai_score"]:g}'
+                self.stdout.write(f'  {entry["id"]:<24} ai {ai_score:>4}  local {entry["local_score"]:.3f}')
+            style = self.style.SUCCESS if not stats['failed'] else self.style.WARNING
+            self.stdout.write(style(
+                f'{stats["resumes"]} resumes in {stats["seconds"]:.1f} s: {stats["resumes_per_minute"]:,.0f} resumes/min '
+                f'({stats["scored"]} scored by the provider in {stats["provider_calls"]} calls, '
+                f'{stats["from_checkpoint"]} from the checkpoint, {stats["failed"]} failed)'
+            ))
+        return event
@@ -0,0 +1,78 @@
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _attributes(span):
+    return {item['key']: next(iter(item['value'].values())) for item in span.get('attributes', [])}
+
+
+def _duration_ms(span):
+    return (int(span['endTimeUnixNano']) - int(span['startTimeUnixNano'])) / 1e6
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else 0.0
+
+
+class Command(BaseCommand):
+    help = 'Roll up the trace sink: latency, tokens and cost per endpoint, and time per stage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=None, help='Override TRACING PATH')
+        parser.add_argument('--endpoint', default=None, help='Only include traces for this endpoint')
+
+    def handle(self, *args, **options):
+        path = options['path'] or settings.TRACING['PATH']
+        endpoints = defaultdict(lambda: {'durations': [], 'input_tokens': 0, 'output_tokens': 0, 'cost_usd': 0.0})
+        stages = defaultdict(list)
+        try:
+            with open(path, encoding='utf-8') as sink:
+                for line in sink:
+                    spans = [
+                        span
+                        for resource in json.loads(line)['resourceSpans']
+                        for scope in resource['scopeSpans']
+                        for span in scope['spans']
+                    ]
+                    root = next((span for span in spans if not span['parentSpanId']), None)
+                    if root is None:
+                        continue
+                    # Resolved requests have a root named "<METHOD> <url name>" and an http.route
+                    resolved = 'http.route' in _attributes(root)
+                    endpoint = root['name'].split(' ', 1)[-1] if resolved else 'unmatched'
+                    if options['endpoint'] and endpoint != options['endpoint']:
+                        continue
+                    totals = endpoints[endpoint]
+                    totals['durations'].append(_duration_ms(root))
+                    for span in spans:
+                        if span is root:
+                            continue
+                        attributes = _attributes(span)
+                        stages[(endpoint, span['name'])].append(_duration_ms(span))
+                        totals['input_tokens'] += int(attributes.get('gen_ai.usage.input_tokens', 0))
+                        totals['output_tokens'] += int(attributes.get('gen_ai.usage.output_tokens', 0))
+                        totals['cost_usd'] += float(attributes.get('ai.cost_usd', 0.0))
+        except FileNotFoundError:
+            raise CommandError(f'No trace sink at {path}')
+
+        self.stdout.write(f"{'endpoint':<28} {'requests':>8} {'p50 ms':>9} {'p95 ms':>9} "
+                          f"{'tokens in':>10} {'tokens out':>10} {'cost USD':>10}")
+        for endpoint, totals in sorted(endpoints.items()):
+            durations = totals['durations']
+            self.stdout.write(
+                f"{endpoint:<28} {len(durations):>8} {_percentile(durations, 0.5):>9.1f} "
+                f"{_percentile(durations, 0.95):>9.1f} {totals['input_tokens']:>10} "
+                f"{totals['output_tokens']:>10} {totals['cost_usd']:>10.4f}"
+            )
+
+        self.stdout.write('')
+        self.stdout.write(f"{'endpoint / stage':<56} {'count':>6} {'mean ms':>9} {'p95 ms':>9}")
+        for (endpoint, name), durations in sorted(stages.items()):
+            self.stdout.write(
+                f"{endpoint + ' / ' + name:<56} {len(durations):>6} "
+                f"{sum(durations) / len(durations):>9.1f} {_percentile(durations, 0.95):>9.1f}"
+            )
@@ -0,0 +1,166 @@
+"""Materialised job-market statistics over the job catalogue.
+
+Every catalogue job is counted into the (role, location, industry) bucket it
+belongs to and into each coarser bucket obtained by replacing any of the
+three with ``*``. Buckets keep sorted salary lists, skill frequencies and
+weekly posting volume, and are updated incrementally through the catalogue
+hooks, so ``ai_research_market`` can answer without an LLM call.
+"""
+import bisect
+import itertools
+import re
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from datetime import datetime
+
+from .catalogue import catalogue
+from .matching import location_key, normalize_skill
+from .salary import to_usd
+
+ANY = '*'
+
+SENIORITY_WORDS = re.compile(
+    r'\b(senior|sr|junior|jr|lead|principal|staff|associate|entry level|intern|trainee|graduate|'
+    r'head of|i{1,3}|[123])\b\.?'
+)
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def role_key(title):
+    """Role family of a job title, e.g. 'Senior Backend Developer II' -> 'backend developer'"""
+    role = SENIORITY_WORDS.sub(' ', str(title or '').lower())
+    role = ' '.join(re.sub(r'[^a-z0-9+#/ ]', ' ', role).split())
+    return role or ANY
+
+
+def market_location_key(location):
+    if 'remote' in str(location or '').lower():
+        return 'remote'
+    return location_key(location) or ANY
+
+
+def industry_key(job_or_industry):
+    if isinstance(job_or_industry, Mapping):  # A job dict or a catalogue JobRecord
+        job_or_industry = job_or_industry.get('industry') or job_or_industry.get('company_industry')
+    return re.sub(r'\s+', ' ', str(job_or_industry or '')).strip().lower() or ANY
+
+
+def posting_week(posted_date):
+    """ISO week ('2025-W37') of a posted date, or None if it cannot be parsed"""
+    try:
+        year, week, _ = datetime.strptime(str(posted_date)[:10], '%Y-%m-%d').isocalendar()
+    except ValueError:
+        return None
+    return f'{year}-W{week:02d}'
+
+
+class _Bucket:
+    def __init__(self):
+        self.postings = 0
+        self.salary_mins = []
+        self.salary_maxs = []
+        self.skills = Counter()
+        self.weekly = Counter()
+
+    def apply(self, job, sign):
+        self.postings += sign
+        low, high = job.get('salary_min'), job.get('salary_max')
+        if low is not None or high is not None:
+            currency = job.get('salary_currency') or 'USD'
+            for values, amount in ((self.salary_mins, low if low is not None else high),
+                                   (self.salary_maxs, high if high is not None else low)):
+                amount = to_usd(float(amount), currency)
+                if sign > 0:
+                    bisect.insort(values, amount)
+                else:
+                    index = bisect.bisect_left(values, amount)
+                    if index < len(values) and values[index] == amount:
+                        values.pop(index)
+        for skill in {normalize_skill(s) for s in job.get('skills_required') or [] if s}:
+            self.skills[skill] += sign
+        week = posting_week(job.get('posted_date'))
+        if week:
+            self.weekly[week] += sign
+
+    def summary(self, top_skills=15):
+        def percentiles(values):
+            if not values:
+                return None
+            return {f'p{q}': round(values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))])
+                    for q in PERCENTILES}
+
+        return {
+            'postings': self.postings,
+            'salary_usd': {
+                'sample_size': len(self.salary_maxs),
+                'min': percentiles(self.salary_mins),
+                'max': percentiles(self.salary_maxs),
+            },
+            'top_skills': [
+                {'skill': skill, 'postings': count, 'share': round(count / self.postings, 3)}
+                for skill, count in self.skills.most_common(top_skills) if count > 0
+            ],
+            'weekly_postings': {week: count for week, count in sorted(self.weekly.items()) if count > 0},
+        }
+
+
+class MarketStats:
+    """Per-(role, location, industry) aggregates, maintained on catalogue changes"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _keys(self, job):
+        exact = (role_key(job.get('title')), market_location_key(job.get('location')), industry_key(job))
+        # Every combination of exact values and wildcards, without duplicates
+        return {
+            tuple(value if keep else ANY for value, keep in zip(exact, mask))
+            for mask in itertools.product((True, False), repeat=3)
+        }
+
+    def _apply(self, jobs, sign):
+        with self._lock:
+            for job in jobs:
+                for key in self._keys(job):
+                    bucket = self._buckets.get(key)
+                    if bucket is None:
+                        bucket = self._buckets[key] = _Bucket()
+                    bucket.apply(job, sign)
+                    if bucket.postings <= 0:
+                        del self._buckets[key]
+
+    def jobs_added(self, jobs):
+        self._apply(jobs, 1)
+
+    def jobs_removed(self, jobs):
+        self._apply(jobs, -1)
+
+    def lookup(self, role='', location='', industry=''):
+        """Summary for the most specific bucket that has data.
+
+        Falls back by widening industry, then location, then role. Returns
+        (bucket key, summary) or (None, None) when the catalogue is empty.
+        """
+        role = role_key(role) if role else ANY
+        location = market_location_key(location) if location else ANY
+        industry = industry_key(industry)
+        candidates = [
+            (role, location, industry),
+            (role, location, ANY),
+            (role, ANY, ANY),
+            (ANY, location, ANY),
+            (ANY, ANY, ANY),
+        ]
+        with self._lock:
+            for key in candidates:
+                bucket = self._buckets.get(key)
+                if bucket is not None and bucket.postings > 0:
+                    return key, bucket.summary()
+        return None, None
+
+
+market_stats = MarketStats()
+catalogue.subscribe(market_stats)
@@ -0,0 +1,349 @@
+"""Local resume-to-job match scoring.
+
+Jobs are turned into a column-oriented ``JobMatrix`` once; a resume is turned
+into a ``ResumeProfile`` (a skill mask, title tokens, seniority and location)
+and scored against every job with a handful of vectorised NumPy operations.
+No LLM call is involved, so ranking the whole catalogue takes milliseconds.
+"""
+import re
+import threading
+
+import numpy as np
+
+from .catalogue import catalogue
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'postgres': 'postgresql',
+    'k8s': 'kubernetes',
+    'ml': 'machine learning',
+    'golang': 'go',
+    'rest': 'rest apis',
+    'rest api': 'rest apis',
+    'ci cd': 'ci/cd',
+}
+
+COMMON_SKILLS = [
+    'python', 'java', 'javascript', 'typescript', 'c', 'c++', 'c#', 'go', 'rust',
+    'sql', 'html', 'css', 'react', 'angular', 'vue', 'node.js', 'django', 'flask',
+    'spring', 'postgresql', 'mysql', 'mongodb', 'redis', 'aws', 'azure', 'gcp',
+    'docker', 'kubernetes', 'terraform', 'linux', 'git', 'ci/cd', 'rest apis',
+    'graphql', 'machine learning', 'data science', 'tensorflow', 'pytorch',
+    'pandas', 'numpy', 'excel', 'tableau', 'power bi', 'figma', 'selenium',
+    'testing', 'automation', 'agile', 'data analysis',
+]
+
+TITLE_STOPWORDS = {'and', 'of', 'the', 'for', 'i', 'ii', 'iii', 'to', 'in', 'a'}
+
+# Seniority ladder shared by resumes and jobs
+SENIORITY_LEVELS = ['intern', 'entry', 'mid', 'senior', 'lead']
+UNKNOWN_LEVEL = len(SENIORITY_LEVELS)
+
+SENIORITY_PATTERNS = [
+    (4, re.compile(r'\b(principal|staff|lead|head of|director|architect)\b')),
+    (3, re.compile(r'\b(senior|sr)\b')),
+    (2, re.compile(r'\b(mid|intermediate|ii)\b')),
+    (0, re.compile(r'\b(intern|internship|trainee|fresh graduate|fresher|graduate)\b')),
+    (1, re.compile(r'\b(entry|junior|jr|associate)\b')),
+]
+
+YEARS_PATTERN = re.compile(r'(\d{1,2})(?:\s*(?:-|to)\s*(\d{1,2}))?\+?\s*(?:years?|yrs?)\b')
+
+# Fit of a resume at seniority row against a job at seniority column; the
+# last column is used for jobs that do not state a level.
+SENIORITY_FIT = np.array([
+    [1.0, 0.8, 0.3, 0.0, 0.0, 0.5],
+    [0.7, 1.0, 0.6, 0.1, 0.0, 0.5],
+    [0.3, 0.7, 1.0, 0.6, 0.2, 0.5],
+    [0.1, 0.3, 0.8, 1.0, 0.7, 0.5],
+    [0.0, 0.1, 0.5, 0.9, 1.0, 0.5],
+    [0.5, 0.5, 0.5, 0.5, 0.5, 0.5],
+], dtype=np.float32)
+
+FEATURE_WEIGHTS = {
+    'skills': 0.5,
+    'title': 0.2,
+    'seniority': 0.2,
+    'location': 0.1,
+}
+
+# Logistic calibration of the weighted raw score onto a 0-100 match score:
+# a raw score of CALIBRATION_MIDPOINT maps to 50%.
+CALIBRATION_SLOPE = 8.0
+CALIBRATION_MIDPOINT = 0.45
+
+
+def tokenize(text):
+    return [token.rstrip('.') for token in TOKEN_PATTERN.findall(str(text or '').lower())]
+
+
+def normalize_skill(skill):
+    skill = re.sub(r'\s+', ' ', str(skill or '')).strip().lower()
+    return SKILL_ALIASES.get(skill, skill)
+
+
+def seniority_level(text):
+    """Map free-text experience levels or titles onto SENIORITY_LEVELS"""
+    text = str(text or '').lower()
+    years = [(int(low) + int(high or low)) / 2 for low, high in YEARS_PATTERN.findall(text)]
+    if years:
+        most = max(years)
+        return 0 if most == 0 else 1 if most < 2 else 2 if most < 5 else 3
+    for level, pattern in SENIORITY_PATTERNS:
+        if pattern.search(text):
+            return level
+    return UNKNOWN_LEVEL
+
+
+def location_key(location):
+    """City-level key for a location string, e.g. 'San Francisco, CA' -> 'san francisco'"""
+    location = str(location or '').split(',')[0].strip().lower()
+    return '' if location in ('', 'not found', 'remote', 'anywhere') else location
+
+
+class Vocabulary:
+    """Grow-only mapping of terms to dense integer IDs.
+
+    Only job-side data (the catalogue) adds terms. Terms from resumes and
+    requests are resolved with ``known``, so callers cannot grow the
+    vocabulary that every worker thread shares.
+    """
+
+    def __init__(self, terms=()):
+        self.ids = {}
+        self.terms = []
+        self._lock = threading.Lock()
+        for term in terms:
+            self.add(term)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def add(self, term):
+        term_id = self.ids.get(term)
+        if term_id is None:
+            with self._lock:
+                term_id = self.ids.get(term)
+                if term_id is None:
+                    # The term goes in before its ID is published, so any ID a reader sees is valid
+                    self.terms.append(term)
+                    term_id = self.ids[term] = len(self.terms) - 1
+        return term_id
+
+    def known(self, terms):
+        """IDs of those ``terms`` already in the vocabulary, without adding the rest"""
+        return {self.ids[term] for term in terms if term in self.ids}
+
+    def mask(self, term_ids):
+        """Boolean membership vector over the whole vocabulary"""
+        mask = np.zeros(len(self.terms), dtype=np.float32)
+        mask[list(term_ids)] = 1.0
+        return mask
+
+
+SKILLS = Vocabulary(COMMON_SKILLS)
+TITLE_TOKENS = Vocabulary()
+LOCATIONS = Vocabulary([''])
+
+MAX_SKILL_WORDS = 3
+
+
+_skill_first_tokens = (None, frozenset())
+
+
+def skill_first_tokens():
+    """Tokens that can start a skill phrase (a term or an alias), refreshed as SKILLS grows"""
+    global _skill_first_tokens
+    size, tokens = _skill_first_tokens
+    if size != len(SKILLS):
+        tokens = frozenset(words[0] for words in map(tokenize, [*SKILLS.terms, *SKILL_ALIASES]) if words)
+        _skill_first_tokens = (len(SKILLS), tokens)
+    return tokens
+
+
+def extract_skill_ids(text, tokens=None):
+    """Skill IDs mentioned anywhere in free text (1-3 word phrases); pass ``tokens`` if already tokenized"""
+    if tokens is None:
+        tokens = tokenize(text)
+    first_tokens = skill_first_tokens()
+    found = set()
+    for start, token in enumerate(tokens):
+        if token not in first_tokens:
+            continue
+        # Tokens are lower-case and space-free, so a joined phrase only needs its alias applied
+        for end in range(start + 1, min(start + MAX_SKILL_WORDS, len(tokens)) + 1):
+            phrase = ' '.join(tokens[start:end])
+            skill_id = SKILLS.ids.get(SKILL_ALIASES.get(phrase, phrase))
+            if skill_id is not None:
+                found.add(skill_id)
+    return found
+
+
+class ResumeProfile:
+    """Features of one resume, ready to be scored against a JobMatrix"""
+
+    def __init__(self, skill_ids, title_tokens=(), level=UNKNOWN_LEVEL, location=''):
+        self.skill_ids = set(skill_ids)
+        self.title_tokens = set(title_tokens)
+        self.level = level
+        self.location = location_key(location)
+
+    @classmethod
+    def from_resume(cls, resume_text, experience_level='', location='', target_role=''):
+        level = seniority_level(experience_level)
+        if level == UNKNOWN_LEVEL:
+            level = seniority_level(resume_text)
+        if '2025' in str(resume_text) and level in (UNKNOWN_LEVEL, 1):
+            level = 0  # Same fresh-graduate heuristic as ai_match_jobs
+        return cls(
+            extract_skill_ids(resume_text),
+            [t for t in tokenize(target_role or resume_text) if t not in TITLE_STOPWORDS],
+            level,
+            location,
+        )
+
+    @classmethod
+    def from_analysis(cls, analysis):
+        """Build a profile from a stored resume analysis / user profile dict"""
+        personal_info = analysis.get('personal_info', {}) or {}
+        skills = analysis.get('skills') or personal_info.get('skills') or []
+        if isinstance(skills, str):
+            skills = skills.split(',')
+        # Skills no job lists cannot affect the score, so they are not added
+        skill_ids = SKILLS.known(normalize_skill(skill) for skill in skills)
+        roles = analysis.get('target_role') or ' '.join(analysis.get('suggested_roles', []))
+        return cls(
+            skill_ids,
+            [t for t in tokenize(roles) if t not in TITLE_STOPWORDS],
+            seniority_level(analysis.get('experience_level') or personal_info.get('experience_years', '')),
+            analysis.get('location') or personal_info.get('location', ''),
+        )
+
+
+class JobMatrix:
+    """Column-oriented, vectorisable features for a fixed list of jobs"""
+
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.row_of = {job['id']: row for row, job in enumerate(self.jobs)}
+        n = len(self.jobs)
+
+        skill_rows, skill_cols = [], []
+        title_rows, title_cols = [], []
+        self.levels = np.empty(n, dtype=np.int8)
+        self.locations = np.empty(n, dtype=np.int32)
+        self.remote = np.empty(n, dtype=bool)
+
+        for row, job in enumerate(self.jobs):
+            skills = {SKILLS.add(normalize_skill(s)) for s in job.get('skills_required') or [] if s}
+            skill_rows.extend([row] * len(skills))
+            skill_cols.extend(skills)
+
+            tokens = {TITLE_TOKENS.add(t) for t in tokenize(job.get('title')) if t not in TITLE_STOPWORDS}
+            title_rows.extend([row] * len(tokens))
+            title_cols.extend(tokens)
+
+            level = seniority_level(job.get('experience_level'))
+            if level == UNKNOWN_LEVEL:
+                level = seniority_level(job.get('title'))
+            self.levels[row] = level
+            self.locations[row] = LOCATIONS.add(location_key(job.get('location')))
+            self.remote[row] = bool(job.get('is_remote')) or 'remote' in str(job.get('location', '')).lower()
+
+        # Sparse (COO) skill and title-token incidence, one entry per (job, term)
+        self.skill_rows = np.asarray(skill_rows, dtype=np.int32)
+        self.skill_cols = np.asarray(skill_cols, dtype=np.int32)
+        self.skill_counts = np.bincount(self.skill_rows, minlength=n).astype(np.float32)
+        self.title_rows = np.asarray(title_rows, dtype=np.int32)
+        self.title_cols = np.asarray(title_cols, dtype=np.int32)
+        self.title_counts = np.bincount(self.title_rows, minlength=n).astype(np.float32)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def _overlap(self, rows, cols, counts, vocabulary, term_ids):
+        """Fraction of each job's terms that the resume has"""
+        if not len(rows):
+            return np.zeros(len(self), dtype=np.float32)
+        hits = np.bincount(rows, weights=vocabulary.mask(term_ids)[cols], minlength=len(self))
+        return (hits / np.maximum(counts, 1.0)).astype(np.float32)
+
+    def score(self, profile):
+        """Score every job against ``profile`` in one batched pass.
+
+        Returns a dict of float32 arrays: one per feature holding its weighted
+        contribution, plus ``raw`` and the calibrated 0-100 ``match_score``.
+        """
+        features = {
+            'skills': self._overlap(self.skill_rows, self.skill_cols, self.skill_counts, SKILLS, profile.skill_ids),
+            'title': self._overlap(self.title_rows, self.title_cols, self.title_counts, TITLE_TOKENS,
+                                   {TITLE_TOKENS.ids[t] for t in profile.title_tokens if t in TITLE_TOKENS.ids}),
+            'seniority': SENIORITY_FIT[profile.level][self.levels],
+        }
+        if profile.location:
+            location_id = LOCATIONS.ids.get(profile.location, -1)
+            features['location'] = ((self.locations == location_id) | self.remote).astype(np.float32)
+        else:
+            features['location'] = np.full(len(self), 0.5, dtype=np.float32)
+
+        contributions = {name: FEATURE_WEIGHTS[name] * values for name, values in features.items()}
+        raw = sum(contributions.values())
+        contributions['raw'] = raw
+        contributions['match_score'] = 100.0 / (1.0 + np.exp(-CALIBRATION_SLOPE * (raw - CALIBRATION_MIDPOINT)))
+        return contributions
+
+    def rank(self, profile, limit=10, rows=None):
+        """Top ``limit`` jobs (of ``rows``, if given) as (job, match) pairs, best first"""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        limit = min(limit, len(rows))
+        if limit < 1:
+            return []
+        scores = self.score(profile)
+        match = scores['match_score'][rows]
+        top = np.argpartition(-match, limit - 1)[:limit]
+        top = rows[top[np.argsort(-match[top], kind='stable')]]
+        return [(self.jobs[i], match_details(scores, i)) for i in top]
+
+
+def match_details(scores, index):
+    """JSON-friendly match score and per-feature contributions for one job"""
+    return {
+        'match_score': round(float(scores['match_score'][index]), 1),
+        'contributions': {name: round(float(scores[name][index]), 3) for name in FEATURE_WEIGHTS},
+    }
+
+
+def rank_jobs(profile, jobs, limit=10):
+    """Rank ``jobs`` for ``profile`` and return copies annotated with match details.
+
+    Catalogue jobs are scored as rows of ``catalogue_matrix()``; a matrix is
+    only built here for jobs the catalogue does not hold.
+    """
+    matrix = catalogue_matrix()
+    rows = [matrix.row_of.get(job['id']) for job in jobs]
+    if None in rows:
+        ranked = JobMatrix(jobs).rank(profile, limit)
+    else:
+        ranked = matrix.rank(profile, limit, rows=rows)
+    return [dict(job, match_score=match['match_score'], match_breakdown=match['contributions'])
+            for job, match in ranked]
+
+
+_catalogue_matrix = (None, None)
+
+
+def catalogue_matrix():
+    """JobMatrix over the whole job catalogue, rebuilt only when it changes"""
+    global _catalogue_matrix
+    version, matrix = _catalogue_matrix
+    if version != catalogue.version:
+        matrix = JobMatrix(catalogue.all())
+        _catalogue_matrix = (catalogue.version, matrix)
+    return matrix
@@ -0,0 +1,103 @@
+"""Peak-memory accounting and budgets for the resume extraction and job parsing stages.
+
+``MemoryBudget(stage)`` traces Python allocations with ``tracemalloc`` for
+the duration of a block, exports the block's peak in
+``memory_stage_peak_bytes`` and raises ``MemoryBudgetExceeded`` from
+``check()`` once the block holds more than ``MEMORY_BUDGET['STAGE_BYTES']``.
+Checks happen where the stage calls ``check()`` (per page, per paragraph)
+and against the peak when the block ends, so a single huge step can
+overshoot before it is caught; the upload size cap bounds that.
+
+``tracemalloc`` is process-wide and slows every thread while it runs, so
+budgets are off by default (``MEMORY_BUDGET['ENABLED']``) and, when on,
+only a ``SAMPLE_RATE`` fraction of stages is traced. Tracing runs only while
+at least one budget is active, and a stage's peak is exact only when no
+other stage overlapped it (otherwise it is the largest growth seen at a
+check, which still includes other threads' allocations). A stage that was
+not exclusive therefore fails with ``retryable`` set: the overshoot may
+have been another request's.
+"""
+import random
+import threading
+import tracemalloc
+
+from django.conf import settings
+
+from .metrics import memory_budget_exceeded, memory_stage_peak
+
+_lock = threading.Lock()
+_active = 0
+_entries = 0
+
+
+class MemoryBudgetExceeded(Exception):
+    def __init__(self, stage, used, limit, retryable=False):
+        super().__init__(f'{stage} needed more than {limit / 2 ** 20:.1f} MiB (reached {used / 2 ** 20:.1f} MiB)')
+        self.stage = stage
+        self.used = used
+        self.limit = limit
+        # Other stages overlapped this one, so their allocations may be what crossed the limit
+        self.retryable = retryable
+
+
+class MemoryBudget:
+    """Context manager measuring (and optionally capping) a stage's allocations"""
+
+    def __init__(self, stage, limit=None):
+        self.stage = stage
+        self.limit = settings.MEMORY_BUDGET['STAGE_BYTES'] if limit is None else limit
+        self.peak = 0
+
+    def __enter__(self):
+        global _active, _entries
+        options = settings.MEMORY_BUDGET
+        if not options['ENABLED'] or random.random() >= options['SAMPLE_RATE']:
+            self.baseline = None
+            return self
+        with _lock:
+            if not _active:
+                tracemalloc.start()
+            _active += 1
+            _entries += 1
+            self._entry = _entries
+            self._exclusive = _active == 1
+            if self._exclusive:
+                tracemalloc.reset_peak()
+            self.baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def check(self):
+        if self.baseline is None:
+            return
+        used = tracemalloc.get_traced_memory()[0] - self.baseline
+        if used > self.peak:
+            self.peak = used
+        if self.limit and used > self.limit:
+            memory_budget_exceeded.inc(stage=self.stage)
+            raise MemoryBudgetExceeded(self.stage, used, self.limit, retryable=not self._alone())
+
+    def _alone(self):
+        """True while no other stage has been traced since this one started"""
+        return self._exclusive and _entries == self._entry and _active == 1
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active
+        if self.baseline is None:
+            return False
+        with _lock:
+            current, peak = tracemalloc.get_traced_memory()
+            alone = self._exclusive and _entries == self._entry
+            if alone:
+                # Nothing else traced during this stage, so the global peak is ours
+                self.peak = max(self.peak, peak - self.baseline)
+            else:
+                self.peak = max(self.peak, current - self.baseline)
+            _active -= 1
+            if not _active:
+                tracemalloc.stop()
+        memory_stage_peak.observe(self.peak, stage=self.stage)
+        if exc_type is None and self.limit and self.peak > self.limit:
+            # A single step overshot between checks; still fail rather than hand back the result
+            memory_budget_exceeded.inc(stage=self.stage)
+            raise MemoryBudgetExceeded(self.stage, self.peak, self.limit, retryable=not alone)
+        return False
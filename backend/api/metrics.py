@@ -0,0 +1,243 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Every thread records into its own shard (a dict per metric guarded by a
+lock only that thread and the scraper take), so the hot path is a
+thread-local lookup, an uncontended lock and a dict update. ``/metrics``
+sums the shards; shards of threads that have exited (e.g. per-request
+executor threads) are folded into a retired total, so the number of shards
+stays bounded by the live threads. Values are per process: with
+several workers, each exposes its own series (scrape them individually or
+through the multiprocess-aware collector of your choice).
+"""
+import bisect
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from django.http import HttpResponse
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Shard:
+    """One thread's values for one metric"""
+
+    __slots__ = ('values', 'lock', 'thread')
+
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+        self.thread = weakref.ref(threading.current_thread())
+
+    def alive(self):
+        thread = self.thread()
+        return thread is not None and thread.is_alive()
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}  # Totals of the shards of threads that have exited
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._retire_dead_shards()
+                self._shards.append(shard)
+            return shard
+
+    def _retire_dead_shards(self):
+        """Fold the shards of exited threads into ``_retired`` (call with ``_lock`` held)"""
+        live = []
+        for shard in self._shards:
+            if shard.alive():
+                live.append(shard)
+            else:
+                for key, value in shard.values.items():
+                    self._add(self._retired, key, value)
+        self._shards = live
+
+    def collect(self):
+        with self._lock:
+            self._retire_dead_shards()
+            shards = list(self._shards)
+            totals = {}
+            for key, value in self._retired.items():
+                self._add(totals, key, value)
+        for shard in shards:
+            # The owning thread may be inserting new series; read under its lock
+            with shard.lock:
+                for key, value in shard.values.items():
+                    self._add(totals, key, value)
+        return totals
+
+    def _key(self, labels):
+        return tuple([str(labels.get(name, '')) for name in self.labelnames])
+
+    def _label_text(self, key, extra=()):
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        pairs.extend(f'{name}="{value}"' for name, value in extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        with shard.lock:
+            shard.values[key] = shard.values.get(key, 0) + amount
+
+    @staticmethod
+    def _add(totals, key, value):
+        totals[key] = totals.get(key, 0) + value
+
+    def samples(self):
+        for key, value in sorted(self.collect().items()):
+            yield f'{self.name}{self._label_text(key)} {_number(value)}'
+
+
+class Gauge(Counter):
+    """Up/down value such as requests in flight (per-thread deltas are summed)"""
+
+    kind = 'gauge'
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        bucket = bisect.bisect_left(self.buckets, value)
+        with shard.lock:
+            series = shard.values.get(key)
+            if series is None:
+                series = shard.values[key] = [0] * (len(self.buckets) + 2)  # per-bucket counts, +Inf, sum
+            series[bucket] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block; ``labels`` may be updated inside it"""
+        started = time.perf_counter()
+        try:
+            yield labels
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    @staticmethod
+    def _add(totals, key, series):
+        total = totals.setdefault(key, [0] * len(series))
+        for index, value in enumerate(series):
+            total[index] += value
+
+    def samples(self):
+        for key, series in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f'{self.name}_bucket{self._label_text(key, [("le", _number(bound))])} {cumulative}'
+            count = cumulative + series[-2]
+            yield f'{self.name}_bucket{self._label_text(key, [("le", "+Inf")])} {count}'
+            yield f'{self.name}_count{self._label_text(key)} {count}'
+            yield f'{self.name}_sum{self._label_text(key)} {_number(series[-1])}'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+REGISTRY = []
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(metric.samples())
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """Plain Django view (no DRF negotiation) serving every registered metric"""
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
+
+
+# HTTP
+http_request_duration = Histogram(
+    'http_request_duration_seconds', 'Request latency by endpoint, method and status',
+    ['endpoint', 'method', 'status'],
+)
+http_requests_in_flight = Gauge('http_requests_in_flight', 'Requests being handled', ['endpoint'])
+# Bandwidth saved = sum(stage="raw") - sum(stage="sent")
+http_response_bytes = Counter(
+    'http_response_bytes_total', 'Response body bytes before and after compression', ['encoding', 'stage'],
+)
+http_compression_duration = Histogram(
+    'http_compression_duration_seconds', 'Time spent compressing response bodies', ['encoding'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+# Outbound AI providers
+provider_request_duration = Histogram(
+    'ai_provider_request_duration_seconds', 'AI provider call latency by outcome',
+    ['provider', 'outcome'],
+)
+provider_errors = Counter('ai_provider_errors_total', 'Failed AI provider calls by kind', ['provider', 'kind'])
+provider_timeouts = Counter('ai_provider_timeouts_total', 'AI provider calls that timed out', ['provider'])
+# AI usage per endpoint (provider-reported tokens when available, else estimated)
+ai_tokens = Counter('ai_tokens_total', 'AI tokens by endpoint, provider and direction', ['endpoint', 'provider', 'direction'])
+ai_cost = Counter('ai_cost_usd_total', 'Estimated AI spend in USD by endpoint and provider', ['endpoint', 'provider'])
+
+# Resume processing
+resume_extraction_duration = Histogram(
+    'resume_extraction_duration_seconds', 'Resume text extraction time by file type', ['file_type'],
+)
+memory_stage_peak = Histogram(
+    'memory_stage_peak_bytes', 'Peak traced allocations per request stage', ['stage'],
+    buckets=tuple(2 ** power * 1024 * 1024 for power in range(0, 11)),  # 1 MiB .. 1 GiB
+)
+batch_scored_resumes = Counter(
+    'batch_scored_resumes_total', 'Resumes through recruiter batch scoring by stage '
+    '(prefilter, provider, checkpoint)', ['stage'],
+)
+memory_budget_exceeded = Counter('memory_budget_exceeded_total', 'Stages aborted for exceeding the memory budget', ['stage'])
+
+# Caches (hit ratio = hits / (hits + misses))
+cache_requests = Counter('cache_requests_total', 'Cache lookups by cache and result', ['cache', 'result'])
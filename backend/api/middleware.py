@@ -0,0 +1,242 @@
+import os
+import random
+import secrets
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from . import compression, profiling, tracing
+from .metrics import http_compression_duration, http_request_duration, http_requests_in_flight, http_response_bytes
+from .renderers import dumps, loads
+
+
+class _SyncAndAsync:
+    """Middleware usable in a sync (WSGI) or async (ASGI) chain without forcing a mode switch"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            sync_process_view = getattr(self, 'process_view', None)
+            if sync_process_view is not None:
+                # In-memory bookkeeping only: run it on the event loop instead of
+                # letting Django hop to the sync thread for it
+                async def process_view(*args):
+                    return sync_process_view(*args)
+                self.process_view = process_view
+
+
+class MetricsMiddleware(_SyncAndAsync):
+    """Request latency per endpoint/method/status and in-flight requests per endpoint"""
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        return self._record(request, self.get_response(request), started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        return self._record(request, await self.get_response(request), started)
+
+    def _record(self, request, response, started):
+        endpoint = getattr(request, '_metrics_endpoint', None)
+        if endpoint is not None:
+            http_requests_in_flight.dec(endpoint=endpoint)
+        else:
+            # Unresolved paths are folded together to keep label cardinality bounded
+            endpoint = 'unmatched'
+        http_request_duration.observe(
+            time.perf_counter() - started,
+            endpoint=endpoint, method=request.method, status=response.status_code,
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        request._metrics_endpoint = match.url_name or match.view_name
+        http_requests_in_flight.inc(endpoint=request._metrics_endpoint)
+
+
+class CompressionMiddleware(_SyncAndAsync):
+    """Compress text responses of at least COMPRESSION['MIN_BYTES'] with the best encoding the client accepts"""
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self._compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._compress(request, await self.get_response(request))
+
+    @staticmethod
+    def _compress(request, response):
+        if not settings.COMPRESSION['ENABLED'] or response.streaming or response.has_header('Content-Encoding'):
+            return response
+        raw = len(response.content)
+        encoding = None
+        if raw >= settings.COMPRESSION['MIN_BYTES'] and compression.compressible(response):
+            patch_vary_headers(response, ('Accept-Encoding',))
+            encoding = compression.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is not None:
+            started = time.perf_counter()
+            compressed = compression.compress(response.content, encoding)
+            http_compression_duration.observe(time.perf_counter() - started, encoding=encoding)
+            if len(compressed) < raw:
+                response.content = compressed
+                response['Content-Length'] = str(len(compressed))
+                # A strong ETag names the identity bytes (RFC 9110 8.8.1); conditional GETs still match
+                etag = response.get('ETag')
+                if etag and etag.startswith('"'):
+                    response['ETag'] = 'W/' + etag
+                response['Content-Encoding'] = encoding
+            else:
+                encoding = None
+        http_response_bytes.inc(raw, encoding=encoding or 'identity', stage='raw')
+        http_response_bytes.inc(len(response.content), encoding=encoding or 'identity', stage='sent')
+        return response
+
+
+class TracingMiddleware(_SyncAndAsync):
+    """Root span per request, exported to the trace sink and optionally returned inline.
+
+    With an authorised ``X-Trace-Debug`` header, JSON responses gain a
+    ``_trace`` waterfall and every response a ``Server-Timing`` header.
+    """
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.TRACING['ENABLED']:
+            return self.get_response(request)
+        with self._root_span(request) as root:
+            response = self.get_response(request)
+            root.set_attribute('http.response.status_code', response.status_code)
+        return self._finish(request, response, root.trace)
+
+    async def __acall__(self, request):
+        if not settings.TRACING['ENABLED']:
+            return await self.get_response(request)
+        with self._root_span(request) as root:
+            response = await self.get_response(request)
+            root.set_attribute('http.response.status_code', response.status_code)
+        return self._finish(request, response, root.trace)
+
+    @staticmethod
+    def _root_span(request):
+        return tracing.start_trace(f'{request.method} {request.path}', {
+            'http.request.method': request.method,
+            'url.path': request.path,
+        })
+
+    def _finish(self, request, response, trace):
+        debug = tracing.debug_requested(request)
+        response['X-Trace-Id'] = trace.trace_id
+        if debug:
+            self._attach_waterfall(response, trace)
+        if tracing.should_export(forced=debug):
+            try:
+                tracing.export(trace)
+            except OSError as e:
+                print(f"Trace export failed: {e}")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        root = tracing.current_span()
+        match = request.resolver_match
+        endpoint = match.url_name or match.view_name
+        if isinstance(root, tracing.Span):
+            root.trace.endpoint = endpoint
+            root.name = f'{request.method} {endpoint}'
+            root.set_attribute('http.route', match.route)
+
+    @staticmethod
+    def _attach_waterfall(response, trace):
+        waterfall = trace.waterfall()
+        response['Server-Timing'] = ', '.join(
+            f'{span["name"].replace(" ", "_")};dur={span["duration_ms"]}' for span in waterfall['spans'][:30]
+        )
+        renderer = getattr(response, 'accepted_renderer', None)
+        if renderer is not None and isinstance(response.data, dict):
+            response.data['_trace'] = waterfall
+            response.content = renderer.render(response.data, response.accepted_media_type, response.renderer_context)
+        elif not response.streaming and response.get('Content-Type', '').startswith('application/json'):
+            # Views outside DRF (the async AI views) answer with plain JSON responses
+            data = loads(response.content)
+            if not isinstance(data, dict):
+                return
+            data['_trace'] = waterfall
+            response.content = dumps(data)
+        else:
+            return
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        response['Cache-Control'] = 'no-store'
+
+
+class ProfilingMiddleware(_SyncAndAsync):
+    """Sample the stack of selected requests and write collapsed stacks for flamegraphs.
+
+    A request is profiled when its ``X-Flamegraph`` header matches
+    PROFILING['TOKEN'] or when it falls within PROFILING['SAMPLE_RATE'], and
+    only if one of the MAX_CONCURRENT profiling slots is free. In an async
+    chain requests share the event loop thread, so its stack would mix
+    concurrent requests; async requests are passed through unprofiled.
+    """
+
+    header = 'X-Flamegraph'
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    def _requested(self, request):
+        value = request.headers.get(self.header)
+        token = settings.PROFILING['TOKEN']
+        return bool(value and token and secrets.compare_digest(value, token))
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        requested = self._requested(request)
+        rate = settings.PROFILING['SAMPLE_RATE']
+        if not (requested or (rate and random.random() < rate)) or not profiling.try_acquire():
+            return self.get_response(request)
+
+        try:
+            sampler = profiling.StackSampler(
+                threading.get_ident(),
+                interval=settings.PROFILING['INTERVAL_MS'] / 1000,
+                max_overhead=settings.PROFILING['MAX_OVERHEAD'],
+                max_seconds=settings.PROFILING['MAX_SECONDS'],
+            ).start()
+            try:
+                response = self.get_response(request)
+            finally:
+                sampler.stop()
+        finally:
+            profiling.release()
+
+        match = request.resolver_match
+        endpoint = (match.url_name or match.view_name) if match else 'unmatched'
+        trace = tracing.current_trace()
+        try:
+            path = profiling.write_profile(sampler, f'{endpoint}-{trace.trace_id[:12] if trace else secrets.token_hex(6)}')
+        except OSError as e:
+            print(f"Profile write failed: {e}")
+            return response
+        tracing.current_span().set_attributes({
+            'profile.file': path,
+            'profile.samples': sampler.samples,
+            'profile.overhead': round(sampler.overhead, 4),
+        })
+        if requested:
+            response['X-Flamegraph-File'] = os.path.basename(path)
+            response['X-Flamegraph-Samples'] = str(sampler.samples)
+        return response
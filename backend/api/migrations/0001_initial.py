@@ -0,0 +1,55 @@
+# Generated by Django 4.2.16 on 2026-10-19 11:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Application',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applicant', models.CharField(max_length=64)),
+                ('job_id', models.CharField(max_length=64)),
+                ('job_title', models.CharField(blank=True, max_length=255)),
+                ('company', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('under_review', 'Under review'), ('interview', 'Interview'), ('offer', 'Offer'), ('rejected', 'Rejected'), ('withdrawn', 'Withdrawn')], default='submitted', max_length=20)),
+                ('cover_letter', models.TextField(blank=True)),
+                ('resume_id', models.CharField(blank=True, max_length=64)),
+                ('idempotency_key', models.CharField(blank=True, max_length=128, null=True)),
+                ('applied_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ApplicationStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applicant', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('under_review', 'Under review'), ('interview', 'Interview'), ('offer', 'Offer'), ('rejected', 'Rejected'), ('withdrawn', 'Withdrawn')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='applicationstatuscount',
+            constraint=models.UniqueConstraint(fields=('applicant', 'status'), name='application_status_count'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', '-applied_at', '-id'], name='application_history'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job_id', 'status'], name='application_job_status'),
+        ),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('applicant', 'idempotency_key'), name='application_idempotency'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-19 12:25
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParsedResume',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applicant', models.CharField(max_length=64)),
+                ('version', models.PositiveIntegerField()),
+                ('resume_id', models.CharField(max_length=64)),
+                ('sections', models.JSONField()),
+                ('section_hashes', models.JSONField()),
+                ('changes', models.JSONField(default=dict)),
+                ('analysis', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['applicant', '-version'], name='parsed_resume_history'), models.Index(fields=['applicant', 'resume_id'], name='parsed_resume_lookup')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='parsedresume',
+            constraint=models.UniqueConstraint(fields=('applicant', 'version'), name='parsed_resume_version'),
+        ),
+    ]
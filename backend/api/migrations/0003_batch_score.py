@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-19 12:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_parsed_resume'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_id', models.CharField(max_length=32)),
+                ('resume_id', models.CharField(max_length=255)),
+                ('score', models.FloatField()),
+                ('reason', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='batch_score_created')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='batchscore',
+            constraint=models.UniqueConstraint(fields=('batch_id', 'resume_id'), name='batch_score_resume'),
+        ),
+    ]
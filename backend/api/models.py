@@ -1,3 +1,105 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Application(models.Model):
+    """A job application submitted through jobs_apply / jobs_bulk_apply"""
+
+    STATUS_CHOICES = [
+        ('submitted', 'Submitted'),
+        ('under_review', 'Under review'),
+        ('interview', 'Interview'),
+        ('offer', 'Offer'),
+        ('rejected', 'Rejected'),
+        ('withdrawn', 'Withdrawn'),
+    ]
+
+    # Authenticated user ("user:<pk>") or anonymous session ("session:<key>")
+    applicant = models.CharField(max_length=64)
+    job_id = models.CharField(max_length=64)
+    job_title = models.CharField(max_length=255, blank=True)
+    company = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='submitted')
+    cover_letter = models.TextField(blank=True)
+    resume_id = models.CharField(max_length=64, blank=True)
+    # Client-chosen key; a retried submit with the same key returns the first application
+    idempotency_key = models.CharField(max_length=128, null=True, blank=True)
+    applied_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Applicant history, newest first (cursor paging walks this index)
+            models.Index(fields=['applicant', '-applied_at', '-id'], name='application_history'),
+            models.Index(fields=['job_id', 'status'], name='application_job_status'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['applicant', 'idempotency_key'], name='application_idempotency'),
+        ]
+
+    def __str__(self):
+        return f'{self.applicant} -> {self.job_title or self.job_id} ({self.status})'
+
+
+class ApplicationStatusCount(models.Model):
+    """Number of applications per applicant and status, kept up to date on every write"""
+
+    applicant = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['applicant', 'status'], name='application_status_count'),
+        ]
+
+
+class ParsedResume(models.Model):
+    """One uploaded version of an applicant's resume: its section parse and per-section analysis"""
+
+    # Same identity as Application.applicant
+    applicant = models.CharField(max_length=64)
+    version = models.PositiveIntegerField()
+    # Content-derived ID (api.resume_store.resume_id_for), as used by the section endpoints
+    resume_id = models.CharField(max_length=64)
+    # api.sections.segment output and a digest of each section
+    sections = models.JSONField()
+    section_hashes = models.JSONField()
+    # Section-level diff against the previous version (api.resume_versions.diff_sections)
+    changes = models.JSONField(default=dict)
+    # {section: {'hash', 'target_role', 'result'}}, filled in by reprocess
+    analysis = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['applicant', '-version'], name='parsed_resume_history'),
+            models.Index(fields=['applicant', 'resume_id'], name='parsed_resume_lookup'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['applicant', 'version'], name='parsed_resume_version'),
+        ]
+
+    def __str__(self):
+        return f'{self.applicant} v{self.version} ({self.resume_id})'
+
+
+class BatchScore(models.Model):
+    """One resume's provider score in a recruiter batch (api.batch_scoring checkpoint)"""
+
+    # api.batch_scoring.batch_id_for
+    batch_id = models.CharField(max_length=32)
+    resume_id = models.CharField(max_length=255)
+    score = models.FloatField()
+    reason = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='batch_score_created'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['batch_id', 'resume_id'], name='batch_score_resume'),
+        ]
+
+    def __str__(self):
+        return f'{self.batch_id}/{self.resume_id}: {self.score:g}'
@@ -0,0 +1,107 @@
+"""Turning raw provider output into normalised job dicts"""
+import json
+import re
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+
+from .catalogue import catalogue, stable_job_id
+from .memory import MemoryBudget, MemoryBudgetExceeded
+from .salary import normalize_job_salary
+
+MAX_JOBS = 25  # Jobs kept from one response; the rest are not formatted at all
+
+FIRST_SEEN_CACHE_PREFIX = 'job_first_seen:'
+FIRST_SEEN_TIMEOUT = 60 * 60 * 24 * 90  # Outlives catalogue eviction and the job cache
+
+
+def first_seen_date(job_id, spread_days=1):
+    """Posted date for a job that did not come with one.
+
+    Reuses the date already recorded for a known job; otherwise spreads new
+    jobs over the last ``spread_days`` days using the ID. The first date
+    given out for an ID is kept in the cache, so it stays fixed when the job
+    is re-added after being evicted instead of drifting with the clock.
+    """
+    known = catalogue.get(job_id)
+    if known and known.get('posted_date'):
+        return known['posted_date']
+    days_ago = 1 + int(job_id.replace('-', '')[:8], 16) % spread_days
+    date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+    key = f'{FIRST_SEEN_CACHE_PREFIX}{job_id}'
+    cache.add(key, date, FIRST_SEEN_TIMEOUT)
+    return cache.get(key, date)
+
+
+def parse_jobs_from_ai_response(content, remember=True):
+    """Parse job listings from AI response content
+
+    Parsed jobs are added to the job catalogue unless ``remember`` is False.
+    Raises MemoryBudgetExceeded if decoding the response outgrows the budget.
+    """
+    try:
+        with MemoryBudget('parsing') as budget:
+            return _parse_jobs(content, remember, budget)
+    except MemoryBudgetExceeded:
+        raise
+    except Exception as e:
+        print(f"Error parsing jobs from AI response: {str(e)}")
+        return []
+
+
+def _parse_jobs(content, remember, budget):
+    # Try to find JSON in the response
+    json_match = re.search(r'\[.*\]', content, re.DOTALL)
+    if json_match:
+        jobs_data = json.loads(json_match.group())
+    else:
+        # Try to parse the entire content as JSON
+        jobs_data = json.loads(content)
+    budget.check()
+    
+    formatted_jobs = []
+    for job in jobs_data:
+        if isinstance(job, dict):
+            title = job.get('title', job.get('job_title', 'Software Developer'))
+            company = job.get('company', job.get('company_name', 'Tech Company'))
+            job_location = job.get('location', 'Remote')
+            source_url = job.get('apply_url', job.get('application_url', job.get('url', '')))
+            
+            # Same posting -> same ID, so detail lookups and caches can key on it
+            job_id = stable_job_id(company, title, job_location, source_url)
+            
+            # Format the job data to match frontend expectations
+            formatted_job = {
+                'id': job_id,
+                'title': title,
+                'company': company,
+                'location': job_location,
+                'job_type': job.get('job_type', job.get('type', 'Full-time')),
+                'experience_level': job.get('experience_level', job.get('level', 'Entry Level')),
+                'salary_min': None,
+                'salary_max': None,
+                'description': job.get('description', job.get('job_description', 'Great opportunity to grow your career.')),
+                'skills_required': job.get('skills_required', job.get('required_skills', job.get('skills', ['Programming']))),
+                'posted_date': job.get('posted_date') or first_seen_date(job_id, spread_days=7),
+                'source': 'linkedin',
+                'is_remote': 'remote' in job_location.lower() or job.get('job_type', '').lower() == 'remote',
+                'apply_url': source_url or f'https://linkedin.com/jobs/view/{job_id}'
+            }
+            
+            # Normalise "3-8 LPA", "$100k-$150k", etc. into an annual range; no made-up defaults
+            normalize_job_salary(
+                formatted_job,
+                raw_min=job.get('salary_min', job.get('min_salary')),
+                raw_max=job.get('salary_max', job.get('max_salary')),
+                raw_text=job.get('salary', job.get('salary_range')),
+            )
+            
+            # Ensure skills_required is a list
+            if isinstance(formatted_job['skills_required'], str):
+                formatted_job['skills_required'] = [s.strip() for s in formatted_job['skills_required'].split(',')]
+            
+            formatted_jobs.append(formatted_job)
+            if len(formatted_jobs) == MAX_JOBS:
+                break
+    
+    return catalogue.add(formatted_jobs) if remember else formatted_jobs
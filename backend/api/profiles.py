@@ -0,0 +1,108 @@
+"""Compact, signed resume profile used to personalise jobs_list.
+
+Instead of a full analysis blob in the database-backed session, the resume
+endpoints hand the client a small signed token (cookie ``job_profile`` and
+the ``profile_token`` response field, sent back as ``X-Profile-Token``)
+holding only what ranking needs: skill IDs, seniority level, location, target
+role and a profile hash. Reading it is an HMAC check and a JSON decode, with
+no database or cache round trip.
+"""
+import hashlib
+import json
+from collections import namedtuple
+
+from django.core import signing
+
+from .matching import (
+    COMMON_SKILLS, SENIORITY_LEVELS, SKILLS, TITLE_STOPWORDS, UNKNOWN_LEVEL,
+    ResumeProfile, extract_skill_ids, location_key, normalize_skill, seniority_level, tokenize,
+)
+
+PROFILE_VERSION = 1
+PROFILE_COOKIE = 'job_profile'
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_SALT = 'api.profiles'
+PROFILE_MAX_AGE = 60 * 60 * 24 * 30
+MAX_SKILLS = 40
+
+# Token skill IDs index COMMON_SKILLS, which never reorders; other skills travel by name
+_COMMON_SKILL_IDS = {skill: index for index, skill in enumerate(COMMON_SKILLS)}
+
+LEVEL_LABELS = ['Internship', 'Entry Level', 'Mid Level', 'Senior', 'Lead']
+
+
+class UserProfile(namedtuple('UserProfile', ['skills', 'level', 'location', 'target_role'])):
+    """Normalised skills (sorted tuple), seniority level index, location key, target role"""
+
+    @classmethod
+    def build(cls, skills=(), experience_level='', location='', target_role='', resume_text=''):
+        names = {normalize_skill(skill) for skill in skills if skill}
+        names.update(SKILLS.terms[skill_id] for skill_id in extract_skill_ids(resume_text))
+        level = seniority_level(experience_level)
+        if level == UNKNOWN_LEVEL and resume_text:
+            level = seniority_level(resume_text)
+        return cls(tuple(sorted(names)[:MAX_SKILLS]), level, location_key(location), str(target_role or '').strip())
+
+    @classmethod
+    def from_token(cls, token):
+        """Profile from a signed token, or None if it is invalid, expired or outdated"""
+        try:
+            payload = signing.loads(token, salt=PROFILE_SALT, max_age=PROFILE_MAX_AGE)
+        except signing.BadSignature:
+            return None
+        if not isinstance(payload, dict) or payload.get('v') != PROFILE_VERSION:
+            return None
+        skills = tuple(COMMON_SKILLS[s] if isinstance(s, int) else s for s in payload.get('s', []))
+        return cls(skills, payload.get('e', UNKNOWN_LEVEL), payload.get('l', ''), payload.get('r', ''))
+
+    @property
+    def fingerprint(self):
+        canonical = json.dumps([PROFILE_VERSION, *self], separators=(',', ':'))
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
+
+    def token(self):
+        return signing.dumps({
+            'v': PROFILE_VERSION,
+            's': [_COMMON_SKILL_IDS.get(skill, skill) for skill in self.skills],
+            'e': self.level,
+            'l': self.location,
+            'r': self.target_role,
+            'h': self.fingerprint,
+        }, salt=PROFILE_SALT, compress=True)
+
+    def resume_profile(self):
+        """Matching features for ranking jobs against this profile"""
+        return ResumeProfile(
+            SKILLS.known(self.skills),
+            [t for t in tokenize(self.target_role) if t not in TITLE_STOPWORDS],
+            self.level,
+            self.location,
+        )
+
+    def as_analysis(self):
+        """The analysis-dict shape ai_generate_jobs builds its prompt from"""
+        return {
+            'skills': list(self.skills),
+            'experience_level': LEVEL_LABELS[self.level] if self.level < len(SENIORITY_LEVELS) else '',
+            'location': self.location,
+            'target_role': self.target_role,
+        }
+
+
+def read_profile(request):
+    """The caller's profile from the X-Profile-Token header or cookie, or None"""
+    token = request.headers.get(PROFILE_HEADER) or request.COOKIES.get(PROFILE_COOKIE)
+    return UserProfile.from_token(token) if token else None
+
+
+def set_profile_cookie(response, token):
+    response.set_cookie(PROFILE_COOKIE, token, max_age=PROFILE_MAX_AGE, httponly=True, samesite='Lax')
+    return response
+
+
+def attach_profile(response, profile):
+    """Hand ``profile`` to the client as a cookie and a ``profile_token`` field"""
+    token = profile.token()
+    if isinstance(response.data, dict):
+        response.data['profile_token'] = token
+    return set_profile_cookie(response, token)
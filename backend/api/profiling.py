@@ -0,0 +1,150 @@
+"""On-demand sampling profiler for single production requests.
+
+A sampler thread reads the request thread's stack from
+``sys._current_frames()`` at a fixed interval and counts identical stacks;
+the result is written in the collapsed ("folded") format that flamegraph.pl,
+speedscope and inferno read directly: one ``outer;inner;leaf count`` line per
+distinct stack. Sampling backs off whenever its own cost would exceed
+``PROFILING['MAX_OVERHEAD']`` of wall time, stops after ``MAX_SECONDS``, and
+at most ``MAX_CONCURRENT`` requests are profiled at once. Each write prunes
+the directory to the newest ``MAX_FILES`` profiles younger than
+``MAX_AGE_SECONDS``.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+_slots = None
+_slots_lock = threading.Lock()
+
+
+def _concurrency_slots():
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(settings.PROFILING['MAX_CONCURRENT'])
+        return _slots
+
+
+def try_acquire():
+    """Reserve a profiling slot without waiting; False if the cap is reached"""
+    return _concurrency_slots().acquire(blocking=False)
+
+
+def release():
+    _concurrency_slots().release()
+
+
+class StackSampler:
+    """Samples one thread's stack in the background until ``stop()``"""
+
+    def __init__(self, thread_id, interval=0.005, max_overhead=0.02, max_seconds=60.0):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.max_seconds = max_seconds
+        self.stacks = Counter()
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._labels = {}
+        self._root = os.path.dirname(settings.BASE_DIR)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        self.wall_seconds = time.perf_counter() - self._started
+        return self
+
+    @property
+    def overhead(self):
+        """Fraction of the profiled wall time spent taking samples"""
+        return self.sampling_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename
+            if path.startswith(self._root):
+                path = os.path.relpath(path, self._root)
+            else:
+                path = '/'.join(path.split(os.sep)[-2:])
+            label = self._labels[code] = f'{code.co_name} ({path}:{code.co_firstlineno})'
+        return label
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        self.stacks[';'.join(labels)] += 1
+        self.samples += 1
+
+    def _run(self):
+        deadline = self._started + self.max_seconds
+        delay = self.interval
+        while not self._stopped.wait(delay):
+            began = time.perf_counter()
+            if began > deadline:
+                break
+            self._sample()
+            cost = time.perf_counter() - began
+            self.sampling_seconds += cost
+            # Keep cost / (cost + delay) at or below the overhead cap
+            delay = max(self.interval, cost / self.max_overhead - cost)
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+PROFILE_SUFFIX = '.folded'
+
+
+def prune_profiles(directory):
+    """Delete profiles beyond PROFILING['MAX_FILES'] (oldest first) or older than MAX_AGE_SECONDS"""
+    options = settings.PROFILING
+    profiles = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(PROFILE_SUFFIX):
+            try:
+                profiles.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue  # Pruned by another worker
+    profiles.sort(reverse=True)
+    stale_before = time.time() - options['MAX_AGE_SECONDS']
+    removed = 0
+    for index, (modified, path) in enumerate(profiles):
+        if index >= options['MAX_FILES'] or modified < stale_before:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def write_profile(sampler, name):
+    """Write the collapsed stacks to PROFILING['DIR'] and prune it; returns the file path"""
+    directory = settings.PROFILING['DIR']
+    os.makedirs(directory, exist_ok=True)
+    safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+    path = os.path.join(directory, f'{time.strftime("%Y%m%dT%H%M%S")}-{safe_name}{PROFILE_SUFFIX}')
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write(sampler.collapsed())
+    prune_profiles(directory)
+    return path
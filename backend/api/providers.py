@@ -0,0 +1,273 @@
+"""Thin wrappers around the external AI providers (Perplexity and Gemini).
+
+The provider SDKs are imported on first use rather than at module load, so
+worker boots and ``manage.py`` commands do not pay for them (the Gemini SDK
+alone is most of the backend's import time). ``warm_up()`` loads them ahead
+of time when WARM_UP_IMPORTS is on, e.g. in a preloading gunicorn master.
+"""
+import asyncio
+import importlib
+import threading
+import time
+import weakref
+
+from decouple import config
+
+from .metrics import provider_errors, provider_request_duration, provider_timeouts
+from .tracing import estimate_tokens, record_usage, span
+
+PERPLEXITY_API_URL = config('PERPLEXITY_API_URL', default='https://api.perplexity.ai/chat/completions')
+PERPLEXITY_MODEL = 'llama-3.1-sonar-small-128k-online'
+GEMINI_MODEL = 'gemini-1.5-flash'
+# Call Gemini's REST API at this base URL instead of through the SDK (proxies, load-test fakes)
+GEMINI_API_BASE = config('GEMINI_API_BASE', default='')
+
+# Heavy modules loaded on demand; warm_up() imports all of them
+WARM_UP_MODULES = ('requests', 'httpx', 'google.generativeai', 'PyPDF2', 'docx')
+
+_genai = None
+_genai_lock = threading.Lock()
+
+# Outbound connections per event loop for the async clients
+ASYNC_MAX_CONNECTIONS = config('AI_ASYNC_MAX_CONNECTIONS', default=100, cast=int)
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _gemini_sdk():
+    """The configured google.generativeai module, imported on first call"""
+    global _genai
+    if _genai is None:
+        with _genai_lock:
+            if _genai is None:
+                import google.generativeai as genai
+                try:
+                    genai.configure(api_key=config('GOOGLE_GEMINI_API_KEY', default=''))
+                except Exception:
+                    pass  # Handle missing API key gracefully
+                _genai = genai
+    return _genai
+
+
+def _async_http_client():
+    """One pooled httpx.AsyncClient per event loop (clients cannot be shared across loops)"""
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _async_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=ASYNC_MAX_CONNECTIONS, max_keepalive_connections=ASYNC_MAX_CONNECTIONS),
+        )
+    return client
+
+
+def warm_up():
+    """Import the provider SDKs and document parsers now instead of on first use"""
+    for name in WARM_UP_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"Warm-up could not import {name}: {e}")
+    _gemini_sdk()
+
+
+class ProviderError(Exception):
+    """An AI provider could not be reached or returned an unusable response"""
+
+
+def perplexity_api_key():
+    return config('PERPLEXITY_API_KEY', default='')
+
+
+def perplexity_configured():
+    key = perplexity_api_key()
+    return bool(key) and key != 'your-perplexity-api-key-here'
+
+
+def gemini_configured():
+    return bool(config('GOOGLE_GEMINI_API_KEY', default='')) or bool(GEMINI_API_BASE)
+
+
+def _observe(provider, started, outcome, kind=None, call=None):
+    provider_request_duration.observe(time.perf_counter() - started, provider=provider, outcome=outcome)
+    if kind:
+        provider_errors.inc(provider=provider, kind=kind)
+        if kind == 'timeout':
+            provider_timeouts.inc(provider=provider)
+    if call is not None:
+        call.set_attribute('ai.outcome', kind or outcome)
+
+
+def _call_span(provider, model, prompt, system=None):
+    return span(f'{provider}.generate', {
+        'gen_ai.system': provider,
+        'gen_ai.request.model': model,
+        'ai.prompt_chars': len(prompt) + len(system or ''),
+    }, kind='CLIENT')
+
+
+def _perplexity_request(prompt, system, options):
+    if not perplexity_configured():
+        raise ProviderError('Perplexity API key is not configured')
+
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
+    headers = {
+        "Authorization": f"Bearer {perplexity_api_key()}",
+        "Content-Type": "application/json"
+    }
+    return headers, {"model": PERPLEXITY_MODEL, "messages": messages, **options}
+
+
+def _perplexity_content(call, started, prompt, system, status_code, read_json):
+    if status_code != 200:
+        _observe('perplexity', started, 'error', f'http_{status_code}', call)
+        raise ProviderError(f'Perplexity API error: {status_code}')
+    try:
+        body = read_json()
+        content = body['choices'][0]['message']['content']
+    except (ValueError, KeyError, IndexError) as e:
+        _observe('perplexity', started, 'error', 'bad_response', call)
+        raise ProviderError(f'Unexpected Perplexity response: {e}') from e
+    _observe('perplexity', started, 'ok', call=call)
+
+    usage = body.get('usage') or {}
+    if usage.get('prompt_tokens') is not None:
+        record_usage(call, 'perplexity', PERPLEXITY_MODEL,
+                     usage['prompt_tokens'], usage.get('completion_tokens') or 0)
+    else:
+        record_usage(call, 'perplexity', PERPLEXITY_MODEL,
+                     estimate_tokens(prompt) + estimate_tokens(system), estimate_tokens(content), estimated=True)
+    return content
+
+
+def perplexity_chat(prompt, system=None, timeout=30, **options):
+    """Run one Perplexity chat completion and return the message content"""
+    headers, data = _perplexity_request(prompt, system, options)
+
+    import requests
+
+    with _call_span('perplexity', PERPLEXITY_MODEL, prompt, system) as call:
+        call.set_attribute('ai.timeout_seconds', timeout)
+        started = time.perf_counter()
+        try:
+            response = requests.post(PERPLEXITY_API_URL, headers=headers, json=data, timeout=timeout)
+        except requests.Timeout as e:
+            _observe('perplexity', started, 'error', 'timeout', call)
+            raise ProviderError(f'Perplexity request timed out: {e}') from e
+        except requests.RequestException as e:
+            _observe('perplexity', started, 'error', 'connection', call)
+            raise ProviderError(f'Perplexity request failed: {e}') from e
+        return _perplexity_content(call, started, prompt, system, response.status_code, response.json)
+
+
+async def perplexity_chat_async(prompt, system=None, timeout=30, **options):
+    """``perplexity_chat`` for async views, over a pooled httpx client"""
+    headers, data = _perplexity_request(prompt, system, options)
+
+    import httpx
+
+    with _call_span('perplexity', PERPLEXITY_MODEL, prompt, system) as call:
+        call.set_attribute('ai.timeout_seconds', timeout)
+        started = time.perf_counter()
+        try:
+            response = await _async_http_client().post(PERPLEXITY_API_URL, headers=headers, json=data, timeout=timeout)
+        except httpx.TimeoutException as e:
+            _observe('perplexity', started, 'error', 'timeout', call)
+            raise ProviderError(f'Perplexity request timed out: {e}') from e
+        except httpx.HTTPError as e:
+            _observe('perplexity', started, 'error', 'connection', call)
+            raise ProviderError(f'Perplexity request failed: {e}') from e
+        return _perplexity_content(call, started, prompt, system, response.status_code, response.json)
+
+
+def _gemini_failed(call, started, error):
+    name = type(error).__name__.lower()
+    kind = 'timeout' if 'deadline' in name or 'timeout' in name else 'error'
+    _observe('gemini', started, 'error', kind, call)
+    return ProviderError(f'Gemini request failed: {error}')
+
+
+def _gemini_text(call, started, prompt, text, usage):
+    _observe('gemini', started, 'ok', call=call)
+    if usage is not None:
+        record_usage(call, 'gemini', GEMINI_MODEL, *usage)
+    else:
+        record_usage(call, 'gemini', GEMINI_MODEL, estimate_tokens(prompt), estimate_tokens(text), estimated=True)
+    return text
+
+
+def _sdk_usage(response):
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is None or getattr(usage, 'prompt_token_count', None) is None:
+        return None
+    return usage.prompt_token_count, usage.candidates_token_count or 0
+
+
+def _gemini_rest_request(prompt):
+    url = f"{GEMINI_API_BASE.rstrip('/')}/v1beta/models/{GEMINI_MODEL}:generateContent"
+    headers = {'x-goog-api-key': config('GOOGLE_GEMINI_API_KEY', default=''), 'Content-Type': 'application/json'}
+    return url, headers, {'contents': [{'parts': [{'text': prompt}]}]}
+
+
+def _gemini_rest_reply(call, started, prompt, status_code, read_json):
+    if status_code != 200:
+        _observe('gemini', started, 'error', f'http_{status_code}', call)
+        raise ProviderError(f'Gemini API error: {status_code}')
+    try:
+        body = read_json()
+        text = ''.join(part.get('text', '') for part in body['candidates'][0]['content']['parts'])
+    except (ValueError, KeyError, IndexError, AttributeError) as e:
+        _observe('gemini', started, 'error', 'bad_response', call)
+        raise ProviderError(f'Unexpected Gemini response: {e}') from e
+    usage = body.get('usageMetadata') or {}
+    tokens = (usage['promptTokenCount'], usage.get('candidatesTokenCount', 0)) if 'promptTokenCount' in usage else None
+    return _gemini_text(call, started, prompt, text, tokens)
+
+
+def gemini_generate(prompt):
+    """Run one Gemini completion and return the response text"""
+    if GEMINI_API_BASE:
+        return _gemini_generate_rest(prompt)
+    with _call_span('gemini', GEMINI_MODEL, prompt) as call:
+        started = time.perf_counter()
+        try:
+            response = _gemini_sdk().GenerativeModel(GEMINI_MODEL).generate_content(prompt)
+            text = response.text
+        except Exception as e:
+            raise _gemini_failed(call, started, e) from e
+        return _gemini_text(call, started, prompt, text, _sdk_usage(response))
+
+
+def _gemini_generate_rest(prompt, timeout=60):
+    import requests
+
+    url, headers, data = _gemini_rest_request(prompt)
+    with _call_span('gemini', GEMINI_MODEL, prompt) as call:
+        started = time.perf_counter()
+        try:
+            response = requests.post(url, headers=headers, json=data, timeout=timeout)
+        except requests.RequestException as e:
+            raise _gemini_failed(call, started, e) from e
+        return _gemini_rest_reply(call, started, prompt, response.status_code, response.json)
+
+
+async def gemini_generate_async(prompt, timeout=60):
+    """``gemini_generate`` for async views (the SDK's asyncio transport, or httpx with GEMINI_API_BASE)"""
+    with _call_span('gemini', GEMINI_MODEL, prompt) as call:
+        started = time.perf_counter()
+        if GEMINI_API_BASE:
+            import httpx
+
+            url, headers, data = _gemini_rest_request(prompt)
+            try:
+                response = await _async_http_client().post(url, headers=headers, json=data, timeout=timeout)
+            except httpx.HTTPError as e:
+                raise _gemini_failed(call, started, e) from e
+            return _gemini_rest_reply(call, started, prompt, response.status_code, response.json)
+        try:
+            response = await _gemini_sdk().GenerativeModel(GEMINI_MODEL).generate_content_async(prompt)
+            text = response.text
+        except Exception as e:
+            raise _gemini_failed(call, started, e) from e
+        return _gemini_text(call, started, prompt, text, _sdk_usage(response))
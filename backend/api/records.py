@@ -0,0 +1,125 @@
+"""Compact in-memory representation of catalogue jobs.
+
+A job dict from the providers carries its own hash table plus a fresh copy
+of every string (``'Full-time'``, ``'Bangalore, India'``, each skill name)
+for every posting. ``JobRecord`` keeps the same data in ``__slots__``:
+low-cardinality fields (job type, level, source, currency, company,
+location, posted date) are interned so all records share one string object,
+and skills are stored as an ``array`` of IDs into a shared skill-name table.
+
+Records are read-only ``Mapping`` objects, so the matching, facet and index
+code reads them exactly like the dicts, and ``dict(record)`` gives back the
+original API JSON.
+"""
+import sys
+import threading
+from array import array
+from collections.abc import Mapping
+
+FIELDS = (
+    'id', 'title', 'company', 'location', 'job_type', 'experience_level',
+    'salary_min', 'salary_max', 'description', 'skills_required', 'posted_date',
+    'source', 'is_remote', 'apply_url', 'salary_currency',
+)
+
+# Values repeat across most of the catalogue, so every record shares one copy
+INTERNED_FIELDS = frozenset((
+    'company', 'location', 'job_type', 'experience_level', 'posted_date', 'source', 'salary_currency',
+))
+
+_MISSING = object()  # Field absent from the source dict (as opposed to None)
+
+
+class SkillTable:
+    """Append-only table of skill names; a skill's ID is its position"""
+
+    def __init__(self):
+        self.names = []
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.names)
+
+    def ids(self, skills):
+        result = array('I')
+        for skill in skills:
+            skill_id = self._ids.get(skill)
+            if skill_id is None:
+                with self._lock:
+                    skill_id = self._ids.get(skill)
+                    if skill_id is None:
+                        skill_id = self._ids[skill] = len(self.names)
+                        self.names.append(sys.intern(skill))
+            result.append(skill_id)
+        return result
+
+
+skill_table = SkillTable()
+
+
+class JobRecord(Mapping):
+    __slots__ = FIELDS[:9] + ('skill_ids',) + FIELDS[10:] + ('extra',)
+
+    @classmethod
+    def from_dict(cls, job):
+        record = cls.__new__(cls)
+        extra = {key: value for key, value in job.items() if key not in FIELDS}
+        for field in FIELDS:
+            value = job.get(field, _MISSING)
+            if field == 'skills_required':
+                record.skill_ids = None
+                if isinstance(value, list) and all(type(skill) is str for skill in value):
+                    record.skill_ids = skill_table.ids(value)
+                elif value is not _MISSING:
+                    extra[field] = value  # Anything but a list of names is kept as given
+                continue
+            if field in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(record, field, value)
+        record.extra = extra or None
+        return record
+
+    def _value(self, key):
+        if key == 'skills_required':
+            if self.extra and key in self.extra:
+                return self.extra[key]
+            if self.skill_ids is None:
+                return _MISSING
+            names = skill_table.names
+            return [names[skill_id] for skill_id in self.skill_ids]
+        if key in FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, _MISSING) if self.extra else _MISSING
+
+    def __getitem__(self, key):
+        value = self._value(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._value(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key):
+        return self._value(key) is not _MISSING
+
+    def __iter__(self):
+        for field in FIELDS:
+            if self._value(field) is not _MISSING:
+                yield field
+        if self.extra:
+            yield from (key for key in self.extra if key not in FIELDS)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f'JobRecord({self.get("id")!r}, {self.get("title")!r})'
+
+    def __reduce__(self):
+        return JobRecord.from_dict, (dict(self),)
+
+    def to_dict(self):
+        return dict(self)
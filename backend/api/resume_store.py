@@ -0,0 +1,85 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import cache_requests
+from .sections import PARSER_VERSION, segment
+from .tracing import span
+
+# Namespace for content-derived resume IDs. Never change this: clients hold
+# on to the IDs returned by upload_resume to fetch sections later.
+RESUME_ID_NAMESPACE = uuid.UUID('c3f1a7d2-64b9-4e0f-8a5d-1b7e9c2f4a63')
+
+RESUME_CACHE_PREFIX = 'resume:sections:'
+
+
+def resume_id_for(text):
+    """Deterministic resume ID derived from the extracted text"""
+    digest = hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+    return str(uuid.uuid5(RESUME_ID_NAMESPACE, digest))
+
+
+class ParsedResumeStore:
+    """Section parses of uploaded resumes, keyed by ``resume_id_for``.
+
+    Each resume is segmented once; the result is kept in a bounded
+    in-process LRU, so the per-section endpoints are dictionary lookups, and
+    in Django's cache so any worker can answer for a resume another worker
+    parsed. Entries expire with the cache timeout.
+    """
+
+    def __init__(self):
+        self._parsed = OrderedDict()
+        self._lock = threading.Lock()  # Request threads share the LRU
+
+    def _remember(self, resume_id, parsed, expires_at):
+        with self._lock:
+            self._parsed[resume_id] = (parsed, expires_at)
+            self._parsed.move_to_end(resume_id)
+            while len(self._parsed) > settings.RESUME_STORE['LOCAL_ENTRIES']:
+                self._parsed.popitem(last=False)
+
+    def _recall(self, resume_id):
+        """Locally remembered sections, or None (dropping the entry if it has expired)"""
+        with self._lock:
+            parsed, expires_at = self._parsed.get(resume_id, (None, 0))
+            if parsed is not None and expires_at > time.monotonic():
+                self._parsed.move_to_end(resume_id)
+                return parsed
+            self._parsed.pop(resume_id, None)
+            return None
+
+    def parse(self, text):
+        """(resume ID, sections) for ``text``, segmenting it only if no worker has yet"""
+        resume_id = resume_id_for(text)
+        parsed = self.get(resume_id)
+        if parsed is None:
+            with span('segment_resume', {'resume.chars': len(text)}):
+                parsed = segment(text)
+            timeout = settings.RESUME_STORE['TIMEOUT']
+            self._remember(resume_id, parsed, time.monotonic() + timeout)
+            cache.set(f'{RESUME_CACHE_PREFIX}{resume_id}', parsed, timeout)
+        return resume_id, parsed
+
+    def get(self, resume_id):
+        """Sections for a resume ID, or None if it was never parsed or has expired"""
+        parsed = self._recall(resume_id)
+        if parsed is not None:
+            cache_requests.inc(cache='parsed_resume', result='hit')
+            return parsed
+        parsed = cache.get(f'{RESUME_CACHE_PREFIX}{resume_id}')
+        # Parses from an older segmenter are redone on the next upload
+        if parsed is not None and parsed.get('parser_version') != PARSER_VERSION:
+            parsed = None
+        cache_requests.inc(cache='parsed_resume', result='miss' if parsed is None else 'shared_hit')
+        if parsed is not None:
+            self._remember(resume_id, parsed, time.monotonic() + settings.RESUME_STORE['TIMEOUT'])
+        return parsed
+
+
+parsed_resumes = ParsedResumeStore()
@@ -0,0 +1,225 @@
+"""Versions of each applicant's parsed resume, and incremental re-analysis.
+
+Every upload whose text differs from the applicant's latest version becomes
+a new ``ParsedResume`` with a section-level diff against that version.
+``reanalyze`` sends a section to the provider only when no version of the
+applicant has an analysis for that section's digest and target role;
+everything else is reused, so fixing a typo in one project re-runs one
+call instead of the whole pipeline.
+
+Applicants are identified by ``applications.applicant_key`` (the user, else
+the session cookie). Versions of applicants who have not uploaded for
+``RESUME_STORE['VERSIONS_MAX_AGE']`` seconds, typically sessions that have
+since expired, are deleted by ``prune_stale``.
+"""
+import hashlib
+import json
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import ParsedResume
+from .prompts import experience_level_prompt, section_assessment_prompt
+from .providers import ProviderError, gemini_generate
+from .renderers import dumps
+
+SECTIONS = ('personal_info', 'summary', 'experience', 'education', 'skills', 'projects', 'certifications', 'other')
+# Sections the provider assesses; personal details come straight from the parse
+ASSESSED_SECTIONS = ('summary', 'experience', 'education', 'skills', 'projects', 'certifications')
+# Classified from the experience and education sections together
+EXPERIENCE_LEVEL = 'experience_level'
+PRUNE_CACHE_KEY = 'resume_versions:pruned'
+
+
+def digest(value):
+    return hashlib.sha256(dumps(value, sort_keys=True)).hexdigest()[:16]
+
+
+def section_hashes(parsed):
+    return {section: digest(parsed.get(section)) for section in SECTIONS}
+
+
+def _entry_changes(before, after):
+    before_digests = Counter(digest(entry) for entry in before)
+    after_digests = Counter(digest(entry) for entry in after)
+    return {
+        'added': [entry for entry in after if before_digests[digest(entry)] < after_digests[digest(entry)]],
+        'removed': [entry for entry in before if after_digests[digest(entry)] < before_digests[digest(entry)]],
+    }
+
+
+def diff_sections(previous, parsed):
+    """{'changed': [sections], 'sections': {section: what changed}} between two parses.
+
+    List sections report the entries added and removed (an edited entry is
+    both), skills the normalised skills added and removed, other mappings
+    the keys whose values differ and the summary whether it was replaced.
+    """
+    previous = previous or {}
+    changes = {}
+    for section in SECTIONS:
+        before, after = previous.get(section), parsed.get(section)
+        if before == after:
+            continue
+        if section == 'skills':
+            old, new = (before or {}).get('normalized', []), (after or {}).get('normalized', [])
+            changes[section] = {'added': [s for s in new if s not in old], 'removed': [s for s in old if s not in new]}
+        elif isinstance(after, list):
+            changes[section] = _entry_changes(before or [], after)
+        elif isinstance(after, dict):
+            before = before or {}
+            changes[section] = {'fields': sorted(key for key in set(before) | set(after)
+                                                 if before.get(key) != after.get(key))}
+        else:
+            changes[section] = {'replaced': True}
+    return {'changed': list(changes), 'sections': changes}
+
+
+def latest(applicant):
+    return ParsedResume.objects.filter(applicant=applicant).order_by('-version').first()
+
+
+def find(applicant, resume_id):
+    """The applicant's newest version with this resume ID, or None"""
+    return ParsedResume.objects.filter(applicant=applicant, resume_id=resume_id).order_by('-version').first()
+
+
+def history(applicant):
+    return ParsedResume.objects.filter(applicant=applicant).order_by('-version')
+
+
+def record(applicant, resume_id, parsed):
+    """Store ``parsed`` as the applicant's next version; returns (version, created).
+
+    Uploading the latest version's content again creates nothing. Versions
+    beyond ``RESUME_STORE['VERSIONS_KEPT']`` are pruned, oldest first.
+    """
+    for _ in range(3):
+        previous = latest(applicant)
+        if previous is not None and previous.resume_id == resume_id:
+            return previous, False
+        try:
+            with transaction.atomic():
+                version = ParsedResume.objects.create(
+                    applicant=applicant,
+                    version=previous.version + 1 if previous else 1,
+                    resume_id=resume_id,
+                    sections=parsed,
+                    section_hashes=section_hashes(parsed),
+                    changes=diff_sections(previous.sections if previous else None, parsed),
+                )
+        except IntegrityError:
+            continue  # A concurrent upload took this version number; diff against it instead
+        ParsedResume.objects.filter(
+            applicant=applicant, version__lte=version.version - settings.RESUME_STORE['VERSIONS_KEPT'],
+        ).delete()
+        if cache.add(PRUNE_CACHE_KEY, True, settings.RESUME_STORE['PRUNE_INTERVAL']):
+            prune_stale()
+        return version, True
+    raise IntegrityError(f'Could not allocate a resume version for {applicant}')
+
+
+def prune_stale(max_age=None):
+    """Delete every version of applicants whose last upload is older than ``max_age`` seconds; returns how many"""
+    max_age = settings.RESUME_STORE['VERSIONS_MAX_AGE'] if max_age is None else max_age
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    stale = (ParsedResume.objects.values('applicant').annotate(last_upload=Max('created_at'))
+             .filter(last_upload__lt=cutoff).values('applicant'))
+    deleted, _ = ParsedResume.objects.filter(applicant__in=stale).delete()
+    if deleted:
+        print(f"Pruned {deleted} resume version(s) older than {max_age} s")
+    return deleted
+
+
+def _known_results(version):
+    """{(section, digest, target role): result} from this version and the applicant's earlier ones"""
+    known = {}
+    analyses = ParsedResume.objects.filter(
+        applicant=version.applicant, version__lte=version.version,
+    ).order_by('-version').values_list('analysis', flat=True)
+    for analysis in analyses:
+        for section, entry in analysis.items():
+            known.setdefault((section, entry['hash'], entry['target_role']), entry['result'])
+    return known
+
+
+def _section_result(reply):
+    """The JSON object in a section assessment reply, or its text as the summary"""
+    match = re.search(r'\{.*\}', reply, re.DOTALL)
+    if match:
+        try:
+            result = json.loads(match.group())
+            if isinstance(result, dict):
+                return result
+        except ValueError:
+            pass
+    return {'summary': reply.strip()}
+
+
+def _requests(parsed, target_role):
+    """{section: (digest, target role key, prompt)} for everything reanalyze may ask about"""
+    requests = {}
+    for section in ASSESSED_SECTIONS:
+        content = parsed.get(section)
+        if not content or (section == 'skills' and not content.get('items')):
+            continue
+        requests[section] = (digest(content), target_role, section_assessment_prompt(section, content, target_role))
+    background = {'experience': parsed.get('experience', []), 'education': parsed.get('education', [])}
+    requests[EXPERIENCE_LEVEL] = (digest(background), '', experience_level_prompt(json.dumps(background)))
+    return requests
+
+
+def reanalyze(version, target_role='', generate=gemini_generate):
+    """Analyse ``version``, calling ``generate`` only for sections without a reusable result.
+
+    Provider calls for the changed sections run concurrently. A failed call
+    is reported under ``failed`` and not stored, so the next reprocess
+    retries it. Returns the per-section ``analysis`` and which sections were
+    ``reprocessed``, ``reused`` and ``failed``.
+    """
+    target_role = str(target_role or '').strip()
+    known = _known_results(version)
+    analysis, reused, pending = {}, [], {}
+    for section, (section_digest, role, prompt) in _requests(version.sections, target_role).items():
+        result = known.get((section, section_digest, role))
+        if result is not None:
+            analysis[section] = {'hash': section_digest, 'target_role': role, 'result': result}
+            reused.append(section)
+        else:
+            pending[section] = (section_digest, role, prompt)
+
+    failed = {}
+    if pending:
+        parallelism = min(len(pending), settings.RESUME_STORE['ANALYSIS_PARALLELISM'])
+        with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix='resume-reanalyze') as executor:
+            # Each call runs in a copy of this context, so its spans join the request's trace
+            futures = {section: executor.submit(copy_context().run, generate, prompt)
+                       for section, (_, _, prompt) in pending.items()}
+        for section, future in futures.items():
+            section_digest, role, _ = pending[section]
+            try:
+                reply = future.result()
+            except ProviderError as e:
+                failed[section] = str(e)
+                print(f"Re-analysis of {section} failed for {version}: {e}")
+                continue
+            result = reply.strip() if section == EXPERIENCE_LEVEL else _section_result(reply)
+            analysis[section] = {'hash': section_digest, 'target_role': role, 'result': result}
+
+    if analysis != version.analysis:
+        version.analysis = analysis
+        version.save(update_fields=['analysis'])
+    return {
+        'analysis': {section: entry['result'] for section, entry in analysis.items()},
+        'reprocessed': [section for section in pending if section not in failed],
+        'reused': reused,
+        'failed': failed,
+    }
@@ -0,0 +1,229 @@
+"""Salary normalisation and a sorted numeric index over job salaries.
+
+Providers hand us salaries as "3-8 LPA", "₹4,00,000 - ₹6,00,000",
+"$100k-$150k", "£45/hr" or bare numbers. ``parse_salary`` turns each of those
+into a currency-tagged annual range; ``SalaryIndex`` keeps the ranges of every
+catalogue job in column arrays with sorted views for range, sort and
+percentile queries.
+"""
+import re
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from .catalogue import catalogue
+
+SalaryRange = namedtuple('SalaryRange', ['currency', 'min', 'max'])
+
+# Symbols may touch the figure ("$120k", "₹4,00,000"); codes and words must
+# stand alone, so "years " is not rupees and "lacrosse" is not a lakh
+CURRENCY_PATTERN = re.compile(
+    r'(?<![a-z])(?:us\$|c\$|a\$)|[₹$£€]'
+    r'|(?<![a-z])(?:rs\.?|inr|lpa|lakhs?|lacs?|crores?|usd|cad|aud|gbp|eur)(?![a-z])'
+)
+CURRENCY_CODES = {
+    '₹': 'INR', 'rs': 'INR', 'rs.': 'INR', 'inr': 'INR', 'lpa': 'INR',
+    'lakh': 'INR', 'lakhs': 'INR', 'lac': 'INR', 'lacs': 'INR', 'crore': 'INR', 'crores': 'INR',
+    'us$': 'USD', 'usd': 'USD', '$': 'USD', 'c$': 'CAD', 'cad': 'CAD', 'a$': 'AUD', 'aud': 'AUD',
+    '£': 'GBP', 'gbp': 'GBP', '€': 'EUR', 'eur': 'EUR',
+}
+
+# Approximate conversion to USD, only used to compare salaries across currencies
+USD_RATES = {'USD': 1.0, 'INR': 0.012, 'EUR': 1.08, 'GBP': 1.27, 'CAD': 0.73, 'AUD': 0.66}
+
+UNIT_MULTIPLIERS = {
+    'k': 1e3, 'm': 1e6, 'mn': 1e6,
+    'l': 1e5, 'lpa': 1e5, 'lakh': 1e5, 'lakhs': 1e5, 'lac': 1e5, 'lacs': 1e5,
+    'cr': 1e7, 'crore': 1e7, 'crores': 1e7,
+}
+
+PERIOD_PATTERNS = [
+    (re.compile(r'(/|per\s*)\s*(hr|hour)|hourly|an hour'), 2080),
+    (re.compile(r'(/|per\s*)\s*day|daily'), 260),
+    (re.compile(r'(/|per\s*)\s*(wk|week)|weekly'), 52),
+    (re.compile(r'(/|per\s*)\s*(mo|month)|monthly|\bpm\b|p\.m\.'), 12),
+]
+
+_AMOUNT = r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(k|mn|m|lpa|lakhs?|lacs?|l|crores?|cr)?(?![a-z])'
+AMOUNT_PATTERN = re.compile(_AMOUNT)
+# "3-8 LPA", "$100k - $150k", "4 to 6 lakhs": two figures joined by a dash or "to"
+RANGE_PATTERN = re.compile(_AMOUNT + r'\s*(?:-|–|—|to)\s*(?:us\$|c\$|a\$|[₹$£€]|rs\.?)?\s*' + _AMOUNT)
+
+INDIAN_LOCATIONS = ('india', 'bangalore', 'bengaluru', 'hyderabad', 'pune', 'mumbai', 'chennai',
+                    'delhi', 'noida', 'gurgaon', 'gurugram', 'kolkata', 'ahmedabad')
+
+
+def default_currency(location):
+    """Currency to assume for bare numbers, from the job location"""
+    location = str(location or '').lower()
+    return 'INR' if any(place in location for place in INDIAN_LOCATIONS) else 'USD'
+
+
+def parse_salary(value, currency='USD'):
+    """Normalise a salary value into an annual ``SalaryRange``, or None.
+
+    ``currency`` is used when the value itself does not name one.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return SalaryRange(currency, float(value), float(value)) if value > 0 else None
+
+    text = str(value).lower()
+    symbol = CURRENCY_PATTERN.search(text)
+    if symbol:
+        currency = CURRENCY_CODES[symbol.group()]
+
+    # The salary is the range (else the figure) nearest the currency, so other
+    # numbers in the text ("2 years", "3+ years") never become bounds
+    def nearest(matches):
+        if not symbol or len(matches) < 2:
+            return matches[0] if matches else None
+        return min(matches, key=lambda m: max(m.start() - symbol.end(), symbol.start() - m.end(), 0))
+
+    match = nearest(list(RANGE_PATTERN.finditer(text)))
+    if match:
+        low, low_unit, high, high_unit = match.groups()
+        # "3-8 LPA" / "$100-150k": a unit on either figure applies to both
+        amounts = [(low, low_unit or high_unit), (high, high_unit or low_unit)]
+    else:
+        match = nearest(list(AMOUNT_PATTERN.finditer(text)))
+        if not match:
+            return None
+        amounts = [match.groups()]
+    if not symbol and any(UNIT_MULTIPLIERS.get(unit) in (1e5, 1e7) for _, unit in amounts):
+        currency = 'INR'  # Lakh / crore figures are always rupees
+    values = [float(number.replace(',', '')) * UNIT_MULTIPLIERS.get(unit, 1.0) for number, unit in amounts]
+
+    period = 1
+    for pattern, per_year in PERIOD_PATTERNS:
+        if pattern.search(text):
+            period = per_year
+            break
+    values = [v * period for v in values if v > 0]
+    if not values:
+        return None
+    return SalaryRange(currency, min(values), max(values))
+
+
+def normalize_job_salary(job, raw_min=None, raw_max=None, raw_text=None):
+    """Set salary_min/salary_max/salary_currency on a job dict from raw provider fields"""
+    currency = job.get('salary_currency') or default_currency(job.get('location'))
+    low = parse_salary(raw_min, currency)
+    high = parse_salary(raw_max, currency)
+    if low or high:
+        currency = (low or high).currency
+        job['salary_min'] = low.min if low else high.min
+        job['salary_max'] = high.max if high else low.max
+    else:
+        parsed = parse_salary(raw_text, currency)
+        job['salary_min'] = parsed.min if parsed else None
+        job['salary_max'] = parsed.max if parsed else None
+        currency = parsed.currency if parsed else currency
+    for key in ('salary_min', 'salary_max'):
+        if job[key] is not None:
+            job[key] = int(round(job[key]))
+    job['salary_currency'] = currency
+    return job
+
+
+def to_usd(amount, currency):
+    return amount * USD_RATES.get(currency, 1.0)
+
+
+class SalaryIndex:
+    """Column-oriented salary ranges (in USD) with lazily rebuilt sorted views.
+
+    Jobs occupy fixed slots in the ``mins``/``maxs`` columns; removed slots are
+    set to NaN and recycled. Queries use binary search over the sorted views,
+    which are rebuilt only after the catalogue has changed.
+    """
+
+    def __init__(self, capacity=1024):
+        self.mins = np.full(capacity, np.nan)
+        self.maxs = np.full(capacity, np.nan)
+        self.ids = [None] * capacity
+        self._slots = {}
+        self._free = []
+        self._sorted = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def jobs_added(self, jobs):
+        with self._lock:
+            for job in jobs:
+                self._set(job)
+            self._sorted = None
+
+    def jobs_removed(self, jobs):
+        with self._lock:
+            for job in jobs:
+                slot = self._slots.pop(job['id'], None)
+                if slot is not None:
+                    self.mins[slot] = self.maxs[slot] = np.nan
+                    self.ids[slot] = None
+                    self._free.append(slot)
+            self._sorted = None
+
+    def _set(self, job):
+        currency = job.get('salary_currency') or 'USD'
+        low, high = job.get('salary_min'), job.get('salary_max')
+        if low is None and high is None:
+            return
+        slot = self._slots.get(job['id'])
+        if slot is None:
+            slot = self._free.pop() if self._free else len(self._slots)
+            if slot >= len(self.ids):
+                self._grow()
+            self._slots[job['id']] = slot
+        self.ids[slot] = job['id']
+        self.mins[slot] = to_usd(float(low if low is not None else high), currency)
+        self.maxs[slot] = to_usd(float(high if high is not None else low), currency)
+
+    def _grow(self):
+        size = len(self.ids)
+        self.mins = np.concatenate([self.mins, np.full(size, np.nan)])
+        self.maxs = np.concatenate([self.maxs, np.full(size, np.nan)])
+        self.ids.extend([None] * size)
+
+    def _views(self):
+        """(slot order by min, sorted mins, slot order by max, sorted maxs)"""
+        with self._lock:
+            if self._sorted is None:
+                valid = np.flatnonzero(~np.isnan(self.mins))
+                by_min = valid[np.argsort(self.mins[valid], kind='stable')]
+                by_max = valid[np.argsort(self.maxs[valid], kind='stable')]
+                self._sorted = (by_min, self.mins[by_min], by_max, self.maxs[by_max])
+            return self._sorted
+
+    def annual_usd(self, job_id):
+        """(min, max) in USD for one job, or None if it has no salary"""
+        slot = self._slots.get(job_id)
+        return None if slot is None else (self.mins[slot], self.maxs[slot])
+
+    def ids_with_min_at_least(self, amount):
+        """Job IDs whose salary_min >= ``amount`` USD, lowest first"""
+        by_min, mins, _, _ = self._views()
+        start = int(np.searchsorted(mins, amount, side='left'))
+        return [self.ids[slot] for slot in by_min[start:]]
+
+    def sorted_ids(self, descending=True):
+        """Job IDs ordered by salary_max"""
+        _, _, by_max, _ = self._views()
+        order = by_max[::-1] if descending else by_max
+        return [self.ids[slot] for slot in order]
+
+    def percentile(self, q, field='max'):
+        """Salary at percentile ``q`` (0-100) of salary_min or salary_max, in USD"""
+        _, mins, _, maxs = self._views()
+        values = mins if field == 'min' else maxs
+        if not len(values):
+            return None
+        return float(values[min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))])
+
+
+salary_index = SalaryIndex()
+catalogue.subscribe(salary_index)
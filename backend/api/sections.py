@@ -0,0 +1,358 @@
+"""Local resume segmentation into sections and entries, without an LLM call.
+
+``segment(text)`` walks the lines once. A line opens a section when it is a
+known heading ("Work Experience", "TECHNICAL SKILLS:", "Projects" over a
+rule line), possibly with content after a colon ("Skills: Python, SQL").
+Inside experience, education and projects, an entry starts at a line that
+carries a date range or follows a blank line or a run of bullets; bullets
+become the entry's details. Each line is handled in constant passes of
+simple regexes, so the whole parse is linear in the length of the text.
+"""
+import re
+from datetime import date
+
+from .matching import SKILLS, extract_skill_ids, normalize_skill, tokenize
+
+PARSER_VERSION = 1
+
+SECTION_HEADINGS = {
+    'summary': ['summary', 'professional summary', 'profile', 'profile summary', 'career summary', 'objective',
+                'career objective', 'about me', 'about'],
+    'experience': ['experience', 'work experience', 'professional experience', 'relevant experience', 'employment',
+                   'employment history', 'work history', 'internship', 'internships', 'internship experience',
+                   'experience and internships'],
+    'education': ['education', 'academic background', 'academics', 'academic details', 'educational qualifications',
+                  'educational qualification', 'academic qualifications', 'qualifications', 'education and training'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core skills', 'skill set', 'skillset', 'core competencies',
+               'competencies', 'technologies', 'tech stack', 'tools', 'tools and technologies', 'skills and tools',
+               'programming languages', 'languages and tools'],
+    'projects': ['projects', 'project', 'academic projects', 'personal projects', 'key projects', 'selected projects',
+                 'project experience', 'major projects'],
+    'certifications': ['certifications', 'certification', 'certificates', 'licenses and certifications',
+                       'certifications and courses', 'courses', 'online courses', 'training', 'trainings'],
+    'other': ['achievements', 'awards', 'honors', 'honors and awards', 'awards and achievements', 'publications',
+              'languages', 'interests', 'hobbies', 'volunteering', 'volunteer experience', 'activities',
+              'extracurricular activities', 'extra curricular activities', 'positions of responsibility',
+              'leadership', 'references', 'declaration'],
+}
+HEADINGS = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+# Words that mark an unlisted heading ("TECHNICAL SKILLS & TOOLS") as a known section
+HEADING_KEYWORDS = {
+    'experience': 'experience', 'employment': 'experience', 'internship': 'experience', 'internships': 'experience',
+    'education': 'education', 'academic': 'education', 'skills': 'skills', 'technologies': 'skills',
+    'projects': 'projects', 'certifications': 'certifications', 'certificates': 'certifications',
+    'summary': 'summary', 'objective': 'summary',
+}
+MAX_HEADING_LENGTH = 60
+MAX_ORGANIZATION_WORDS = 6
+
+BULLET = re.compile(r'^\s*(?:[•▪●◦‣⁃∙·*–—-]|\d{1,2}[.)])\s+')
+RULE = re.compile(r'^\s*[-=_─—~*]{3,}\s*$')
+INLINE_HEADING = re.compile(r'^\s*([A-Za-z][A-Za-z &/]{1,40}?)\s*[:–—|]\s*(.*)$')
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+MONTH = r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?'
+SEASON = r'(?:summer|winter|spring|fall|autumn)'
+DATE = rf"(?:{MONTH}\s*'?\d{{4}}|{SEASON}\s+\d{{4}}|\d{{1,2}}[/.]\d{{4}}|\d{{4}}[/.-]\d{{1,2}}(?!\d)|(?:19|20)\d{{2}})"
+CURRENT = r'(?:present|current|now|ongoing|till\s+date|to\s+date|date)'
+DATE_RANGE = re.compile(
+    rf'(?<![\w/])(?P<start>{DATE})\s*(?:-|–|—|to|till|until)\s*(?P<end>{DATE}|{CURRENT})(?![\w/])', re.I,
+)
+SINGLE_DATE = re.compile(rf'(?<![\w/])(?P<date>{MONTH}\s*\d{{4}}|{SEASON}\s+\d{{4}}|(?:19|20)\d{{2}})(?!\w)', re.I)
+YEAR = re.compile(r'(?:19|20)\d{2}')
+
+# Anchored so a long run of address characters is tried once, not from every position
+EMAIL = re.compile(r'(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+PHONE = re.compile(r'(?<!\w)(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,5}\)[\s.-]?)?\d{3,5}[\s.-]?\d{3,5}(?:[\s.-]?\d{2,4})?(?!\w)')
+URL = re.compile(r'(?:https?://|www\.)\S+|(?:linkedin\.com|github\.com|gitlab\.com)/\S+', re.I)
+HEADER_SEPARATORS = re.compile(r'\s*(?:\||•|·|●|\t|\s{3,})\s*')
+
+ROLE_WORDS = re.compile(
+    r'\b(?:engineer|developer|intern|analyst|manager|lead|designer|consultant|scientist|trainee|associate|'
+    r'architect|specialist|administrator|officer|head|director|programmer|tester|researcher|assistant|fellow)\b', re.I,
+)
+ORGANIZATION_SEPARATORS = re.compile(r'\s+(?:at|@)\s+|\s*[|–—]\s*|\s+-\s+|,\s+')
+DEGREE = re.compile(
+    r'\b(?:b\.?\s?tech|m\.?\s?tech|b\.?\s?e\b|m\.?\s?e\b|b\.?\s?sc|m\.?\s?sc|b\.?\s?s\b|m\.?\s?s\b|b\.?\s?a\b|m\.?\s?a\b|'
+    r'bca|mca|bba|mba|ph\.?\s?d|bachelor(?:\'s)?(?: of [a-z ]+)?|master(?:\'s)?(?: of [a-z ]+)?|diploma|'
+    r'associate degree|high school|higher secondary|senior secondary|secondary school|hsc|ssc|class (?:x|xii|10|12))'
+    r'(?:\.|\b)(?:\s*(?:in|of)?\s*[A-Za-z&() ]{0,60})?', re.I,
+)
+INSTITUTION = re.compile(r'\b(?:university|institute|college|school|academy|iit|nit|iiit|bits|polytechnic)\b', re.I)
+GRADE = re.compile(r'\b(?:c?gpa|percentage|score|grade)\s*[:\-]?\s*(\d{1,3}(?:\.\d{1,2})?\s*(?:/\s*\d{1,3}(?:\.\d)?|%)?)'
+                   r'|\b(\d{1,2}(?:\.\d{1,2})?\s*%)', re.I)
+SKILL_SPLIT = re.compile(r'\s*(?:[,;|•·●]|\s-\s)\s*')
+TECH_LABEL = re.compile(r'\b(?:tech(?:nologies)?|tech stack|stack|tools|built with)\s*[:\-]\s*([^)\n]+)', re.I)
+
+
+def _heading_key(text):
+    text = text.lower().replace('&', ' and ')
+    return ' '.join(re.sub(r'[^a-z ]+', ' ', text).split())
+
+
+def _classify_heading(line, next_line, current):
+    """(section, heading text, inline content) if ``line`` opens a section, else None"""
+    stripped = line.strip().strip('#*_ ').strip()
+    if not stripped or len(stripped) > MAX_HEADING_LENGTH and ':' not in stripped:
+        return None
+    key = _heading_key(stripped)
+    if key in HEADINGS:
+        return HEADINGS[key], stripped.rstrip(':').strip(), ''
+
+    match = INLINE_HEADING.match(stripped if len(stripped) <= MAX_HEADING_LENGTH else line)
+    if match:
+        inline_key = _heading_key(match.group(1))
+        # 'Languages: Python, SQL' inside Skills is a category, not a new section
+        if inline_key in HEADINGS and HEADINGS[inline_key] not in ('other', current):
+            return HEADINGS[inline_key], match.group(1).strip(), match.group(2).strip()
+
+    words = key.split()
+    if not words or len(words) > 5 or BULLET.match(line) or any(ch.isdigit() for ch in stripped):
+        return None
+    letters = [ch for ch in stripped if ch.isalpha()]
+    shaped = stripped.endswith(':') or (letters and all(ch.isupper() for ch in letters)) or bool(RULE.match(next_line))
+    if not shaped:
+        return None
+    for word in words:
+        if word in HEADING_KEYWORDS:
+            return HEADING_KEYWORDS[word], stripped.rstrip(':').strip(), ''
+    # Unknown headings only count once the body has started, so a capitalised name is not one
+    return ('other', stripped.rstrip(':').strip(), '') if current is not None else None
+
+
+def _month_index(value, end=False):
+    """(year, month) for a date string, or None for 'present' and unparseable values"""
+    value = value.lower()
+    year = YEAR.search(value)
+    if not year:
+        return None
+    month = next((number for name, number in MONTHS.items() if name in value), None)
+    if month is None:
+        numeric = re.match(r'(\d{1,2})[/.]\d{4}|\d{4}[/.-](\d{1,2})', value)
+        if numeric:
+            month = int(numeric.group(1) or numeric.group(2))
+    if month is None or not 1 <= month <= 12:
+        month = 12 if end else 1
+    return int(year.group()), month
+
+
+def parse_dates(line):
+    """Date range or single date on a line as a dict, plus the line with it removed"""
+    match = DATE_RANGE.search(line)
+    if match:
+        start, end = match.group('start'), match.group('end')
+        current = re.fullmatch(CURRENT, end.strip(), re.I) is not None
+        dates = {'start': start, 'end': 'Present' if current else end, 'current': current}
+        begin = _month_index(start)
+        finish = (date.today().year, date.today().month) if current else _month_index(end, end=True)
+        if begin and finish and finish >= begin:
+            dates['months'] = (finish[0] - begin[0]) * 12 + finish[1] - begin[1] + 1
+    else:
+        match = SINGLE_DATE.search(line)
+        if not match:
+            return None, line
+        dates = {'start': None, 'end': match.group('date'), 'current': False}
+    rest = (line[:match.start()] + line[match.end():]).strip()
+    return dates, re.sub(r'[\s,|()–—-]+$', '', re.sub(r'^[\s,|()–—-]+', '', rest))
+
+
+def _strip_bullet(line):
+    return BULLET.sub('', line, count=1).strip()
+
+
+def _entries(lines):
+    """Group a section's lines into entries of a header, optional subtitle, dates and bullet details"""
+    entries = []
+    entry = None
+    boundary = True  # A blank line or a bullet run ends the current entry's header
+    for line in lines:
+        if not line.strip():
+            boundary = True
+            continue
+        if BULLET.match(line):
+            if entry is None:
+                entry = {'header': [], 'dates': None, 'details': []}
+                entries.append(entry)
+            entry['details'].append(_strip_bullet(line))
+            boundary = True
+            continue
+
+        dates, rest = parse_dates(line)
+        has_range = dates is not None and dates['start'] is not None
+        starts_entry = (
+            entry is None
+            or (boundary and (entry['details'] or entry['header']))
+            or (has_range and entry['dates'] is not None)
+        )
+        if starts_entry:
+            entry = {'header': [], 'dates': None, 'details': []}
+            entries.append(entry)
+        if dates is not None and entry['dates'] is None:
+            entry['dates'] = dates
+            line = rest
+        if line.strip():
+            if len(entry['header']) < 2 and not entry['details']:
+                entry['header'].append(line.strip())
+            else:
+                entry['details'].append(line.strip())
+        boundary = False
+    return entries
+
+
+def _split_role(text):
+    """(role, organization, remainder) from 'Role at Company', 'Company | Role', 'Role, Company' and similar"""
+    parts = [part.strip() for part in ORGANIZATION_SEPARATORS.split(text, maxsplit=1) if part and part.strip()]
+    if len(parts) < 2:
+        return text, '', ''
+    first, second = parts
+    if ROLE_WORDS.search(second) and not ROLE_WORDS.search(first):
+        return second, first, ''
+    if len(second.split()) > MAX_ORGANIZATION_WORDS:  # 'Backend intern, built Django services for ...'
+        return first, '', second
+    return first, second, ''
+
+
+def _experience(entry):
+    header = entry['header']
+    role, organization, remainder = _split_role(header[0]) if header else ('', '', '')
+    if not organization and len(header) > 1:
+        organization = header[1]
+    return {
+        'title': role,
+        'organization': organization,
+        'dates': entry['dates'],
+        'details': ([remainder] if remainder else []) + entry['details'],
+    }
+
+
+def _education(entry):
+    text = ' '.join(entry['header'] + entry['details'])
+    degree = DEGREE.search(text)
+    institution = next((part for part in re.split(r'\s*[,|–—]\s*|\s+-\s+', text) if INSTITUTION.search(part)), '')
+    grade = GRADE.search(text)
+    return {
+        'degree': degree.group().strip(' ,.-') if degree else (entry['header'][0] if entry['header'] else ''),
+        'institution': institution.strip(),
+        'grade': (grade.group(1) or grade.group(2)).strip() if grade else None,
+        'dates': entry['dates'],
+        'details': entry['details'],
+    }
+
+
+def _project(entry):
+    header = entry['header'][0] if entry['header'] else (entry['details'][0] if entry['details'] else '')
+    name, description = (re.split(r'\s*[:|–—]\s*|\s+-\s+', header, maxsplit=1) + [''])[:2]
+    text = '\n'.join(entry['header'] + entry['details'])
+    labelled = TECH_LABEL.search(text)
+    technologies = [part for part in SKILL_SPLIT.split(labelled.group(1)) if part] if labelled else []
+    found = {SKILLS.terms[skill_id] for skill_id in extract_skill_ids(None, tokenize(text))}
+    return {
+        'name': name.strip(),
+        'description': ' '.join(part for part in [description.strip(), *entry['header'][1:]] if part),
+        'technologies': technologies or sorted(found),
+        'dates': entry['dates'],
+        'details': entry['details'],
+    }
+
+
+def _certifications(lines):
+    certifications = []
+    for line in lines:
+        text = _strip_bullet(line)
+        if not text:
+            continue
+        dates, text = parse_dates(text)
+        name, issuer = text, ''
+        parts = re.split(r'\s+(?:by|from|-|–|—)\s+|\s*[|,]\s*', text, maxsplit=1)
+        if len(parts) == 2 and parts[1]:
+            name, issuer = parts
+        certifications.append({'name': name.strip(), 'issuer': issuer.strip(), 'date': dates['end'] if dates else None})
+    return certifications
+
+
+def _skills(lines):
+    items, categories = [], {}
+    for line in lines:
+        text = _strip_bullet(line)
+        if not text:
+            continue
+        category = None
+        label, colon, rest = text.partition(':')
+        if colon and 0 < len(label.split()) <= 4:
+            category, text = label.strip(), rest
+        values = [value.strip(' .') for value in SKILL_SPLIT.split(text) if value.strip(' .')]
+        if category:
+            categories.setdefault(category, []).extend(values)
+        items.extend(values)
+    normalized = []
+    for item in items:
+        skill = normalize_skill(item)
+        if skill not in normalized:
+            normalized.append(skill)
+    return {'items': items, 'normalized': normalized, 'categories': categories}
+
+
+def _personal_info(header_lines, text):
+    segments = [segment for line in header_lines for segment in HEADER_SEPARATORS.split(line.strip()) if segment]
+    email = EMAIL.search(text)
+    phone = next((match.group().strip() for match in PHONE.finditer(' | '.join(header_lines) or text)
+                  if len(re.sub(r'\D', '', match.group())) >= 10), None)
+    links = [match.group().rstrip('.,;)') for match in URL.finditer(' '.join(header_lines) or text)]
+    contact = lambda segment: EMAIL.search(segment) or URL.search(segment) or sum(ch.isdigit() for ch in segment) >= 6
+
+    name = next((segment for segment in segments
+                 if not contact(segment) and 1 <= len(segment.split()) <= 5 and not any(ch.isdigit() for ch in segment)
+                 and not DATE_RANGE.search(segment)), None)
+    location = next((segment for segment in segments
+                     if segment != name and not contact(segment) and len(segment.split()) <= 5
+                     and not DEGREE.search(segment) and not ROLE_WORDS.search(segment)), None)
+    return {
+        'name': name,
+        'email': email.group() if email else None,
+        'phone': phone,
+        'location': location,
+        'links': links,
+    }
+
+
+def segment(text):
+    """Split resume ``text`` into sections and parse the entries in each"""
+    lines = str(text or '').replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    header, sections, other = [], {}, {}
+    current, current_other = None, None
+    for index, line in enumerate(lines):
+        if RULE.match(line):
+            continue
+        next_line = lines[index + 1] if index + 1 < len(lines) else ''
+        heading = _classify_heading(line, next_line, current)
+        if heading:
+            current, title, inline = heading
+            current_other = other.setdefault(title, []) if current == 'other' else None
+            if inline:
+                (current_other if current == 'other' else sections.setdefault(current, [])).append(inline)
+            else:
+                sections.setdefault(current, [])
+            continue
+        if current is None:
+            if line.strip():
+                header.append(line.strip())
+        elif current == 'other':
+            if line.strip():
+                current_other.append(_strip_bullet(line))
+        else:
+            sections[current].append(line)
+
+    return {
+        'parser_version': PARSER_VERSION,
+        'personal_info': _personal_info(header, text or ''),
+        'summary': ' '.join(line.strip() for line in sections.get('summary', []) if line.strip()),
+        'experience': [_experience(entry) for entry in _entries(sections.get('experience', []))],
+        'education': [_education(entry) for entry in _entries(sections.get('education', []))],
+        'skills': _skills(sections.get('skills', [])),
+        'projects': [_project(entry) for entry in _entries(sections.get('projects', []))],
+        'certifications': _certifications(sections.get('certifications', [])),
+        'other': other,
+    }
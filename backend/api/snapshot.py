@@ -0,0 +1,279 @@
+"""Memory-mapped snapshot of the ingested job catalogue and its match vectors.
+
+The ingestion sweep (or ``manage.py build_snapshot``) writes the published
+catalogue to a single file:
+
+* a string table (one UTF-8 blob plus offsets) holding every distinct string,
+* fixed-width columns per job field (string-table references, int64
+  salaries, an int8 remote flag, CSR skill lists),
+* the float32 job embedding matrix, ordered by IVF list, plus the centroids.
+
+Workers ``mmap`` the file read-only, so the vector pages are shared through
+the OS page cache instead of being rebuilt and held privately by each
+process; IVF lists are views into the mapping until a list is modified. A new
+snapshot is written next to the old one and moved into place with
+``os.replace``, so readers see either the old file or the new one, never a
+partial write, and mappings of the old file stay valid until dropped.
+"""
+import json
+import mmap
+import os
+import tempfile
+
+import numpy as np
+from django.conf import settings
+
+from .ann import IVFIndex, job_index
+from .catalogue import catalogue
+from .records import FIELDS
+
+MAGIC = b'JOBSNAP1'
+ALIGN = 64
+
+NONE, MISSING = -1, -2  # String references / flags for None and absent fields
+INT_NONE = np.iinfo(np.int64).min
+INT_MISSING = INT_NONE + 1
+INT_MAX = np.iinfo(np.int64).max
+
+INT_FIELDS = ('salary_min', 'salary_max')
+STRING_FIELDS = tuple(f for f in FIELDS if f not in INT_FIELDS + ('is_remote', 'skills_required'))
+
+_ABSENT = object()
+
+
+def _aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+class _StringTable:
+    def __init__(self):
+        self._refs = {}
+        self._chunks = []
+        self.offsets = [0]
+
+    def ref(self, value):
+        ref = self._refs.get(value)
+        if ref is None:
+            encoded = value.encode('utf-8')
+            ref = self._refs[value] = len(self._chunks)
+            self._chunks.append(encoded)
+            self.offsets.append(self.offsets[-1] + len(encoded))
+        return ref
+
+    def blob(self):
+        return np.frombuffer(b''.join(self._chunks), dtype=np.uint8)
+
+
+def _columns(jobs):
+    """Encode jobs into fixed-width columns; values that do not fit a column go to ``extra``"""
+    count = len(jobs)
+    strings = _StringTable()
+    columns = {field: np.full(count, MISSING, dtype=np.int32) for field in STRING_FIELDS}
+    columns.update({field: np.full(count, INT_MISSING, dtype=np.int64) for field in INT_FIELDS})
+    columns['is_remote'] = np.full(count, MISSING, dtype=np.int8)
+    columns['has_skills'] = np.zeros(count, dtype=np.int8)
+    columns['extra'] = np.full(count, NONE, dtype=np.int32)
+    skill_offsets = [0]
+    skill_refs = []
+
+    for row, job in enumerate(jobs):
+        extra = {key: value for key, value in job.items() if key not in FIELDS}
+        for field in STRING_FIELDS:
+            value = job.get(field, _ABSENT)
+            if value is None:
+                columns[field][row] = NONE
+            elif type(value) is str:
+                columns[field][row] = strings.ref(value)
+            elif value is not _ABSENT:
+                extra[field] = value
+        for field in INT_FIELDS:
+            value = job.get(field, _ABSENT)
+            if value is None:
+                columns[field][row] = INT_NONE
+            elif type(value) is int and INT_MISSING < value <= INT_MAX:
+                columns[field][row] = value
+            elif value is not _ABSENT:
+                extra[field] = value
+        remote = job.get('is_remote', _ABSENT)
+        if remote is None:
+            columns['is_remote'][row] = NONE
+        elif type(remote) is bool:
+            columns['is_remote'][row] = remote
+        elif remote is not _ABSENT:
+            extra['is_remote'] = remote
+        skills = job.get('skills_required', _ABSENT)
+        if isinstance(skills, list) and all(type(skill) is str for skill in skills):
+            columns['has_skills'][row] = 1
+            skill_refs.extend(strings.ref(skill) for skill in skills)
+        elif skills is not _ABSENT:
+            extra['skills_required'] = skills
+        skill_offsets.append(len(skill_refs))
+        if extra:
+            columns['extra'][row] = strings.ref(json.dumps(extra))
+
+    columns['skill_offsets'] = np.array(skill_offsets, dtype=np.int64)
+    columns['skill_refs'] = np.array(skill_refs, dtype=np.int32)
+    columns['strings'] = strings.blob()
+    columns['string_offsets'] = np.array(strings.offsets, dtype=np.int64)
+    return columns
+
+
+def write_snapshot(jobs, path, vector_index=None):
+    """Write ``jobs`` and their IVF-ordered vectors to ``path`` atomically"""
+    vector_index = vector_index or job_index
+    vectorizer = vector_index.vectorizer
+    jobs = {job['id']: job for job in jobs}
+
+    # Cluster the snapshot's vectors so each inverted list is one contiguous block
+    ivf = IVFIndex(vectorizer.dim, nlist=vector_index.index.nlist)
+    ivf.add(list(jobs), [vectorizer.vector(vectorizer.job_features(job)) for job in jobs.values()])
+    centroids, lists = ivf.export()
+    ordered = [jobs[key] for keys, _ in lists for key in keys]
+
+    arrays = _columns(ordered)
+    arrays['vectors'] = (np.concatenate([rows for _, rows in lists]) if ordered
+                         else np.empty((0, vectorizer.dim), dtype=np.float32))
+    arrays['list_offsets'] = np.cumsum([0] + [len(keys) for keys, _ in lists]).astype(np.int64)
+    if centroids is not None:
+        arrays['centroids'] = centroids.astype(np.float32)
+
+    specs, offset = {}, 0
+    for name, array in arrays.items():
+        array = arrays[name] = np.ascontiguousarray(array)
+        offset = _aligned(offset)
+        specs[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+    header = json.dumps({'count': len(ordered), 'dim': vectorizer.dim, 'arrays': specs}).encode('utf-8')
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(MAGIC + len(header).to_bytes(8, 'little') + header)
+            for name, array in arrays.items():
+                out.seek(data_start + specs[name]['offset'])
+                out.write(array.tobytes())
+            out.truncate(data_start + offset)  # Trailing empty arrays still lie inside the file
+            out.flush()
+            os.fsync(out.fileno())
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return len(ordered)
+
+
+class CatalogueSnapshot:
+    """Read-only view of a snapshot file; arrays are views into one shared mapping"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as source:
+            stat = os.fstat(source.fileno())
+            self._map = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a job catalogue snapshot')
+        length = int.from_bytes(self._map[len(MAGIC):len(MAGIC) + 8], 'little')
+        header = json.loads(self._map[len(MAGIC) + 8:len(MAGIC) + 8 + length])
+        data_start = _aligned(len(MAGIC) + 8 + length)
+        self.count = header['count']
+        self.dim = header['dim']
+        self.arrays = {
+            name: np.frombuffer(self._map, dtype=spec['dtype'], count=int(np.prod(spec['shape'])),
+                                offset=data_start + spec['offset']).reshape(spec['shape'])
+            for name, spec in header['arrays'].items()
+        }
+        self._strings_at = data_start + header['arrays']['strings']['offset']
+        self._string_offsets = self.arrays['string_offsets'].tolist()
+        self._decoded = {}
+        self.ids = [self._string(ref) for ref in self.arrays['id'].tolist()]
+
+    def __len__(self):
+        return self.count
+
+    def _string(self, ref):
+        # Decoded once per snapshot, so repeated values are also one shared object
+        value = self._decoded.get(ref)
+        if value is None:
+            start, end = self._strings_at + self._string_offsets[ref], self._strings_at + self._string_offsets[ref + 1]
+            value = self._decoded[ref] = self._map[start:end].decode('utf-8')
+        return value
+
+    def job(self, row):
+        """The job in ``row`` as an API dict"""
+        return self._decode(row, self.arrays)
+
+    def jobs(self):
+        """Every job as an API dict, in snapshot order"""
+        columns = {name: array.tolist() for name, array in self.arrays.items() if array.ndim == 1}
+        try:
+            for row in range(self.count):
+                yield self._decode(row, columns)
+        finally:
+            self._decoded = {}
+
+    def _decode(self, row, columns):
+        extra = columns['extra'][row]
+        extra = json.loads(self._string(extra)) if extra != NONE else {}
+        job = {}
+        for field in FIELDS:
+            if field in extra:
+                job[field] = extra.pop(field)
+            elif field in STRING_FIELDS:
+                ref = columns[field][row]
+                if ref != MISSING:
+                    job[field] = None if ref == NONE else self._string(ref)
+            elif field in INT_FIELDS:
+                value = columns[field][row]
+                if value != INT_MISSING:
+                    job[field] = None if value == INT_NONE else int(value)
+            elif field == 'is_remote':
+                flag = columns[field][row]
+                if flag != MISSING:
+                    job[field] = None if flag == NONE else bool(flag)
+            elif columns['has_skills'][row]:
+                start, end = columns['skill_offsets'][row], columns['skill_offsets'][row + 1]
+                job[field] = [self._string(ref) for ref in columns['skill_refs'][start:end]]
+        job.update(extra)
+        return job
+
+    def inverted_lists(self):
+        """(centroids, [(keys, rows)]) with rows as read-only views into the mapping"""
+        offsets = self.arrays['list_offsets']
+        vectors = self.arrays['vectors']
+        lists = [(self.ids[start:end], vectors[start:end]) for start, end in zip(offsets[:-1], offsets[1:])]
+        return self.arrays.get('centroids'), lists
+
+
+_loaded = None
+
+
+def snapshot_path():
+    return settings.JOB_SNAPSHOT['PATH']
+
+
+def load_snapshot(path=None, restore_catalogue=True):
+    """Map the current snapshot and serve the vector index (and catalogue) from it.
+
+    Does nothing if there is no snapshot or it is the one already mapped.
+    Returns the mapped ``CatalogueSnapshot`` or None.
+    """
+    global _loaded
+    path = path or snapshot_path()
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    if _loaded is not None and _loaded.identity == (stat.st_dev, stat.st_ino, stat.st_mtime_ns):
+        return _loaded
+    snapshot = CatalogueSnapshot(path)
+    if snapshot.dim != job_index.vectorizer.dim:
+        return None
+    # Vectors first, so the catalogue's jobs_added hook finds them already indexed
+    job_index.restore(*snapshot.inverted_lists())
+    if restore_catalogue:
+        catalogue.restore(snapshot.jobs())
+    _loaded = snapshot
+    return snapshot
@@ -1,3 +1,893 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime as real_datetime, timedelta
+from decimal import Decimal
+from unittest import mock, skipIf
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.contrib.auth.models import User
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import path, reverse
+from django.utils import timezone
+from rest_framework.decorators import api_view
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from . import async_views, compression, profiling, renderers, views
+from .ann import IVFIndex
+from .loadtest import report
+from .loadtest.runner import replay
+from .loadtest.scenarios import SCENARIOS, parse_mix
+from .batch_scoring import BatchScorer, DatabaseCheckpoint
+from .management.commands.bench_imports import LAZY_MODULES, measure
+from .catalogue import JOB_CACHE_PREFIX, JobCatalogue
+from .http_cache import cached_response
+from .ingestion import collect, sweep
+from .market import MarketStats
+from .memory import MemoryBudget, MemoryBudgetExceeded
+from .middleware import CompressionMiddleware
+from .metrics import REGISTRY, Counter, Histogram, ai_tokens
+from .models import Application, BatchScore, ParsedResume
+from .matching import SKILLS, JobMatrix, ResumeProfile, Vocabulary, rank_jobs
+from .parsing import first_seen_date
+from .profiles import PROFILE_HEADER, UserProfile
+from .providers import ProviderError
+from .records import JobRecord
+from .resume_versions import PRUNE_CACHE_KEY, prune_stale, record
+from .resume_store import ParsedResumeStore
+from .salary import SalaryRange, parse_salary, salary_index
+from .sections import EMAIL, segment
+from .tracing import Trace, export, record_usage, span, start_trace
+from .views import MAX_MATCH_LIMIT, match_limit
+
+
+class TmpTraceSink:
+    """Sends sampled traces to a per-class temporary file instead of the real TRACING['PATH']"""
+
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        tracing = override_settings(TRACING={**settings.TRACING, 'PATH': os.path.join(directory.name, 'traces.jsonl')})
+        tracing.enable()
+        cls.addClassCleanup(tracing.disable)
+        super().setUpClass()
+
+
+class ApiSimpleTestCase(TmpTraceSink, SimpleTestCase):
+    pass
+
+
+class ApiTestCase(TmpTraceSink, TestCase):
+    pass
+
+
+def make_job(n, **fields):
+    return {
+        'id': f'job-{n}', 'title': f'Engineer {n}', 'company': 'Acme', 'location': 'Remote',
+        'description': 'Build things', 'skills_required': ['Python'], **fields,
+    }
+
+
+class Listener:
+    def __init__(self):
+        self.ids = set()
+
+    def jobs_added(self, jobs):
+        self.ids.update(job['id'] for job in jobs)
+
+    def jobs_removed(self, jobs):
+        self.ids.difference_update(job['id'] for job in jobs)
+
+
+@override_settings(JOB_CATALOGUE={'MAX_JOBS': 3, 'MAX_AGE_SECONDS': 3600})
+class JobCatalogueTests(ApiSimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.catalogue = JobCatalogue()
+        self.listener = Listener()
+        self.catalogue.subscribe(self.listener)
+
+    def test_evicts_least_recently_refreshed_beyond_max_jobs(self):
+        self.catalogue.add([make_job(n) for n in range(3)])
+        self.catalogue.add([make_job(0)])  # Refreshing job-0 makes job-1 the oldest
+        self.catalogue.add([make_job(3)])
+        self.assertEqual(sorted(job['id'] for job in self.catalogue.all()), ['job-0', 'job-2', 'job-3'])
+        self.assertEqual(self.listener.ids, {'job-0', 'job-2', 'job-3'})
+
+    def test_failed_listener_leaves_the_job_out_so_the_next_add_retries(self):
+        failing = mock.Mock(jobs_added=mock.Mock(side_effect=[IndexError('full'), None]))
+        self.catalogue.subscribe(failing)
+        with self.assertRaises(IndexError):
+            self.catalogue.add([make_job(0)])
+        self.assertNotIn('job-0', self.catalogue)
+        self.catalogue.add([make_job(0)])
+        self.assertIn('job-0', self.catalogue)
+        self.assertEqual(failing.jobs_added.call_count, 2)
+
+    def test_published_jobs_are_not_evicted(self):
+        self.catalogue.restore([make_job(n) for n in range(3)])
+        self.catalogue.add([make_job(n) for n in range(3, 7)])
+        self.assertEqual(len(self.catalogue.ingested()), 3)
+        self.assertEqual(sorted(job['id'] for job in self.catalogue.all()),
+                         ['job-0', 'job-1', 'job-2', 'job-4', 'job-5', 'job-6'])
+
+    def test_expires_jobs_not_refreshed_within_max_age(self):
+        self.catalogue.add([make_job(0)])
+        with mock.patch('api.catalogue.time.monotonic', return_value=10 ** 9):
+            self.catalogue.add([make_job(1)])
+        self.assertNotIn('job-0', self.catalogue)
+        self.assertIn('job-1', self.catalogue)
+
+    def test_concurrent_adds_and_evictions(self):
+        errors = []
+        barrier = threading.Barrier(4)
+
+        def add_many(worker):
+            barrier.wait()
+            try:
+                for n in range(300):
+                    self.catalogue.add([make_job(f'{worker}-{n}')])
+                    self.catalogue.get(f'job-{(worker + 1) % 4}-{n}')
+                    self.catalogue.all()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=add_many, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.catalogue), 3)
+        self.assertEqual(self.listener.ids, {job['id'] for job in self.catalogue.all()})
+
+
+class FirstSeenDateTests(ApiSimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_date_does_not_drift_once_given_out(self):
+        job_id = '0b5d1a2e-0000-5000-8000-000000000000'
+        first = first_seen_date(job_id, spread_days=7)
+
+        class Later(real_datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return real_datetime.now(tz) + timedelta(days=3)
+
+        with mock.patch('api.parsing.datetime', Later):
+            self.assertEqual(first_seen_date(job_id, spread_days=7), first)
+
+
+class VocabularyTests(ApiSimpleTestCase):
+    def test_concurrent_adds_get_distinct_ids(self):
+        vocabulary = Vocabulary()
+        terms = [f'term-{n}' for n in range(2000)]
+        barrier = threading.Barrier(4)
+
+        def add_all():
+            barrier.wait()
+            for term in terms:
+                vocabulary.add(term)
+
+        threads = [threading.Thread(target=add_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(vocabulary), len(terms))
+        self.assertEqual(sorted(vocabulary.ids.values()), list(range(len(terms))))
+        self.assertTrue(all(vocabulary.terms[term_id] == term for term, term_id in vocabulary.ids.items()))
+
+    def test_resume_skills_do_not_grow_the_shared_vocabulary(self):
+        size = len(SKILLS)
+        profile = ResumeProfile.from_analysis({'skills': ['Python', 'Underwater basket weaving']})
+        self.assertEqual(len(SKILLS), size)
+        self.assertEqual(profile.skill_ids, {SKILLS.ids['python']})
+
+
+def unit_vectors(n, dim=8, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class IVFIndexTests(ApiSimpleTestCase):
+    def test_key_repeated_in_one_batch_is_indexed_once_with_its_last_vector(self):
+        index = IVFIndex(8, nlist=2)
+        vectors = unit_vectors(3)
+        index.add(['a', 'b', 'a'], vectors)
+        self.assertEqual(sorted(index.keys()), ['a', 'b'])
+        self.assertEqual(sum(len(keys) for keys, _ in index.export()[1]), 2)
+        np.testing.assert_array_equal(index.vector('a'), vectors[2])
+
+    def test_index_over_an_empty_mapped_list_can_grow(self):
+        rows = np.empty((0, 8), dtype=np.float32)
+        rows.flags.writeable = False  # Like a slice of a read-only snapshot mapping
+        index = IVFIndex.from_lists(8, None, [([], rows)])
+        index.add(['a', 'b'], unit_vectors(2))
+        self.assertEqual(sorted(index.keys()), ['a', 'b'])
+
+    def test_retrains_after_the_catalogue_turns_over(self):
+        index = IVFIndex(8, nlist=2, train_size=20)
+        index.add([f'a{n}' for n in range(20)], unit_vectors(20))
+        first = index.centroids.copy()
+        index.remove([f'a{n}' for n in range(20)])
+        index.add([f'b{n}' for n in range(19)], unit_vectors(19, seed=1))
+        np.testing.assert_array_equal(index.centroids, first)
+        index.add(['b19'], unit_vectors(1, seed=2))
+        self.assertFalse(np.array_equal(index.centroids, first))
+        self.assertEqual(len(index), 20)
+        self.assertEqual(index.search(index.vector('b3'), k=1)[0][0], 'b3')
+
+
+class ParseSalaryTests(ApiSimpleTestCase):
+    def test_ranges_and_units(self):
+        cases = {
+            '3-8 LPA': SalaryRange('INR', 3e5, 8e5),
+            '$100-150k': SalaryRange('USD', 1e5, 1.5e5),
+            '₹4,00,000 - ₹6,00,000': SalaryRange('INR', 4e5, 6e5),
+            '4 to 6 lakhs': SalaryRange('INR', 4e5, 6e5),
+            '£45/hr': SalaryRange('GBP', 45 * 2080, 45 * 2080),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_salary(text), expected)
+
+    def test_currency_words_must_stand_alone(self):
+        self.assertEqual(parse_salary('$120,000 - $150,000 (3+ years )'), SalaryRange('USD', 120000, 150000))
+        self.assertEqual(parse_salary('50000 (lacrosse coach)', 'USD').currency, 'USD')
+
+    def test_other_numbers_do_not_become_bounds(self):
+        self.assertEqual(parse_salary('$90k for 2 years '), SalaryRange('USD', 90000, 90000))
+        self.assertEqual(parse_salary('10-15 LPA + 2 years'), SalaryRange('INR', 1e6, 1.5e6))
+
+
+class ResearchMarketTests(ApiSimpleTestCase):
+    def post(self, narrative):
+        with mock.patch('api.views.market_stats.lookup', return_value=(('', '', ''), {'jobs': 1})), \
+                mock.patch('api.views.gemini_generate', return_value='Summary') as generate:
+            response = self.client.post(reverse('api:ai_research_market'), {'role': 'engineer', 'narrative': narrative})
+        self.assertEqual(response.status_code, 200)
+        return generate
+
+    def test_form_false_does_not_call_the_provider(self):
+        for value in ('false', '0', ''):
+            with self.subTest(narrative=value):
+                self.post(value).assert_not_called()
+
+    def test_form_true_asks_for_the_narrative(self):
+        self.post('true').assert_called_once()
+
+
+class MarketStatsTests(ApiSimpleTestCase):
+    def test_job_records_are_bucketed_by_their_industry(self):
+        stats = MarketStats()
+        stats.jobs_added([JobRecord.from_dict(make_job(n, title='Backend Developer', industry='Fintech',
+                                                       salary_min=100000, salary_max=120000)) for n in range(3)])
+        self.assertEqual(len(stats._buckets), 8)
+        key, summary = stats.lookup('backend developer', 'remote', 'fintech')
+        self.assertEqual(key, ('backend developer', 'remote', 'fintech'))
+        self.assertEqual(summary['postings'], 3)
+
+
+@override_settings(JOB_INGESTION={'SERVE_FROM_CATALOGUE': False})
+class JobsListTests(ApiSimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def get(self, **params):
+        token = UserProfile.build(skills=['Python'], target_role='Engineer').token()
+        jobs = [make_job(n, id=f'list-{n}', skills_required=['Python'] if n % 2 else ['Java']) for n in range(30)]
+        with mock.patch('api.views.ai_generate_jobs', return_value=jobs):
+            response = self.client.get(reverse('api:jobs_list'), params, **{f'HTTP_{PROFILE_HEADER.upper().replace("-", "_")}': token})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_count_is_the_total_before_ranking(self):
+        self.assertEqual(self.get()['count'], 30)
+
+    def test_page_selects_the_slice(self):
+        first, second = self.get(), self.get(page=2)
+        self.assertEqual(len(first['results']), 25)
+        self.assertEqual(len(second['results']), 5)
+        self.assertFalse({job['id'] for job in first['results']} & {job['id'] for job in second['results']})
+
+    def test_salary_sort_walks_the_index_with_unsalaried_jobs_last(self):
+        jobs = [make_job(n, id=f'pay-{n}', salary_min=1000 * n, salary_max=1000 * n) for n in range(1, 4)]
+        jobs.append(make_job(0, id='pay-none'))
+        salary_index.jobs_added(jobs)
+        self.addCleanup(salary_index.jobs_removed, jobs)
+        for sort, expected in (('salary', ['pay-1', 'pay-2', 'pay-3', 'pay-none']),
+                               ('-salary', ['pay-3', 'pay-2', 'pay-1', 'pay-none'])):
+            with mock.patch('api.views.ai_generate_jobs', return_value=jobs):
+                response = self.client.get(reverse('api:jobs_list'), {'sort': sort})
+            self.assertEqual([job['id'] for job in response.json()['results']], expected, sort)
+
+
+
+class RankJobsTests(ApiSimpleTestCase):
+    def setUp(self):
+        self.jobs = [make_job(n, id=f'rank-{n}', skills_required=['Python'] if n % 3 else ['Java']) for n in range(12)]
+        self.matrix = JobMatrix(self.jobs)
+        self.profile = ResumeProfile.from_analysis({'skills': ['Python'], 'target_role': 'Engineer'})
+
+    def test_catalogue_jobs_are_ranked_as_rows_of_the_shared_matrix(self):
+        subset = self.jobs[::2]
+        expected = [job['id'] for job, _ in JobMatrix(subset).rank(self.profile, limit=4)]
+        with mock.patch('api.matching.catalogue_matrix', return_value=self.matrix), \
+                mock.patch('api.matching.JobMatrix') as build:
+            ranked = rank_jobs(self.profile, subset, limit=4)
+        build.assert_not_called()
+        self.assertEqual([job['id'] for job in ranked], expected)
+
+    def test_jobs_outside_the_catalogue_get_their_own_matrix(self):
+        with mock.patch('api.matching.catalogue_matrix', return_value=JobMatrix(self.jobs[:2])):
+            ranked = rank_jobs(self.profile, self.jobs, limit=3)
+        self.assertEqual(len(ranked), 3)
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(self.matrix.rank(self.profile, limit=0), [])
+        self.assertEqual([match_limit(value) for value in (0, -5, '3', 10 ** 6, 'abc', None)],
+                         [1, 1, 3, MAX_MATCH_LIMIT, None, None])
+
+    def test_match_jobs_rejects_a_non_numeric_limit(self):
+        with mock.patch('api.views.gemini_generate') as generate:
+            response = self.client.post(reverse('api:ai_match_jobs'), {'resume_text': 'Python', 'limit': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        generate.assert_not_called()
+
+@override_settings(JOB_SNAPSHOT={'PATH': '', 'LOAD_ON_START': False},
+                   JOB_INGESTION={'QUERIES': ['python'], 'LOCATIONS': ['remote'], 'EXPIRE_AFTER_SECONDS': 3600})
+class IngestionSweepTests(ApiSimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_unchanged_jobs_are_re_shared(self):
+        jobs = [make_job(n, id=f'sweep-{n}', posted_date='2026-01-01') for n in range(3)]
+        fetch = lambda query, location: [dict(job) for job in jobs]
+        sweep(fetch=fetch)
+        cache.delete(f'{JOB_CACHE_PREFIX}sweep-1')  # As if its week in the cache ran out
+        stats = sweep(fetch=fetch)
+        self.assertEqual(stats['unchanged'], 3)
+        self.assertEqual(cache.get(f'{JOB_CACHE_PREFIX}sweep-1')['title'], 'Engineer 1')
+
+
+class CollectTests(ApiSimpleTestCase):
+    @override_settings(JOB_COLLECTION={'PARALLELISM': 2, 'DEADLINE_SECONDS': 5, 'MAX_PAIRS': 2})
+    def test_non_string_queries_are_coerced_and_dropped_pairs_reported(self):
+        seen = []
+
+        def fetch(query, location, limit, timeout):
+            seen.append((query, location))
+            return [make_job(len(seen), id=f'{query}-{location}')]
+
+        jobs, stats = collect([2026, ' python '], ['Remote'], fetch=fetch)
+        self.assertEqual(sorted(seen), [('2026', 'Remote'), ('python', 'Remote')])
+        self.assertEqual(stats['dropped'], 0)
+
+        jobs, stats = collect(['a', 'b', 'c'], ['Remote'], fetch=fetch)
+        self.assertEqual((stats['pairs'], stats['dropped'], len(jobs)), (2, 1, 2))
+
+    def test_endpoint_rejects_a_bad_limit(self):
+        with mock.patch('api.views.collect') as run:
+            for limit, message in (('abc', 'limit must be a number'), (0, 'limit must be between 1 and'),
+                                   (settings.JOB_COLLECTION['MAX_LIMIT'] + 1, 'limit must be between 1 and')):
+                response = self.client.post(reverse('api:ai_collect_linkedin_jobs'),
+                                            {'queries': 'python', 'limit': limit})
+                self.assertEqual(response.status_code, 400, limit)
+                self.assertIn(message, response.json()['message'])
+        run.assert_not_called()
+
+
+class JobsApplyTests(ApiTestCase):
+    def apply(self, job_id, key):
+        return self.client.post(reverse('api:jobs_apply', args=[job_id]), {}, HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_long_idempotency_key_is_stored_as_a_digest(self):
+        key = 'k' * 500
+        first, retry = self.apply('job-1', key), self.apply('job-1', key)
+        self.assertEqual((first.status_code, retry.status_code), (201, 200))
+        self.assertEqual(first.json()['application_id'], retry.json()['application_id'])
+        self.assertLessEqual(len(Application.objects.get().idempotency_key), 128)
+
+    def test_long_job_id_is_rejected(self):
+        self.assertEqual(self.apply('j' * 65, 'key-1').status_code, 400)
+        self.assertFalse(Application.objects.exists())
+
+    def test_key_reused_for_another_job_is_a_conflict(self):
+        self.assertEqual(self.apply('job-1', 'key-1').status_code, 201)
+        self.assertEqual(self.apply('job-2', 'key-1').status_code, 422)
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_bulk_apply_with_a_long_request_key(self):
+        response = self.client.post(reverse('api:jobs_bulk_apply'), {'job_ids': ['job-1', 'job-2']},
+                                    content_type='application/json', HTTP_IDEMPOTENCY_KEY='b' * 200)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 2)
+
+
+class CorsTests(ApiSimpleTestCase):
+    def test_preflight_allows_the_profile_and_idempotency_headers(self):
+        response = self.client.options(
+            reverse('api:jobs_list'), HTTP_ORIGIN='http://localhost:5173', HTTP_ACCESS_CONTROL_REQUEST_METHOD='GET',
+            HTTP_ACCESS_CONTROL_REQUEST_HEADERS='x-profile-token, idempotency-key',
+        )
+        allowed = response['Access-Control-Allow-Headers'].lower()
+        self.assertIn(PROFILE_HEADER.lower(), allowed)
+        self.assertIn('idempotency-key', allowed)
+
+
+class MetricsShardTests(ApiSimpleTestCase):
+    def tearDown(self):
+        REGISTRY.remove(self.metric)
+
+    def test_shards_of_exited_threads_are_folded_into_the_totals(self):
+        self.metric = Histogram('test_shard_seconds', 'Test', ['stage'], buckets=(1.0,))
+        for _ in range(50):
+            thread = threading.Thread(target=self.metric.observe, args=(0.5,), kwargs={'stage': 'a'})
+            thread.start()
+            thread.join()
+        self.metric.observe(2.0, stage='a')
+        self.assertEqual(self.metric.collect(), {('a',): [50, 1, 27.0]})
+        self.assertEqual(len(self.metric._shards), 1)
+
+    def test_scrape_while_the_owner_adds_series(self):
+        self.metric = Counter('test_shard_total', 'Test', ['n'])
+        stop = threading.Event()
+
+        def record():
+            n = 0
+            while not stop.is_set():
+                self.metric.inc(n=n)
+                n += 1
+
+        thread = threading.Thread(target=record)
+        thread.start()
+        try:
+            for _ in range(200):
+                self.metric.collect()
+        finally:
+            stop.set()
+            thread.join()
+
+
+class TracingTests(ApiSimpleTestCase):
+    @override_settings(JOB_COLLECTION={'PARALLELISM': 2, 'DEADLINE_SECONDS': 5, 'MAX_PAIRS': 4})
+    def test_executor_calls_join_the_request_trace(self):
+        def fetch(query, location, limit, timeout):
+            with span('provider_call') as call:
+                record_usage(call, 'test-provider', 'test-model', 10, 5)
+            return []
+
+        with start_trace('POST collect') as root:
+            root.trace.endpoint = 'collect'
+            collect(['a', 'b'], ['Remote'], fetch=fetch)
+        calls = [s for s in root.trace.spans if s.name == 'provider_call']
+        self.assertEqual([call.parent_id for call in calls], [root.span_id] * 2)
+        self.assertEqual(ai_tokens.collect()[('collect', 'test-provider', 'input')], 20)
+
+    def test_sink_is_rotated_past_max_bytes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'traces.jsonl')
+            tracing = {'PATH': path, 'MAX_BYTES': 1000, 'SAMPLE_RATE': 1.0}
+            with override_settings(TRACING=tracing):
+                for _ in range(50):
+                    export(Trace())
+            self.assertLessEqual(os.path.getsize(path), 1000 + 200)
+            self.assertTrue(os.path.exists(f'{path}.1'))
+
+
+class MemoryBudgetTests(ApiSimpleTestCase):
+    def test_off_by_default(self):
+        with MemoryBudget('test', limit=1) as budget:
+            self.assertFalse(tracemalloc.is_tracing())
+            budget.check()
+
+    @override_settings(MEMORY_BUDGET={'ENABLED': True, 'SAMPLE_RATE': 1.0, 'STAGE_BYTES': 1024})
+    def test_exclusive_stage_over_budget_is_not_retryable(self):
+        with self.assertRaises(MemoryBudgetExceeded) as raised:
+            with MemoryBudget('test') as budget:
+                hold = bytearray(1024 * 1024)
+                budget.check()
+        self.assertFalse(raised.exception.retryable)
+
+    @override_settings(MEMORY_BUDGET={'ENABLED': True, 'SAMPLE_RATE': 1.0, 'STAGE_BYTES': 1024})
+    def test_overlapping_stage_over_budget_is_retryable(self):
+        with MemoryBudget('other', limit=0):
+            with self.assertRaises(MemoryBudgetExceeded) as raised:
+                with MemoryBudget('test') as budget:
+                    hold = bytearray(1024 * 1024)
+                    budget.check()
+        self.assertTrue(raised.exception.retryable)
+
+
+class ColdStartTests(ApiSimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.modules = measure()
+
+    def test_provider_sdks_and_document_parsers_are_not_imported_at_boot(self):
+        if settings.WARM_UP_IMPORTS:
+            self.skipTest('WARM_UP_IMPORTS imports them on purpose')
+        self.assertEqual([name for name in LAZY_MODULES if name in self.modules], [])
+
+    @skipIf(os.environ.get('SKIP_COLD_START_BUDGET'), 'Timing budget disabled on this machine')
+    def test_boot_imports_fit_the_budget(self):
+        if not settings.COLD_START_BUDGET_MS:
+            self.skipTest('No cold-start budget configured')
+        total_ms = sum(cumulative for _, cumulative, depth in self.modules.values() if depth == 0) / 1000
+        self.assertLessEqual(total_ms, settings.COLD_START_BUDGET_MS)
+
+
+class CompareResumesTests(ApiSimpleTestCase):
+    def compare(self, jobs):
+        return self.client.post(reverse('api:resumes_compare'), {
+            'resumes': ['Python developer who also writes Underwater Basket Weaving guides', 'Java developer'],
+            'jobs': jobs,
+        }, content_type='application/json')
+
+    def test_skills_required_must_be_a_list_of_strings(self):
+        size = len(SKILLS)
+        for skills in ('python, java', [1, 2], ['x' * 101], ['python'] * 101):
+            response = self.compare([{'title': 'Developer', 'skills_required': skills}])
+            self.assertEqual(response.status_code, 400, skills)
+        self.assertEqual(len(SKILLS), size)
+
+    def test_request_skills_do_not_grow_the_shared_vocabulary(self):
+        size = len(SKILLS)
+        response = self.compare([{'title': 'Developer', 'skills_required': ['Python', 'Underwater basket weaving']}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(SKILLS), size)
+        self.assertNotIn('underwater basket weaving', SKILLS.ids)
+        breakdown = response.json()['resume_job']['breakdown']
+        self.assertEqual(breakdown[0][0], {'shared': ['python', 'underwater basket weaving'], 'missing': []})
+        self.assertEqual(breakdown[1][0]['missing'], ['python', 'underwater basket weaving'])
+
+
+class SectionsTests(ApiSimpleTestCase):
+    def test_email_search_is_linear_on_long_lines(self):
+        for line in ('a' * 200_000, 'a.' * 100_000, 'x@' + 'a.' * 100_000, 'a@' * 100_000):
+            started = time.perf_counter()
+            EMAIL.search(line)
+            segment(line)
+            self.assertLess(time.perf_counter() - started, 1.0, line[:10])
+
+    def test_email_still_matches_whole_addresses(self):
+        self.assertEqual(EMAIL.findall('Mail jane.doe+cv@example.co.uk or (bob@x.io)'),
+                         ['jane.doe+cv@example.co.uk', 'bob@x.io'])
+
+
+class ParsedResumeStoreTests(ApiSimpleTestCase):
+    @override_settings(RESUME_STORE={**settings.RESUME_STORE, 'LOCAL_ENTRIES': 4})
+    def test_concurrent_lookups_and_evictions(self):
+        store = ParsedResumeStore()
+        errors = []
+        barrier = threading.Barrier(8)
+
+        def churn(worker):
+            barrier.wait()
+            try:
+                for n in range(2000):
+                    store._remember(f'{n % 16}', {'worker': worker}, time.monotonic() + 60)
+                    store.get(f'{(n + worker) % 16}')
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=churn, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(store._parsed), 4)
+
+
+class ResumeVersionRetentionTests(ApiTestCase):
+    def setUp(self):
+        cache.delete(PRUNE_CACHE_KEY)
+
+    def upload(self, applicant, resume_id, days_ago=0):
+        version, _ = record(applicant, resume_id, {'skills': {'normalized': [resume_id]}})
+        ParsedResume.objects.filter(pk=version.pk).update(created_at=version.created_at - timedelta(days=days_ago))
+
+    def test_applicants_without_recent_uploads_are_pruned(self):
+        self.upload('session:gone', 'r1', days_ago=40)
+        self.upload('session:gone', 'r2', days_ago=35)
+        self.upload('session:active', 'r1', days_ago=40)
+        self.upload('session:active', 'r2')
+        self.assertEqual(prune_stale(30 * 24 * 3600), 2)
+        self.assertEqual(set(ParsedResume.objects.values_list('applicant', flat=True)), {'session:active'})
+
+    def test_record_prunes_at_most_once_per_interval(self):
+        self.upload('session:gone', 'r1', days_ago=40)
+        cache.delete(PRUNE_CACHE_KEY)
+        with mock.patch('api.resume_versions.prune_stale') as prune:
+            self.upload('session:new', 'r1')
+            self.upload('session:new', 'r2')
+        self.assertEqual(prune.call_count, 1)
+
+    def test_cors_lets_the_frontend_send_its_session_cookie(self):
+        response = self.client.get(reverse('api:resumes_versions'), HTTP_ORIGIN='http://localhost:5173')
+        self.assertEqual(response['Access-Control-Allow-Credentials'], 'true')
+
+
+def fake_scores(prompt):
+    labels = sorted(set(re.findall(r'<<<(C\d+)', prompt)))
+    return json.dumps([{'candidate': label, 'score': 7, 'reason': 'fits'} for label in labels])
+
+
+class BatchScoringTests(ApiTestCase):
+    resumes = [{'id': f'r{n}', 'text': f'Python developer number {n}'} for n in range(4)]
+
+    def score(self, job):
+        return self.client.post(reverse('api:resumes_batch_score'), {
+            'resumes': self.resumes, 'job': job, 'stream': False,
+        }, content_type='application/json')
+
+    def test_job_fields_are_validated_before_scoring(self):
+        size = len(SKILLS)
+        for job in ({'title': 'Dev', 'skills_required': [1, 'python']}, {'title': 'Dev', 'skills_required': 'python'},
+                    {'title': 'Dev', 'description': ['not', 'text']}):
+            self.assertEqual(self.score(job).status_code, 400, job)
+        self.assertEqual(len(SKILLS), size)
+        self.assertFalse(BatchScore.objects.exists())
+
+    def test_checkpoint_keeps_the_first_score_and_ignores_expired_ones(self):
+        DatabaseCheckpoint('batch').add({'r1': {'score': 5.0, 'reason': 'first'}})
+        DatabaseCheckpoint('batch').add({'r1': {'score': 9.0, 'reason': 'second'},
+                                         'r2': {'score': 6.0, 'reason': ''}})
+        self.assertEqual(DatabaseCheckpoint('batch').load(), {'r1': {'score': 5.0, 'reason': 'first'},
+                                                              'r2': {'score': 6.0, 'reason': ''}})
+        BatchScore.objects.filter(resume_id='r2').update(created_at=timezone.now() - timedelta(days=2))
+        self.assertEqual(list(DatabaseCheckpoint('batch', timeout=3600).load()), ['r1'])
+
+    def test_rerun_resumes_from_the_database_checkpoint(self):
+        job = {'title': 'Python developer', 'skills_required': ['Python']}
+        generate = mock.Mock(side_effect=fake_scores)
+        *_, first = BatchScorer(job, self.resumes, top_k=4, generate=generate).run()
+        calls = generate.call_count
+        *_, second = BatchScorer(job, self.resumes, top_k=4, generate=generate).run()
+        self.assertGreater(calls, 0)
+        self.assertEqual(generate.call_count, calls)
+        self.assertEqual(second['stats']['from_checkpoint'], 4)
+        self.assertEqual([entry['ai_score'] for entry in second['ranking']], [7.0] * 4)
+        self.assertEqual(second['ranking'][0]['matched_skills'], ['python'])
+
+    def test_provider_failures_are_logged(self):
+        job = {'title': 'Python developer', 'skills_required': ['Python']}
+        generate = mock.Mock(side_effect=ProviderError('quota exceeded'))
+        with self.assertLogs('api.batch_scoring', 'WARNING') as logs:
+            *_, done = BatchScorer(job, self.resumes, top_k=2, generate=generate).run()
+        self.assertEqual(done['stats']['failed'], 2)
+        self.assertIn('quota exceeded', logs.output[0])
+
+
+class RendererTests(ApiSimpleTestCase):
+    data = {
+        'posted': real_datetime(2025, 3, 4, 5, 6, 7, 891011), 'day': date(2025, 3, 4), 'salary': Decimal('12.50'),
+        'id': uuid.UUID('5b0d6c1e-8f3a-4d2b-9c7e-2a1f4e6b8d90'), 'text': 'line\u2028break é', 'jobs': [make_job(1)],
+        'none': None, 'nested': {'ratio': 0.25, 'flags': [True, False]},
+    }
+
+    def test_fast_renderer_matches_drf(self):
+        expected = JSONRenderer().render(self.data)
+        self.assertEqual(renderers.FastJSONRenderer().render(self.data), expected)
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(renderers.FastJSONRenderer().render(self.data), expected)
+
+    def test_job_records_render_as_their_dict(self):
+        job = make_job(1)
+        self.assertEqual(renderers.dumps([JobRecord.from_dict(job)]), JSONRenderer().render([job]))
+
+
+@override_settings(COMPRESSION={'ENABLED': True, 'MIN_BYTES': 200, 'BROTLI_QUALITY': 4})
+class CompressionTests(ApiSimpleTestCase):
+    def respond(self, body, accept_encoding):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: HttpResponse(body, content_type='application/json'))(request)
+
+    def test_negotiation_follows_q_values(self):
+        encodings = ('br', 'gzip')
+        self.assertEqual(compression.negotiate('gzip, br', encodings), 'br')
+        self.assertEqual(compression.negotiate('gzip;q=1.0, br;q=0.5', encodings), 'gzip')
+        self.assertEqual(compression.negotiate('br;q=0, gzip', encodings), 'gzip')
+        self.assertEqual(compression.negotiate('*', encodings), 'br')
+        self.assertIsNone(compression.negotiate('identity', encodings))
+        self.assertIsNone(compression.negotiate('gzip;q=abc', encodings))
+        self.assertEqual(compression.negotiate('gzip, br', ('gzip',)), 'gzip')
+
+    def test_bodies_under_the_threshold_are_sent_as_is(self):
+        response = self.respond(b'[' + b'1,' * 50 + b'1]', 'gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_large_bodies_are_gzipped_when_accepted(self):
+        response = self.respond(b'[' + b'1,' * 500 + b'1]', 'gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertLess(int(response['Content-Length']), 1000)
+
+    @skipIf(compression.brotli is None, 'brotli is not installed')
+    def test_brotli_is_preferred_when_installed(self):
+        body = b'[' + b'1,' * 500 + b'1]'
+        response = self.respond(body, 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.content), body)
+
+
+class ProfilingTests(ApiSimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+
+    def profiling(self, **options):
+        return override_settings(PROFILING={**settings.PROFILING, 'DIR': self.dir, 'TOKEN': 'secret',
+                                            'SAMPLE_RATE': 0.0, **options})
+
+    def profiles(self):
+        return sorted(name for name in os.listdir(self.dir) if name.endswith(profiling.PROFILE_SUFFIX))
+
+    def test_requests_are_profiled_only_when_sampled_or_requested(self):
+        with self.profiling():
+            response = self.client.get(reverse('api:api_status'))
+            self.assertNotIn('X-Flamegraph-File', response)
+            self.assertEqual(self.profiles(), [])
+            response = self.client.get(reverse('api:api_status'), HTTP_X_FLAMEGRAPH='secret')
+            self.assertEqual(self.profiles(), [response['X-Flamegraph-File']])
+        with self.profiling(SAMPLE_RATE=1.0):
+            response = self.client.get(reverse('api:api_status'))
+        self.assertNotIn('X-Flamegraph-File', response)  # Only returned to callers who asked
+        self.assertEqual(len(self.profiles()), 2)
+
+    def test_writes_prune_old_and_excess_profiles(self):
+        now = time.time()
+        for n, age in enumerate((10, 20, 30, 40, 10 ** 6)):
+            path = os.path.join(self.dir, f'old-{n}{profiling.PROFILE_SUFFIX}')
+            open(path, 'w').close()
+            os.utime(path, (now - age, now - age))
+        open(os.path.join(self.dir, 'notes.txt'), 'w').close()
+        with self.profiling(MAX_FILES=3, MAX_AGE_SECONDS=3600):
+            path = profiling.write_profile(profiling.StackSampler(threading.get_ident()), 'new')
+        self.assertEqual(self.profiles(), sorted([os.path.basename(path), 'old-0.folded', 'old-1.folded']))
+        self.assertTrue(os.path.exists(os.path.join(self.dir, 'notes.txt')))
+
+
+class ResponseCacheTests(ApiSimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.catalogue = JobCatalogue()
+        self.calls = []
+
+        @api_view(['GET'])
+        @cached_response(timeout=60, fingerprint=lambda request: request.headers.get('X-User', ''),
+                         version=lambda: self.catalogue.version)
+        def view(request):
+            self.calls.append(request.headers.get('X-User', ''))
+            response = Response({'user': request.headers.get('X-User', ''), 'jobs': len(self.catalogue)})
+            if request.GET.get('volatile'):
+                response['Cache-Control'] = 'no-store'
+            return response
+
+        self.view = view
+
+    def get(self, query='', **headers):
+        return self.view(RequestFactory().get(f'/jobs/{query}', **headers))
+
+    def test_matching_weak_etag_gets_a_304_without_running_the_view(self):
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=f'W/{etag}')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_catalogue_version_bump_changes_the_etag(self):
+        etag = self.get()['ETag']
+        self.catalogue.add([make_job(1)])
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_no_store_responses_are_not_cached(self):
+        first, second = self.get('?volatile=1'), self.get('?volatile=1')
+        self.assertEqual(len(self.calls), 2)
+        self.assertFalse(first.has_header('ETag') or second.has_header('ETag'))
+
+    def test_personalised_responses_do_not_share_a_key(self):
+        alice, bob = self.get(HTTP_X_USER='alice'), self.get(HTTP_X_USER='bob')
+        self.assertEqual(self.calls, ['alice', 'bob'])
+        self.assertNotEqual(alice['ETag'], bob['ETag'])
+        self.assertIn('private', alice['Cache-Control'])
+        self.assertEqual(self.get(HTTP_X_USER='bob', HTTP_IF_NONE_MATCH=alice['ETag']).status_code, 200)
+
+
+# Both versions of the AI views side by side, for AsyncViewTests (AI_VIEWS_ASYNC picks one in api.urls)
+urlpatterns = [
+    path('sync/analyze-resume/', views.analyze_resume),
+    path('async/analyze-resume/', async_views.analyze_resume),
+    path('sync/career-advice/', views.ai_career_advice),
+    path('async/career-advice/', async_views.ai_career_advice),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewTests(ApiTestCase):
+    def setUp(self):
+        self.client = AsyncClient(enforce_csrf_checks=True)
+
+    async def post(self, version, view, reply=None, error=None):
+        with mock.patch('api.async_views.gemini_generate_async', side_effect=error, return_value=reply), \
+                mock.patch('api.views.gemini_generate', side_effect=error, return_value=reply):
+            return await self.client.post(f'/{version}/{view}/', {'resume_text': 'Python developer'},
+                                          content_type='application/json')
+
+    async def test_success_matches_the_sync_view(self):
+        for view, field in (('analyze-resume', 'analysis'), ('career-advice', 'advice')):
+            responses = [await self.post(version, view, reply='Looks good') for version in ('sync', 'async')]
+            self.assertEqual([response.status_code for response in responses], [200, 200], view)
+            self.assertEqual([response.json()[field] for response in responses], ['Looks good'] * 2, view)
+
+    async def test_provider_errors_get_the_sync_status(self):
+        responses = [await self.post(version, 'analyze-resume', error=ProviderError('Gemini is down'))
+                     for version in ('sync', 'async')]
+        self.assertEqual([response.status_code for response in responses], [500, 500])
+        self.assertEqual(responses[0].json(), responses[1].json())
+
+    async def test_anonymous_posts_need_no_csrf_token(self):
+        responses = [await self.post(version, 'analyze-resume', reply='ok') for version in ('sync', 'async')]
+        self.assertEqual([response.status_code for response in responses], [200, 200])
+
+    async def test_session_users_need_a_csrf_token(self):
+        user = await User.objects.acreate(username='recruiter')
+        await sync_to_async(self.client.force_login)(user)
+        responses = [await self.post(version, 'analyze-resume', reply='ok') for version in ('sync', 'async')]
+        self.assertEqual([response.status_code for response in responses], [403, 403])
+        self.assertEqual(responses[0].json(), responses[1].json())
+
+
+class LoadTestTests(ApiSimpleTestCase):
+    def test_mix_parsing(self):
+        self.assertEqual(parse_mix('jobs=5, analyze=2,match'), {'jobs': 5.0, 'analyze': 2.0, 'match': 1.0})
+        for spec in ('jobs=5,nope=1', 'jobs=lots', 'jobs=0'):
+            with self.assertRaises(ValueError, msg=spec):
+                parse_mix(spec)
+
+    @override_settings(JOB_INGESTION={**settings.JOB_INGESTION, 'SERVE_FROM_CATALOGUE': False})
+    def test_in_process_run_produces_a_complete_report(self):
+        import httpx
+        from django.core.asgi import get_asgi_application
+
+        mix = parse_mix('jobs=1')
+        jobs = [make_job(n, id=f'load-{n}', salary_min=1000 * n, salary_max=2000 * n) for n in range(40)]
+        transport = httpx.ASGITransport(app=get_asgi_application())
+        with mock.patch('api.views.ai_generate_jobs', return_value=jobs):
+            samples, elapsed = asyncio.run(replay('http://testserver', {'jobs': SCENARIOS['jobs']()}, mix, 2.0,
+                                                  users=2, seed=1, transport=transport))
+        result = report.build(samples, elapsed, 0.5, {'mix': mix})
+        missed = report.check_slos(result, [report.parse_slo('all:error_rate=0'), report.parse_slo('jobs:p99=10000')])
+
+        self.assertEqual(set(result), {'version', 'meta', 'endpoints', report.TOTAL, 'slo'})
+        self.assertEqual(list(result['endpoints']), ['jobs'])
+        summary = result[report.TOTAL]
+        self.assertGreater(summary['requests'], 0)
+        self.assertEqual(summary['outcomes'], {'200': summary['requests']})
+        latency = summary['latency_ms']
+        self.assertEqual(set(latency), set(report.LATENCY_METRICS))
+        self.assertLessEqual(latency['p50'], latency['p95'])
+        self.assertLessEqual(latency['p95'], latency['p99'])
+        self.assertLessEqual(latency['p99'], latency['max'])
+        self.assertEqual(missed, [])
+        self.assertEqual([slo['met'] for slo in result['slo']], [True, True])
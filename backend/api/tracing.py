@@ -0,0 +1,257 @@
+"""Per-request tracing: spans, a JSONL sink and AI token/cost accounting.
+
+``TracingMiddleware`` opens a root span for every request and ``span()`` /
+``traced()`` open children of whichever span is current (tracked in a context
+variable, so nothing is threaded through call signatures). Outside a request
+they are no-ops. Sampled traces are appended to ``TRACING['PATH']``, one per
+line, in the OTLP/JSON shape (``resourceSpans`` > ``scopeSpans`` > ``spans``)
+so they can be replayed into any OpenTelemetry collector. Provider spans carry
+the ``gen_ai.*`` semantic-convention attributes; their token counts and
+estimated cost are also rolled up per endpoint in ``/metrics``.
+"""
+import json
+import os
+import random
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+from .metrics import ai_cost, ai_tokens
+
+DEBUG_HEADER = 'X-Trace-Debug'
+SERVICE_NAME = 'job-backend'
+
+# OTLP SpanKind / StatusCode values
+SPAN_KINDS = {'INTERNAL': 1, 'SERVER': 2, 'CLIENT': 3}
+STATUS_UNSET, STATUS_ERROR = 0, 2
+
+_current = ContextVar('api_tracing_span', default=None)
+_sink_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'kind', 'start_ns', 'end_ns', 'attributes', 'error')
+
+    def __init__(self, trace, name, parent_id='', kind='INTERNAL', attributes=None):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.error = None
+        trace.spans.append(self)
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self):
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_otlp(self):
+        span = {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id,
+            'name': self.name,
+            'kind': SPAN_KINDS[self.kind],
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or self.start_ns),
+            'attributes': [{'key': key, 'value': _otlp_value(value)} for key, value in self.attributes.items()],
+            'status': {'code': STATUS_UNSET},
+        }
+        if self.error:
+            span['status'] = {'code': STATUS_ERROR, 'message': self.error}
+        return span
+
+
+class _NoopSpan:
+    """Stand-in yielded when no trace is active"""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    __slots__ = ('trace_id', 'spans', 'endpoint')
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans = []
+        self.endpoint = 'unmatched'
+
+    def usage(self):
+        """Tokens and estimated cost summed over this trace's provider calls"""
+        totals = {'input_tokens': 0, 'output_tokens': 0, 'cost_usd': 0.0, 'calls': 0}
+        for span in self.spans:
+            attributes = span.attributes
+            if 'gen_ai.system' not in attributes:
+                continue
+            totals['calls'] += 1
+            totals['input_tokens'] += attributes.get('gen_ai.usage.input_tokens', 0)
+            totals['output_tokens'] += attributes.get('gen_ai.usage.output_tokens', 0)
+            totals['cost_usd'] += attributes.get('ai.cost_usd', 0.0)
+        totals['cost_usd'] = round(totals['cost_usd'], 6)
+        return totals
+
+    def waterfall(self):
+        """Spans in start order with offsets from the root, for the debug response"""
+        origin = self.spans[0].start_ns if self.spans else 0
+        return {
+            'trace_id': self.trace_id,
+            'usage': self.usage(),
+            'spans': [
+                {
+                    'name': span.name,
+                    'span_id': span.span_id,
+                    'parent_id': span.parent_id,
+                    'offset_ms': round((span.start_ns - origin) / 1e6, 2),
+                    'duration_ms': round(span.duration_ms, 2),
+                    'attributes': span.attributes,
+                    **({'error': span.error} if span.error else {}),
+                }
+                for span in sorted(self.spans, key=lambda span: span.start_ns)
+            ],
+        }
+
+    def to_otlp(self):
+        return {'resourceSpans': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}]},
+            'scopeSpans': [{
+                'scope': {'name': __name__},
+                'spans': [span.to_otlp() for span in self.spans],
+            }],
+        }]}
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def current_span():
+    return _current.get() or NOOP_SPAN
+
+
+def current_trace():
+    span = _current.get()
+    return span.trace if span is not None else None
+
+
+@contextmanager
+def _activate(span):
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _current.reset(token)
+
+
+@contextmanager
+def start_trace(name, attributes=None):
+    """Open a new trace with a SERVER root span (used by TracingMiddleware)"""
+    with _activate(Span(Trace(), name, kind='SERVER', attributes=attributes)) as root:
+        yield root
+
+
+@contextmanager
+def span(name, attributes=None, kind='INTERNAL'):
+    """Time a block as a child of the current span; yields the span (a no-op outside a trace)"""
+    parent = _current.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+    with _activate(Span(parent.trace, name, parent.span_id, kind, attributes)) as child:
+        yield child
+
+
+def traced(name=None):
+    """Decorator form of ``span`` named after the function by default"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token) for providers that do not report usage"""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def record_usage(target, provider, model, input_tokens, output_tokens, estimated=False):
+    """Attach ``gen_ai`` usage and cost to a provider span and roll them up per endpoint"""
+    input_price, output_price = settings.TRACING['PRICING'].get(model, (0.0, 0.0))
+    cost = (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+    target.set_attributes({
+        'gen_ai.usage.input_tokens': input_tokens,
+        'gen_ai.usage.output_tokens': output_tokens,
+        'ai.tokens_estimated': estimated,
+        'ai.cost_usd': round(cost, 8),
+    })
+    trace = current_trace()
+    endpoint = trace.endpoint if trace else 'background'
+    ai_tokens.inc(input_tokens, endpoint=endpoint, provider=provider, direction='input')
+    ai_tokens.inc(output_tokens, endpoint=endpoint, provider=provider, direction='output')
+    ai_cost.inc(cost, endpoint=endpoint, provider=provider)
+
+
+def debug_requested(request):
+    """True if the caller asked for (and may see) the inline waterfall"""
+    value = request.headers.get(DEBUG_HEADER)
+    if not value:
+        return False
+    token = settings.TRACING['DEBUG_TOKEN']
+    if token:
+        return secrets.compare_digest(value, token)
+    return settings.DEBUG
+
+
+def should_export(forced=False):
+    rate = settings.TRACING['SAMPLE_RATE']
+    return bool(settings.TRACING['PATH']) and (forced or rate >= 1 or random.random() < rate)
+
+
+def export(trace):
+    """Append one trace as a line of OTLP/JSON to the sink file, rotating it past ``MAX_BYTES``"""
+    path = settings.TRACING['PATH']
+    line = json.dumps(trace.to_otlp(), separators=(',', ':'), default=str) + '\n'
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with _sink_lock:
+        with open(path, 'a', encoding='utf-8') as sink:
+            sink.write(line)
+            size = sink.tell()
+        if size > settings.TRACING['MAX_BYTES']:
+            # Keep one previous file, so the sink never holds much more than twice MAX_BYTES
+            os.replace(path, f'{path}.1')
@@ -1,5 +1,14 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from resumes.views import (
+    BatchScoreView, CertificationsView, CompareResumesView, EducationView, ParsedDataView, PersonalInfoView,
+    ProjectsView, ReprocessResumeView, ResumeVersionsView, SkillsView, WorkExperienceView,
+)
+
+from . import async_views, views
+
+# Under ASGI the provider-bound AI views are served by their native async versions
+ai_views = async_views if settings.AI_VIEWS_ASYNC else views
 
 app_name = 'api'
 
@@ -9,25 +18,37 @@ urlpatterns = [
     path('status/', views.api_status, name='api_status'),
     path('upload-resume/', views.upload_resume, name='upload_resume'),
     path('upload/', views.upload_resume, name='upload_resume_alt'),
-    path('analyze-resume/', views.analyze_resume, name='analyze_resume'),
+    path('analyze-resume/', ai_views.analyze_resume, name='analyze_resume'),
     path('search-jobs/', views.search_jobs, name='search_jobs'),
     
     # Resume endpoints (matching frontend expectations)
     path('resumes/upload/', views.upload_resume, name='resumes_upload'),
-    path('resumes/analyze/', views.analyze_resume, name='resumes_analyze'),
+    path('resumes/analyze/', ai_views.analyze_resume, name='resumes_analyze'),
+    path('resumes/compare/', CompareResumesView.as_view(), name='resumes_compare'),
+    path('resumes/batch-score/', BatchScoreView.as_view(), name='resumes_batch_score'),
+    path('resumes/versions/', ResumeVersionsView.as_view(), name='resumes_versions'),
+    path('resumes/<uuid:resume_id>/reprocess/', ReprocessResumeView.as_view(), name='resumes_reprocess'),
+    path('resumes/<uuid:resume_id>/parsed-data/', ParsedDataView.as_view(), name='resumes_parsed_data'),
+    path('resumes/<uuid:resume_id>/personal-info/', PersonalInfoView.as_view(), name='resumes_personal_info'),
+    path('resumes/<uuid:resume_id>/experience/', WorkExperienceView.as_view(), name='resumes_work_experience'),
+    path('resumes/<uuid:resume_id>/education/', EducationView.as_view(), name='resumes_education'),
+    path('resumes/<uuid:resume_id>/skills/', SkillsView.as_view(), name='resumes_skills'),
+    path('resumes/<uuid:resume_id>/projects/', ProjectsView.as_view(), name='resumes_projects'),
+    path('resumes/<uuid:resume_id>/certifications/', CertificationsView.as_view(), name='resumes_certifications'),
     
     # Jobs endpoints
     path('jobs/', views.jobs_list, name='jobs_list'),
-    path('jobs/<int:job_id>/', views.jobs_detail, name='jobs_detail'),
-    path('jobs/<int:job_id>/apply/', views.jobs_apply, name='jobs_apply'),
     path('jobs/applications/', views.jobs_applications, name='jobs_applications'),
+    path('jobs/bulk-apply/', views.jobs_bulk_apply, name='jobs_bulk_apply'),
+    path('jobs/<str:job_id>/', views.jobs_detail, name='jobs_detail'),
+    path('jobs/<str:job_id>/apply/', views.jobs_apply, name='jobs_apply'),
     
     # AI Service endpoints
-    path('ai/analyze-resume/', views.ai_analyze_resume, name='ai_analyze_resume'),
-    path('ai/match-jobs/', views.ai_match_jobs, name='ai_match_jobs'),
-    path('ai/career-advice/', views.ai_career_advice, name='ai_career_advice'),
-    path('ai/research-market/', views.ai_research_market, name='ai_research_market'),
-    path('ai/research-company/', views.ai_research_company, name='ai_research_company'),
+    path('ai/analyze-resume/', ai_views.ai_analyze_resume, name='ai_analyze_resume'),
+    path('ai/match-jobs/', ai_views.ai_match_jobs, name='ai_match_jobs'),
+    path('ai/career-advice/', ai_views.ai_career_advice, name='ai_career_advice'),
+    path('ai/research-market/', ai_views.ai_research_market, name='ai_research_market'),
+    path('ai/research-company/', ai_views.ai_research_company, name='ai_research_company'),
     path('ai/collect-linkedin-jobs/', views.ai_collect_linkedin_jobs, name='ai_collect_linkedin_jobs'),
     path('ai/status/', views.ai_status, name='ai_status'),
 ]
@@ -1,24 +1,171 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-import google.generativeai as genai
-from decouple import config
+from django.conf import settings
 import json
-import requests
-import uuid
-import random
-from datetime import datetime, timedelta
 import re
 
-# Configure Gemini API
-try:
-    genai.configure(api_key=config('GOOGLE_GEMINI_API_KEY', default=''))
-except:
-    pass  # Handle missing API key gracefully
+from . import applications, resume_versions
+from .ann import candidate_matrix
+from .catalogue import catalogue, stable_job_id
+from .facets import FacetedSearch
+from .http_cache import cached_response
+from .ingestion import collect
+from .market import market_stats
+from .matching import ResumeProfile, rank_jobs
+from .memory import MemoryBudget, MemoryBudgetExceeded
+from .metrics import resume_extraction_duration
+from .parsing import first_seen_date, parse_jobs_from_ai_response
+from .prompts import (
+    career_advice_prompt, company_research_prompt, experience_level_prompt, job_types_for, market_search_prompt,
+    market_summary_prompt, personal_info_prompt, recommendation_prompt, resume_analysis_prompt, resume_assessment_prompt,
+)
+from .profiles import PROFILE_HEADER, UserProfile, attach_profile, read_profile
+from .providers import ProviderError, gemini_configured, gemini_generate, perplexity_chat, perplexity_configured
+from .resume_store import parsed_resumes
+from .salary import salary_index, to_usd
+from .snapshot import load_snapshot
+from .tracing import span, traced
 
-# Configure Perplexity API
-PERPLEXITY_API_KEY = config('PERPLEXITY_API_KEY', default='')
-PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
+JOBS_PAGE_SIZE = 25
+MAX_MATCH_LIMIT = 50  # Local matches ai_match_jobs returns at most
+
+
+def match_limit(value):
+    """ai_match_jobs ``limit`` clamped to 1..MAX_MATCH_LIMIT, or None if it is not a number"""
+    try:
+        return min(max(int(value), 1), MAX_MATCH_LIMIT)
+    except (TypeError, ValueError):
+        return None
+
+
+def _profile_fingerprint(request):
+    """Identifies the profile jobs_list personalises for ('' when anonymous)"""
+    profile = read_profile(request)
+    return profile.fingerprint if profile else ''
+
+
+def _catalogue_version():
+    if catalogue.sync():
+        # A new publish comes with a new snapshot; serve its vectors from the mapping
+        load_snapshot(restore_catalogue=False)
+    return catalogue.published_token
+
+
+def _empty_personal_info():
+    return {
+        "name": "Not found",
+        "email": "Not found",
+        "phone": "Not found",
+        "skills": [],
+        "experience_years": "Fresh graduate",
+        "education": "Not found",
+        "location": "Not found"
+    }
+
+
+def personal_info_from_reply(extraction_text, resume_text):
+    """Personal details from the extraction reply, falling back to regexes over the resume"""
+    try:
+        # Try to extract JSON from response
+        json_match = re.search(r'\{.*\}', extraction_text, re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group())
+        
+        # Fallback manual extraction
+        extracted_info = _empty_personal_info()
+        
+        # Extract email
+        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+        emails = re.findall(email_pattern, resume_text)
+        if emails:
+            extracted_info["email"] = emails[0]
+        
+        # Extract phone
+        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+        phones = re.findall(phone_pattern, resume_text)
+        if phones:
+            extracted_info["phone"] = ''.join(phones[0]) if isinstance(phones[0], tuple) else phones[0]
+        
+        # Extract name (assume first line or first few words)
+        lines = resume_text.strip().split('\n')
+        for line in lines[:5]:  # Check first 5 lines
+            line = line.strip()
+            if line and len(line.split()) <= 4 and not any(char in line for char in '@+()0123456789'):
+                extracted_info["name"] = line
+                break
+        return extracted_info
+        
+    except Exception:
+        return _empty_personal_info()
+
+
+def resume_analysis_result(extracted_info, analysis_text, analysis_type, target_role, resume_text):
+    """ai_analyze_resume response data and the profile handed back to the client"""
+    skills = extracted_info.get('skills') if isinstance(extracted_info.get('skills'), list) else []
+    profile = UserProfile.build(
+        skills=[str(skill) for skill in skills],
+        experience_level=str(extracted_info.get('experience_years', '')),
+        location=str(extracted_info.get('location', '')),
+        target_role=target_role,
+        resume_text=resume_text,
+    )
+    data = {
+        'status': 'success',
+        'analysis': {
+            'personal_info': extracted_info,
+            'ai_analysis': analysis_text,
+            'analysis_type': analysis_type,
+            'target_role': target_role,
+            'score': 8.0,  # Will be calculated based on analysis
+            'recommendations': {
+                'suitable_roles': ['Junior Software Developer', 'Software Engineer Trainee', 'Associate Software Developer'],
+                'skill_gaps': [],
+                'next_steps': []
+            }
+        }
+    }
+    return data, profile
+
+
+def job_matches_result(resume_text, preferences, experience_level, job_types, job_text, limit, grounded):
+    """ai_match_jobs response data (with local catalogue matches) and the caller's profile"""
+    # Deterministic match scores against the known job catalogue, computed locally
+    location = preferences.get('location', '') if isinstance(preferences, dict) else ''
+    profile_role = ' '.join(job_types)
+    profile = ResumeProfile.from_resume(
+        resume_text,
+        experience_level=experience_level,
+        location=location,
+        target_role=profile_role,
+    )
+    if not len(catalogue):
+        generate_basic_fallback_jobs()
+    with span('local_ranking'):
+        local_matches = [
+            dict(job, match_score=match['match_score'], match_breakdown=match['contributions'])
+            for job, match in candidate_matrix(resume_text, profile_role).rank(profile, limit=limit)
+        ]
+    
+    user_profile = UserProfile.build(
+        location=location,
+        target_role=profile_role,
+        resume_text=resume_text,
+    )._replace(level=profile.level)
+    
+    data = {
+        'status': 'success',
+        'matches': {
+            'total_found': limit,
+            'experience_level': experience_level,
+            'recommended_job_types': job_types,
+            'jobs': job_text,
+            'local_matches': local_matches,
+            'source': 'perplexity+gemini' if grounded else 'gemini',
+            'privacy_note': 'All processing done on server, no resume data stored permanently'
+        }
+    }
+    return data, user_profile
 
 @api_view(['GET'])
 def api_status(request):
@@ -42,44 +189,58 @@ def upload_resume(request):
         file = request.FILES['resume']
         file_name = file.name.lower()
         
-        # Extract text based on file type - all processing done in memory
-        text_content = ""
+        if file.size > settings.MEMORY_BUDGET['UPLOAD_MAX_BYTES']:
+            return Response({
+                'status': 'error',
+                'message': f"Resume is too large (limit {settings.MEMORY_BUDGET['UPLOAD_MAX_BYTES'] // (1024 * 1024)} MB)"
+            }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        
+        # Extract text based on file type - all processing done in memory.
+        # The upload is read in place (no extra copy) and text is joined once.
+        parts = []
+        file_type = file_name.rsplit('.', 1)[-1] if file_name.endswith(('.pdf', '.doc', '.docx')) else 'other'
         
         try:
-            if file_name.endswith('.pdf'):
-                # Handle PDF files - process in memory only
-                import PyPDF2
-                import io
+            with resume_extraction_duration.time(file_type=file_type), MemoryBudget('extraction') as budget:
+                if file_name.endswith('.pdf'):
+                    # Handle PDF files - process in memory only
+                    import PyPDF2
                 
-                pdf_file = io.BytesIO(file.read())
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
+                    pdf_reader = PyPDF2.PdfReader(file)
                 
-                for page in pdf_reader.pages:
-                    text_content += page.extract_text() + "\n"
+                    for page in pdf_reader.pages:
+                        parts.append(page.extract_text())
+                        budget.check()
                     
-                # Clear memory
-                pdf_file.close()
-                    
-            elif file_name.endswith(('.doc', '.docx')):
-                # Handle Word documents - process in memory only
-                import docx
-                import io
-                
-                doc_file = io.BytesIO(file.read())
-                doc = docx.Document(doc_file)
+                elif file_name.endswith(('.doc', '.docx')):
+                    # Handle Word documents - process in memory only
+                    import docx
                 
-                for paragraph in doc.paragraphs:
-                    text_content += paragraph.text + "\n"
+                    doc = docx.Document(file)
                 
-                # Clear memory
-                doc_file.close()
+                    for paragraph in doc.paragraphs:
+                        parts.append(paragraph.text)
+                        budget.check()
                     
-            else:
+                else:
+                    return Response({
+                        'status': 'error',
+                        'message': 'Unsupported file format. Please upload PDF, DOC, or DOCX files.'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+            
+            text_content = "\n".join(parts)
+                
+        except MemoryBudgetExceeded as budget_error:
+            if budget_error.retryable:
+                # Concurrent requests shared the traced memory; this resume may well fit on its own
                 return Response({
                     'status': 'error',
-                    'message': 'Unsupported file format. Please upload PDF, DOC, or DOCX files.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-                
+                    'message': 'The server is busy processing other resumes; please retry shortly'
+                }, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '5'})
+            return Response({
+                'status': 'error',
+                'message': f'Resume is too complex to process: {budget_error}'
+            }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
         except Exception as extraction_error:
             return Response({
                 'status': 'error',
@@ -92,10 +253,18 @@ def upload_resume(request):
                 'message': 'No text content found in the uploaded file'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Note: File is processed in memory only, not saved to disk
+        # Note: File is processed in memory only, not saved to disk. The
+        # section parse is cached so /api/resumes/<resume_id>/... can serve it,
+        # and kept as the applicant's next version for diffs and reprocess
+        # until RESUME_STORE['VERSIONS_MAX_AGE'] after their last upload.
+        resume_id, parsed = parsed_resumes.parse(text_content)
+        version, created = resume_versions.record(applications.applicant_key(request), resume_id, parsed)
         return Response({
             'status': 'success',
             'message': f'Resume {file.name} processed successfully',
+            'resume_id': resume_id,
+            'version': version.version,
+            'changed_sections': version.changes.get('changed', []) if created else [],
             'filename': file.name,
             'size': file.size,
             'text_content': text_content.strip(),
@@ -103,7 +272,13 @@ def upload_resume(request):
             'privacy_info': {
                 'file_saved': False,
                 'processing': 'in-memory only',
-                'data_retention': 'processed temporarily for analysis, not stored permanently',
+                'data_retention': ('the file and its raw text are not stored; the parsed sections (including '
+                                   'contact details) are kept as a resume version for comparison and '
+                                   'reprocessing, and deleted once you have not uploaded for '
+                                   'parsed_versions_max_age_seconds'),
+                'sections_cached_seconds': settings.RESUME_STORE['TIMEOUT'],
+                'parsed_versions_kept': settings.RESUME_STORE['VERSIONS_KEPT'],
+                'parsed_versions_max_age_seconds': settings.RESUME_STORE['VERSIONS_MAX_AGE'],
                 'security': 'All text extraction done locally on server'
             }
         })
@@ -126,25 +301,12 @@ def analyze_resume(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Use Gemini to analyze the resume
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        prompt = f"""
-        Please analyze this resume and provide:
-        1. Key skills identified
-        2. Experience level
-        3. Suggested job roles
-        4. Areas for improvement
-        
-        Resume text: {resume_text}
-        
-        Please respond in JSON format.
-        """
-        
-        response = model.generate_content(prompt)
+        response_text = gemini_generate(resume_analysis_prompt(resume_text))
         
         return Response({
             'status': 'success',
             'message': 'Resume analyzed successfully',
-            'analysis': response.text
+            'analysis': response_text
         })
         
     except Exception as e:
@@ -154,6 +316,7 @@ def analyze_resume(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
+@cached_response(timeout=300)
 def search_jobs(request):
     """Simple job search endpoint"""
     query = request.GET.get('q', '')
@@ -204,117 +367,13 @@ def ai_analyze_resume(request):
                 'message': 'No resume text provided'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # First, extract personal information
-        extraction_prompt = f"""
-        Extract the following information from this resume text. Return ONLY a JSON object with these exact fields:
-        
-        {{
-            "name": "extracted name or 'Not found'",
-            "email": "extracted email or 'Not found'", 
-            "phone": "extracted phone or 'Not found'",
-            "skills": ["skill1", "skill2", "skill3"],
-            "experience_years": "number of years or 'Fresh graduate'",
-            "education": "highest degree",
-            "location": "city/state or 'Not found'"
-        }}
-        
-        Resume text:
-        {resume_text}
-        """
-        
-        extraction_response = model.generate_content(extraction_prompt)
-        
-        # Parse extracted info (handle potential JSON parsing issues)
-        try:
-            import re
-            import json
-            
-            # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', extraction_response.text, re.DOTALL)
-            if json_match:
-                extracted_info = json.loads(json_match.group())
-            else:
-                # Fallback manual extraction
-                extracted_info = {
-                    "name": "Not found",
-                    "email": "Not found", 
-                    "phone": "Not found",
-                    "skills": [],
-                    "experience_years": "Fresh graduate",
-                    "education": "Not found",
-                    "location": "Not found"
-                }
-                
-                # Simple regex patterns for extraction
-                import re
-                
-                # Extract email
-                email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                emails = re.findall(email_pattern, resume_text)
-                if emails:
-                    extracted_info["email"] = emails[0]
-                
-                # Extract phone
-                phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-                phones = re.findall(phone_pattern, resume_text)
-                if phones:
-                    extracted_info["phone"] = ''.join(phones[0]) if isinstance(phones[0], tuple) else phones[0]
-                
-                # Extract name (assume first line or first few words)
-                lines = resume_text.strip().split('\n')
-                for line in lines[:5]:  # Check first 5 lines
-                    line = line.strip()
-                    if line and len(line.split()) <= 4 and not any(char in line for char in '@+()0123456789'):
-                        extracted_info["name"] = line
-                        break
-                        
-        except Exception as parse_error:
-            extracted_info = {
-                "name": "Not found",
-                "email": "Not found", 
-                "phone": "Not found",
-                "skills": [],
-                "experience_years": "Fresh graduate",
-                "education": "Not found",
-                "location": "Not found"
-            }
+        # First, extract personal information, then do comprehensive analysis
+        extraction_text = gemini_generate(personal_info_prompt(resume_text))
+        extracted_info = personal_info_from_reply(extraction_text, resume_text)
+        analysis_text = gemini_generate(resume_assessment_prompt(resume_text, target_role))
         
-        # Now do comprehensive analysis
-        analysis_prompt = f"""
-        Analyze this resume comprehensively. The person is a fresh graduate from 2025 batch.
-        
-        Resume: {resume_text}
-        Target role: {target_role}
-        
-        Provide detailed analysis including:
-        1. Skill assessment (rate each skill 1-10)
-        2. Experience evaluation (focus on projects, internships for fresh graduate)
-        3. Strengths and improvement areas
-        4. Career recommendations suitable for fresh graduate
-        5. Job match score for entry-level positions (1-10)
-        
-        Return detailed analysis in text format, not JSON.
-        """
-        
-        analysis_response = model.generate_content(analysis_prompt)
-        
-        return Response({
-            'status': 'success',
-            'analysis': {
-                'personal_info': extracted_info,
-                'ai_analysis': analysis_response.text,
-                'analysis_type': analysis_type,
-                'target_role': target_role,
-                'score': 8.0,  # Will be calculated based on analysis
-                'recommendations': {
-                    'suitable_roles': ['Junior Software Developer', 'Software Engineer Trainee', 'Associate Software Developer'],
-                    'skill_gaps': [],
-                    'next_steps': []
-                }
-            }
-        })
+        data, profile = resume_analysis_result(extracted_info, analysis_text, analysis_type, target_role, resume_text)
+        return attach_profile(Response(data), profile)
         
     except Exception as e:
         return Response({
@@ -329,152 +388,41 @@ def ai_match_jobs(request):
         resume_text = request.data.get('resume_text', '')
         preferences = request.data.get('preferences', {})
         use_perplexity = request.data.get('use_perplexity', True)
-        limit = request.data.get('limit', 10)
-        
-        # Analyze experience level from resume
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # First determine experience level
-        experience_prompt = f"""
-        Analyze this resume and determine the candidate's experience level:
-        
-        Resume: {resume_text}
-        
-        Return ONLY one of these: "Fresh Graduate", "0-2 years", "2-5 years", "5+ years"
-        """
+        limit = match_limit(request.data.get('limit', 10))
+        if limit is None:
+            return Response({
+                'status': 'error',
+                'message': 'limit must be a number'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        exp_response = model.generate_content(experience_prompt)
-        experience_level = exp_response.text.strip()
+        # First determine experience level from resume
+        with span('classify_experience'):
+            experience_level = gemini_generate(experience_level_prompt(resume_text)).strip()
         
         # Determine appropriate job types based on experience
-        if "Fresh Graduate" in experience_level or "2025" in resume_text:
-            job_types = [
-                "Software Engineer Trainee",
-                "Junior Software Developer", 
-                "Associate Software Engineer",
-                "Graduate Trainee",
-                "Software Development Intern",
-                "Junior Frontend Developer",
-                "Junior Backend Developer",
-                "Entry Level Software Engineer"
-            ]
-            experience_filter = "entry-level, trainee, junior, graduate, fresher"
-        elif "0-2 years" in experience_level:
-            job_types = [
-                "Software Developer",
-                "Junior Software Engineer",
-                "Software Engineer I",
-                "Frontend Developer",
-                "Backend Developer"
-            ]
-            experience_filter = "junior, 0-2 years experience"
-        else:
-            job_types = [
-                "Software Engineer",
-                "Senior Software Developer", 
-                "Full Stack Developer",
-                "Software Engineer II"
-            ]
-            experience_filter = "2+ years experience"
+        job_types, experience_filter = job_types_for(experience_level, resume_text)
         
         # Try Perplexity for real job search if API is available
-        perplexity_api_key = config('PERPLEXITY_API_KEY', default='')
         jobs_from_perplexity = []
         
-        if use_perplexity and perplexity_api_key and perplexity_api_key != 'your-perplexity-api-key-here':
+        if use_perplexity and perplexity_configured():
             try:
-                perplexity_url = "https://api.perplexity.ai/chat/completions"
-                headers = {
-                    "Authorization": f"Bearer {perplexity_api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                search_prompt = f"""
-                Find current {experience_filter} software engineering jobs in India for fresh graduates from 2025 batch. 
-                Search for positions like: {', '.join(job_types[:4])}
-                
-                Provide 10 real job listings with:
-                - Company name
-                - Job title  
-                - Location
-                - Salary range (in INR)
-                - Key requirements
-                - Application link if available
-                
-                Focus on entry-level positions suitable for fresh graduates.
-                """
-                
-                data = {
-                    "model": "llama-3.1-sonar-small-128k-online",
-                    "messages": [{"role": "user", "content": search_prompt}]
-                }
-                
-                response = requests.post(perplexity_url, headers=headers, json=data, timeout=30)
-                if response.status_code == 200:
-                    perplexity_result = response.json()
-                    jobs_content = perplexity_result.get('choices', [{}])[0].get('message', {}).get('content', '')
-                    
-                    # Parse jobs from Perplexity response
-                    if jobs_content:
-                        jobs_from_perplexity = jobs_content
-                        
-            except Exception as perplexity_error:
+                with span('market_search'):
+                    jobs_from_perplexity = perplexity_chat(market_search_prompt(experience_filter, job_types), timeout=30)
+            except ProviderError as perplexity_error:
                 print(f"Perplexity API error: {perplexity_error}")
         
         # Generate job recommendations using Gemini (with Perplexity context if available)
-        if jobs_from_perplexity:
-            job_prompt = f"""
-            Based on this resume and real job market data, provide {limit} accurate job recommendations:
-            
-            Resume: {resume_text}
-            Experience Level: {experience_level}
-            Real Jobs Available: {jobs_from_perplexity}
-            
-            Create realistic job recommendations focusing on {experience_filter} positions.
-            For each job provide:
-            1. Job title (appropriate for experience level)
-            2. Company name
-            3. Location
-            4. Salary range (realistic for experience level in INR)
-            5. Match percentage (realistic based on skills)
-            6. Key requirements
-            7. Why it's a good match
-            
-            Return in structured format.
-            """
-        else:
-            job_prompt = f"""
-            Based on this resume, suggest {limit} realistic job opportunities for {experience_level}:
-            
-            Resume: {resume_text}
-            
-            Recommended job types: {', '.join(job_types)}
-            
-            For each job provide:
-            1. Job title (appropriate for fresh graduate/entry level)
-            2. Company type
-            3. Location (Indian cities)
-            4. Salary range (realistic for fresh graduates: 3-8 LPA)
-            5. Match percentage based on skills
-            6. Required skills
-            7. Growth prospects
-            
-            Focus on entry-level positions that match the candidate's skills and experience level.
-            """
-        
-        job_response = model.generate_content(job_prompt)
+        job_prompt = recommendation_prompt(
+            resume_text, experience_level, limit, experience_filter, job_types, jobs_from_perplexity
+        )
+        with span('generate_recommendations', {'ai.grounded': bool(jobs_from_perplexity)}):
+            job_text = gemini_generate(job_prompt)
         
-        return Response({
-            'status': 'success',
-            'matches': {
-                'total_found': limit,
-                'experience_level': experience_level,
-                'recommended_job_types': job_types,
-                'jobs': job_response.text,
-                'source': 'perplexity+gemini' if jobs_from_perplexity else 'gemini',
-                'privacy_note': 'All processing done on server, no resume data stored permanently'
-            }
-        })
+        data, user_profile = job_matches_result(
+            resume_text, preferences, experience_level, job_types, job_text, limit, bool(jobs_from_perplexity)
+        )
+        return attach_profile(Response(data), user_profile)
         
     except Exception as e:
         return Response({
@@ -490,27 +438,11 @@ def ai_career_advice(request):
         career_goals = request.data.get('career_goals', '')
         current_challenges = request.data.get('current_challenges', '')
         
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        prompt = f"""
-        Provide career advice based on:
-        Resume: {resume_text}
-        Career Goals: {career_goals}
-        Challenges: {current_challenges}
-        
-        Include:
-        1. Career path recommendations
-        2. Skill development suggestions
-        3. Industry insights
-        4. Next steps
-        
-        Return in JSON format.
-        """
-        
-        response = model.generate_content(prompt)
+        response_text = gemini_generate(career_advice_prompt(resume_text, career_goals, current_challenges))
         
         return Response({
             'status': 'success',
-            'advice': response.text
+            'advice': response_text
         })
         
     except Exception as e:
@@ -521,33 +453,37 @@ def ai_career_advice(request):
 
 @api_view(['POST'])
 def ai_research_market(request):
-    """AI Market Research endpoint"""
+    """AI Market Research endpoint, answered from catalogue aggregates"""
     try:
         industry = request.data.get('industry', '')
         location = request.data.get('location', '')
         role = request.data.get('role', '')
+        # Form posts send "false" as a string, which must not trigger an LLM call
+        narrative = str(request.data.get('narrative', '')).strip().lower() in ('true', '1', 'yes', 'on')
         
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        prompt = f"""
-        Research the job market for:
-        Industry: {industry}
-        Location: {location}
-        Role: {role}
-        
-        Provide:
-        1. Market trends
-        2. Salary ranges
-        3. In-demand skills
-        4. Growth prospects
+        bucket, stats = market_stats.lookup(role=role, location=location, industry=industry)
+        if stats is None:
+            return Response({
+                'status': 'error',
+                'message': 'No market data available yet; the job catalogue is empty'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         
-        Return in JSON format.
-        """
+        research = {
+            'query': {'industry': industry, 'location': location, 'role': role},
+            'matched_bucket': dict(zip(('role', 'location', 'industry'), bucket)),
+            **stats
+        }
         
-        response = model.generate_content(prompt)
+        # The LLM is only used to turn the numbers into prose, and only on request
+        summary = None
+        if narrative:
+            summary = gemini_generate(market_summary_prompt(industry, location, role, stats))
         
         return Response({
             'status': 'success',
-            'research': response.text
+            'source': 'catalogue',
+            'research': research,
+            'narrative': summary
         })
         
     except Exception as e:
@@ -563,26 +499,11 @@ def ai_research_company(request):
         company_name = request.data.get('company_name', '')
         detailed = request.data.get('detailed', False)
         
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        prompt = f"""
-        Research company: {company_name}
-        Detailed analysis: {detailed}
-        
-        Provide:
-        1. Company overview
-        2. Culture and values
-        3. Recent news
-        4. Career opportunities
-        5. Interview tips
-        
-        Return in JSON format.
-        """
-        
-        response = model.generate_content(prompt)
+        response_text = gemini_generate(company_research_prompt(company_name, detailed))
         
         return Response({
             'status': 'success',
-            'company_research': response.text
+            'company_research': response_text
         })
         
     except Exception as e:
@@ -594,71 +515,50 @@ def ai_research_company(request):
 @api_view(['POST'])
 def ai_collect_linkedin_jobs(request):
     """AI LinkedIn Job Collection endpoint"""
+    max_limit = settings.JOB_COLLECTION['MAX_LIMIT']
     try:
-        queries = request.data.get('queries', [])
-        locations = request.data.get('locations', [])
-        limit = request.data.get('limit', 50)
-        
-        # Use Perplexity API if available
-        perplexity_api_key = config('PERPLEXITY_API_KEY', default='')
-        
-        if perplexity_api_key and perplexity_api_key != 'your-perplexity-api-key-here':
-            try:
-                # Call Perplexity API for job search
-                perplexity_url = "https://api.perplexity.ai/chat/completions"
-                headers = {
-                    "Authorization": f"Bearer {perplexity_api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                prompt = f"""
-                Find LinkedIn job postings for:
-                Queries: {', '.join(queries)}
-                Locations: {', '.join(locations)}
-                Limit: {limit}
-                
-                Return job titles, companies, locations, and LinkedIn URLs.
-                """
-                
-                data = {
-                    "model": "llama-3.1-sonar-small-128k-online",
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-                
-                response = requests.post(perplexity_url, headers=headers, json=data, timeout=30)
-                perplexity_result = response.json()
-                
-                return Response({
-                    'status': 'success',
-                    'source': 'perplexity',
-                    'jobs': perplexity_result.get('choices', [{}])[0].get('message', {}).get('content', '')
-                })
-                
-            except Exception as perplexity_error:
-                # Fall back to Gemini if Perplexity fails
-                pass
-        
-        # Fallback to Gemini
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        prompt = f"""
-        Help find LinkedIn job opportunities for:
-        Search queries: {', '.join(queries)}
-        Locations: {', '.join(locations)}
-        Limit: {limit}
-        
-        Suggest job search strategies and provide sample job listings that might be found.
-        Return in JSON format.
-        """
-        
-        response = model.generate_content(prompt)
-        
+        limit = int(request.data.get('limit', 50))
+    except (TypeError, ValueError):
         return Response({
-            'status': 'success',
-            'source': 'gemini',
-            'jobs': response.text,
-            'note': 'This is AI-generated job search guidance. For actual LinkedIn jobs, integration with LinkedIn API would be required.'
-        })
-        
+            'status': 'error',
+            'message': 'limit must be a number'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= limit <= max_limit:
+        return Response({
+            'status': 'error',
+            'message': f'limit must be between 1 and {max_limit}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        queries, locations = request.data.get('queries', []), request.data.get('locations', [])
+        # A single query or location may be sent on its own instead of as a list
+        queries = [queries] if isinstance(queries, str) else queries
+        locations = [locations] if isinstance(locations, str) else locations
+        if not isinstance(queries, list) or not isinstance(locations, list):
+            return Response({
+                'status': 'error',
+                'message': 'queries and locations must be strings or lists of strings'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        queries = [str(q).strip() for q in queries if str(q).strip()]
+        locations = [str(l).strip() for l in locations if str(l).strip()] or ['Remote']
+        if not queries:
+            return Response({
+                'status': 'error',
+                'message': 'At least one query is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        jobs, stats = collect(queries, locations, limit=limit)
+        catalogue.add(jobs)
+
+        return Response({
+            'status': 'success' if stats['completed'] else 'error',
+            'source': 'ai_fanout',
+            'jobs': jobs,
+            'total_collected': len(jobs),
+            'partial': bool(stats['timed_out'] or stats['failed'] or stats['dropped']),
+            'stats': stats,
+        }, status=status.HTTP_200_OK if stats['completed'] else status.HTTP_502_BAD_GATEWAY)
+
     except Exception as e:
         return Response({
             'status': 'error',
@@ -666,10 +566,11 @@ def ai_collect_linkedin_jobs(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
+@cached_response(timeout=60)
 def ai_status(request):
     """AI Services status endpoint"""
-    gemini_status = 'available' if config('GOOGLE_GEMINI_API_KEY', default='') else 'not configured'
-    perplexity_status = 'available' if config('PERPLEXITY_API_KEY', default='') != 'your-perplexity-api-key-here' else 'not configured'
+    gemini_status = 'available' if gemini_configured() else 'not configured'
+    perplexity_status = 'available' if perplexity_configured() else 'not configured'
     
     return Response({
         'status': 'success',
@@ -689,26 +590,51 @@ def ai_status(request):
 
 # Jobs API Endpoints
 @api_view(['GET'])
+@cached_response(timeout=300, fingerprint=_profile_fingerprint, version=_catalogue_version,
+                 vary=('Accept', PROFILE_HEADER))
 def jobs_list(request):
     """Get list of jobs with AI-powered job generation and LinkedIn scraping"""
     search = request.GET.get('search', '')
     location = request.GET.get('location', '')
     job_type = request.GET.get('job_type', '')
     experience_level = request.GET.get('experience_level', '')
+    min_salary = request.GET.get('salary_min', '')
+    sort = request.GET.get('sort', '')
     page = request.GET.get('page', 1)
     
     try:
-        # Get user's most recent resume analysis for personalized job matching
-        user_profile = None
-        try:
-            # Check session for resume data (if available)
-            if hasattr(request, 'session') and 'last_resume_analysis' in request.session:
-                user_profile = request.session['last_resume_analysis']
-        except:
-            pass
+        min_salary = float(min_salary) if min_salary else None
+    except ValueError:
+        return Response({
+            'status': 'error',
+            'message': 'salary_min must be a number'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        page = int(page)
+        if page < 1:
+            raise ValueError
+    except ValueError:
+        return Response({
+            'status': 'error',
+            'message': 'page must be a positive integer'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    start, end = (page - 1) * JOBS_PAGE_SIZE, page * JOBS_PAGE_SIZE
+    
+    try:
+        # Personalise from the signed profile token (no session or database read)
+        profile = read_profile(request)
+        user_profile = profile.as_analysis() if profile else None
+        
+        # Prefer the pre-ingested catalogue; only generate live when it is empty
+        ingested = []
+        if settings.JOB_INGESTION['SERVE_FROM_CATALOGUE']:
+            with span('catalogue_sync'):
+                catalogue.sync()
+                ingested = catalogue.ingested()
         
         # Generate AI-powered job listings using Perplexity API
-        jobs = ai_generate_jobs(
+        jobs = ingested or ai_generate_jobs(
             search_query=search,
             location=location,
             job_type=job_type,
@@ -716,39 +642,51 @@ def jobs_list(request):
             user_profile=user_profile
         )
         
-        # Apply additional filters if needed
-        filtered_jobs = jobs
-        
-        if search:
-            filtered_jobs = [job for job in filtered_jobs 
-                            if search.lower() in job.get('title', '').lower() 
-                            or search.lower() in job.get('company', '').lower()
-                            or any(search.lower() in req.lower() for req in job.get('skills_required', []))]
+        # Salary floor uses the normalised annual ranges (compared in USD)
+        salary_filter = None
+        if min_salary is not None:
+            threshold = to_usd(min_salary, request.GET.get('salary_currency', 'USD').upper())
+            qualifying = set(salary_index.ids_with_min_at_least(threshold))
+            salary_filter = lambda job: job['id'] in qualifying
         
-        if location:
-            filtered_jobs = [job for job in filtered_jobs 
-                            if location.lower() in job.get('location', '').lower()]
+        # Filter and count facet values for the UI in a single pass
+        filters = {'location': location, 'job_type': job_type, 'experience_level': experience_level}
+        with span('faceted_search', {'jobs.candidates': len(jobs)}):
+            filtered_jobs, facets = FacetedSearch(jobs).search(search, filters, predicate=salary_filter)
         
-        if job_type:
-            filtered_jobs = [job for job in filtered_jobs 
-                            if job_type.lower() == job.get('job_type', '').lower()]
-        
-        if experience_level:
-            filtered_jobs = [job for job in filtered_jobs 
-                            if experience_level.lower() == job.get('experience_level', '').lower()]
-        
-        # Ensure we have at least some jobs to return
-        if not filtered_jobs:
+        # Ensure we have at least some jobs to return (live generation only)
+        if not filtered_jobs and not ingested:
             # Fallback to basic job generation without strict filters
-            filtered_jobs = ai_generate_jobs(
+            filtered_jobs, facets = FacetedSearch(ai_generate_jobs(
                 search_query="",
                 location="",
                 job_type="",
                 experience_level="Entry Level",
                 user_profile=user_profile
-            )
+            )).search()
+        
+        count = len(filtered_jobs)
+        if sort in ('salary', '-salary'):
+            # Walk the salary index in order up to this page; jobs without a salary go last either way
+            unsorted = {job['id']: job for job in filtered_jobs}
+            filtered_jobs = []
+            for job_id in salary_index.sorted_ids(descending=sort == '-salary'):
+                job = unsorted.pop(job_id, None)
+                if job is not None:
+                    filtered_jobs.append(job)
+                    if len(filtered_jobs) == end:
+                        break
+            filtered_jobs.extend(unsorted.values())
+        elif profile:
+            # Rank by local match score when we know who is asking; only the pages up to this one are ordered
+            with span('rank_jobs'):
+                filtered_jobs = rank_jobs(profile.resume_profile(), filtered_jobs, limit=end)
         
-        return Response(filtered_jobs[:25])  # Return up to 25 jobs
+        return Response({
+            'results': [dict(job) for job in filtered_jobs[start:end]],
+            'count': count,
+            'facets': facets
+        })
         
     except Exception as e:
         print(f"Error generating jobs: {str(e)}")
@@ -763,6 +701,7 @@ def jobs_list(request):
                 'experience_level': 'Entry Level',
                 'salary_min': 70000,
                 'salary_max': 90000,
+                'salary_currency': 'USD',
                 'description': 'Entry-level software developer position with growth opportunities.',
                 'skills_required': ['Python', 'JavaScript', 'Git'],
                 'posted_date': '2025-01-15',
@@ -771,9 +710,14 @@ def jobs_list(request):
                 'apply_url': 'https://careers.company.com/apply'
             }
         ]
-        return Response(fallback_jobs)
+        return Response({
+            'results': fallback_jobs,
+            'count': len(fallback_jobs),
+            'facets': FacetedSearch(fallback_jobs).search().facets
+        }, headers={'Cache-Control': 'no-store'})
 
 
+@traced()
 def ai_generate_jobs(search_query="", location="", job_type="", experience_level="", user_profile=None):
     """Generate personalized job listings using AI and real job market data"""
     try:
@@ -822,45 +766,25 @@ def ai_generate_jobs(search_query="", location="", job_type="", experience_level
         Return the data in JSON format as an array of job objects."""
         
         # Make API call to Perplexity
-        headers = {
-            "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "model": "llama-3.1-sonar-small-128k-online",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a job search assistant that finds real, current job listings from the web. Always return valid JSON data with actual job opportunities."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "max_tokens": 4000,
-            "temperature": 0.3,
-            "return_citations": True
-        }
-        
-        response = requests.post(PERPLEXITY_API_URL, json=data, headers=headers)
+        try:
+            content = perplexity_chat(
+                prompt,
+                system="You are a job search assistant that finds real, current job listings from the web. Always return valid JSON data with actual job opportunities.",
+                max_tokens=4000,
+                temperature=0.3,
+                return_citations=True,
+            )
+        except ProviderError as e:
+            print(f"Perplexity API error: {e}")
+            return generate_fallback_jobs_with_gemini(search_query, location, job_type, experience_context, user_profile)
         
-        if response.status_code == 200:
-            result = response.json()
-            content = result['choices'][0]['message']['content']
-            
-            # Try to extract JSON from the response
-            jobs = parse_jobs_from_ai_response(content)
-            
-            if jobs and len(jobs) > 0:
-                return jobs
-            else:
-                # Generate fallback jobs using Gemini if Perplexity doesn't return structured data
-                return generate_fallback_jobs_with_gemini(search_query, location, job_type, experience_context, user_profile)
+        # Try to extract JSON from the response
+        jobs = parse_jobs_from_ai_response(content)
         
+        if jobs and len(jobs) > 0:
+            return jobs
         else:
-            print(f"Perplexity API error: {response.status_code}")
+            # Generate fallback jobs using Gemini if Perplexity doesn't return structured data
             return generate_fallback_jobs_with_gemini(search_query, location, job_type, experience_context, user_profile)
             
     except Exception as e:
@@ -868,60 +792,7 @@ def ai_generate_jobs(search_query="", location="", job_type="", experience_level
         return generate_fallback_jobs_with_gemini(search_query, location, job_type, experience_context, user_profile)
 
 
-def parse_jobs_from_ai_response(content):
-    """Parse job listings from AI response content"""
-    try:
-        import json
-        import uuid
-        from datetime import datetime, timedelta
-        import re
-        
-        # Try to find JSON in the response
-        json_match = re.search(r'\[.*\]', content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            jobs_data = json.loads(json_str)
-        else:
-            # Try to parse the entire content as JSON
-            jobs_data = json.loads(content)
-        
-        formatted_jobs = []
-        for job in jobs_data:
-            if isinstance(job, dict):
-                # Generate unique ID
-                job_id = str(uuid.uuid4())
-                
-                # Format the job data to match frontend expectations
-                formatted_job = {
-                    'id': job_id,
-                    'title': job.get('title', job.get('job_title', 'Software Developer')),
-                    'company': job.get('company', job.get('company_name', 'Tech Company')),
-                    'location': job.get('location', 'Remote'),
-                    'job_type': job.get('job_type', job.get('type', 'Full-time')),
-                    'experience_level': job.get('experience_level', job.get('level', 'Entry Level')),
-                    'salary_min': job.get('salary_min', job.get('min_salary', 60000)),
-                    'salary_max': job.get('salary_max', job.get('max_salary', 90000)),
-                    'description': job.get('description', job.get('job_description', 'Great opportunity to grow your career.')),
-                    'skills_required': job.get('skills_required', job.get('required_skills', job.get('skills', ['Programming']))),
-                    'posted_date': job.get('posted_date', (datetime.now() - timedelta(days=random.randint(1, 7))).strftime('%Y-%m-%d')),
-                    'source': 'linkedin',
-                    'is_remote': 'remote' in job.get('location', '').lower() or job.get('job_type', '').lower() == 'remote',
-                    'apply_url': job.get('apply_url', job.get('application_url', job.get('url', f'https://linkedin.com/jobs/view/{job_id}')))
-                }
-                
-                # Ensure skills_required is a list
-                if isinstance(formatted_job['skills_required'], str):
-                    formatted_job['skills_required'] = [s.strip() for s in formatted_job['skills_required'].split(',')]
-                
-                formatted_jobs.append(formatted_job)
-        
-        return formatted_jobs[:25]  # Return up to 25 jobs
-        
-    except Exception as e:
-        print(f"Error parsing jobs from AI response: {str(e)}")
-        return []
-
-
+@traced()
 def generate_fallback_jobs_with_gemini(search_query, location, job_type, experience_level, user_profile):
     """Generate job listings using Gemini as fallback"""
     try:
@@ -970,11 +841,10 @@ def generate_fallback_jobs_with_gemini(search_query, location, job_type, experie
           }}
         ]"""
         
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content(prompt)
+        response_text = gemini_generate(prompt)
         
-        if response and response.text:
-            jobs = parse_jobs_from_ai_response(response.text)
+        if response_text:
+            jobs = parse_jobs_from_ai_response(response_text)
             if jobs:
                 return jobs
         
@@ -986,11 +856,9 @@ def generate_fallback_jobs_with_gemini(search_query, location, job_type, experie
         return generate_basic_fallback_jobs(experience_level)
 
 
+@traced()
 def generate_basic_fallback_jobs(experience_level="Entry Level"):
     """Generate basic fallback jobs when AI services fail"""
-    import uuid
-    from datetime import datetime, timedelta
-    
     basic_jobs = [
         {
             'title': 'Software Developer',
@@ -1237,17 +1105,27 @@ def generate_basic_fallback_jobs(experience_level="Entry Level"):
     # Format jobs with required fields
     formatted_jobs = []
     for job in basic_jobs:
-        job['id'] = str(uuid.uuid4())
-        job['posted_date'] = (datetime.now() - timedelta(days=random.randint(1, 5))).strftime('%Y-%m-%d')
+        job['id'] = stable_job_id(job['company'], job['title'], job['location'], job['apply_url'])
+        job['posted_date'] = first_seen_date(job['id'], spread_days=5)
         job['source'] = 'api'
         job['is_remote'] = 'remote' in job['location'].lower()
+        job['salary_currency'] = 'USD'
         formatted_jobs.append(job)
     
-    return formatted_jobs
+    return catalogue.add(formatted_jobs)
 
 @api_view(['GET'])
+@cached_response(timeout=600, version=_catalogue_version)
 def jobs_detail(request, job_id):
     """Get specific job details"""
+    # Jobs served by jobs_list are addressable by their stable ID
+    job = catalogue.get(job_id)
+    if job:
+        return Response({
+            'status': 'success',
+            'job': dict(job)
+        })
+    
     # Sample job detail - in a real app, this would come from a database
     sample_jobs = {
         'a1b2c3d4-e5f6-7890-abcd-ef1234567890': {
@@ -1298,52 +1176,101 @@ Benefits:
 @api_view(['POST'])
 def jobs_apply(request, job_id):
     """Apply to a specific job"""
-    cover_letter = request.data.get('cover_letter', '')
-    resume_id = request.data.get('resume_id', '')
+    idempotency_key = request.headers.get('Idempotency-Key') or request.data.get('idempotency_key')
+    try:
+        application, created = applications.submit(
+            applications.applicant_key(request),
+            job_id,
+            cover_letter=request.data.get('cover_letter', ''),
+            resume_id=request.data.get('resume_id', ''),
+            idempotency_key=idempotency_key,
+        )
+    except applications.InvalidApplication as e:
+        return Response({
+            'status': 'error',
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except applications.IdempotencyConflict as e:
+        return Response({
+            'status': 'error',
+            'message': str(e)
+        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
     
-    # In a real app, this would save the application to the database
     return Response({
         'status': 'success',
-        'message': f'Successfully applied to job {job_id}',
-        'application_id': f'app_{job_id}_{hash(cover_letter)}',
-        'application_data': {
-            'job_id': job_id,
-            'cover_letter': cover_letter,
-            'resume_id': resume_id,
-            'applied_date': '2025-09-08',
-            'status': 'submitted'
-        }
-    })
+        'message': f'Successfully applied to job {job_id}' if created else f'Already applied to job {job_id}',
+        'application_id': application.pk,
+        'application_data': applications.serialize(application)
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+@api_view(['POST'])
+def jobs_bulk_apply(request):
+    """Apply to several jobs in one request (one batched insert)"""
+    items = request.data.get('applications')
+    if items is None:
+        # Shorthand: the same cover letter and resume for a list of job IDs
+        items = [
+            {'job_id': job_id,
+             'cover_letter': request.data.get('cover_letter', ''),
+             'resume_id': request.data.get('resume_id', '')}
+            for job_id in request.data.get('job_ids', [])
+        ]
+    if not items or not all(isinstance(item, dict) and item.get('job_id') for item in items):
+        return Response({
+            'status': 'error',
+            'message': 'Provide job_ids or applications, each with a job_id'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > applications.MAX_PAGE_SIZE:
+        return Response({
+            'status': 'error',
+            'message': f'At most {applications.MAX_PAGE_SIZE} applications per request'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        submitted, created = applications.submit_many(
+            applications.applicant_key(request),
+            items,
+            idempotency_key=request.headers.get('Idempotency-Key') or request.data.get('idempotency_key'),
+        )
+    except applications.InvalidApplication as e:
+        return Response({
+            'status': 'error',
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except applications.IdempotencyConflict as e:
+        return Response({
+            'status': 'error',
+            'message': str(e)
+        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    
+    return Response({
+        'status': 'success',
+        'applications': [applications.serialize(application) for application in submitted],
+        'created': created,
+        'total': len(submitted)
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 @api_view(['GET'])
 def jobs_applications(request):
-    """Get user's job applications"""
-    # Sample applications data
-    applications = [
-        {
-            'id': 'app_1_123',
-            'job_id': 1,
-            'job_title': 'Senior Software Engineer',
-            'company': 'TechCorp Inc.',
-            'applied_date': '2025-09-08',
-            'status': 'submitted',
-            'cover_letter': 'I am very interested in this position...',
-            'resume_id': 'resume_1'
-        },
-        {
-            'id': 'app_2_456',
-            'job_id': 2,
-            'job_title': 'Data Scientist',
-            'company': 'DataFlow Solutions',
-            'applied_date': '2025-09-07',
-            'status': 'under_review',
-            'cover_letter': 'My background in machine learning...',
-            'resume_id': 'resume_1'
-        }
-    ]
+    """Get user's job applications, newest first, paged by cursor"""
+    applicant = applications.applicant_key(request)
+    try:
+        page, next_cursor = applications.history(
+            applicant,
+            cursor=request.GET.get('cursor'),
+            limit=request.GET.get('limit', applications.PAGE_SIZE),
+        )
+    except ValueError:
+        return Response({
+            'status': 'error',
+            'message': 'Invalid cursor or limit'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    counts = applications.status_counts(applicant)
     
     return Response({
         'status': 'success',
-        'applications': applications,
-        'total': len(applications)
+        'applications': [applications.serialize(application) for application in page],
+        'next_cursor': next_cursor,
+        'status_counts': counts,
+        'total': sum(counts.values())
     })
@@ -0,0 +1,45 @@
+"""Gunicorn settings: ``gunicorn -c gunicorn.conf.py job_backend.wsgi``
+
+With GUNICORN_PRELOAD the master imports the application once (set
+WARM_UP_IMPORTS to include the AI SDKs and document parsers) and every worker
+is forked from it, sharing those pages copy-on-write; ``gc.freeze()`` before
+each fork keeps the garbage collector from touching, and so copying, them.
+Without it each worker imports the app itself and the SDKs load on first use.
+Background threads do not survive the fork, so with preloading run ingestion
+through ``manage.py ingest_jobs`` rather than JOB_INGESTION_AUTOSTART.
+
+The AI endpoints spend nearly all their time waiting on Gemini and
+Perplexity, so a thread per in-flight request caps each worker at THREADS.
+The async profile serves the native async views instead, one event loop per
+worker and one worker per core:
+
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker AI_VIEWS_ASYNC=True \
+        gunicorn -c gunicorn.conf.py job_backend.asgi
+
+Everything other than the AI endpoints is still a sync DRF view, which Django
+runs one at a time per worker under ASGI, so keep the threaded profile for
+deployments dominated by catalogue traffic. ``manage.py bench_serving``
+compares the two against a fake provider.
+"""
+import gc
+import multiprocessing
+
+from decouple import config as env
+
+bind = env('GUNICORN_BIND', default='0.0.0.0:8000')
+worker_class = env('GUNICORN_WORKER_CLASS', default='sync')
+ASYNC_WORKER = 'uvicorn' in worker_class
+workers = env(
+    'GUNICORN_WORKERS', default=multiprocessing.cpu_count() * (1 if ASYNC_WORKER else 2) + (0 if ASYNC_WORKER else 1),
+    cast=int,
+)
+threads = env('GUNICORN_THREADS', default=4, cast=int)
+timeout = env('GUNICORN_TIMEOUT', default=120, cast=int)
+max_requests = env('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = env('GUNICORN_MAX_REQUESTS_JITTER', default=100, cast=int)
+preload_app = env('GUNICORN_PRELOAD', default=False, cast=bool)
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        gc.freeze()
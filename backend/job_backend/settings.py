@@ -1,5 +1,6 @@
 import os
-from decouple import config
+from corsheaders.defaults import default_headers
+from decouple import Csv, config
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -30,6 +31,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'api.middleware.TracingMiddleware',
+    'api.middleware.ProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -47,6 +52,8 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
 ]
+# Request headers the frontend sends beyond the defaults (api.profiles, jobs_apply)
+CORS_ALLOW_HEADERS = (*default_headers, 'x-profile-token', 'idempotency-key')
 
 ROOT_URLCONF = 'job_backend.urls'
 
@@ -81,6 +88,30 @@ DATABASES = {
 }
 
 
+# Cache: Redis when REDIS_URL is set (shared by all workers), otherwise per-process memory
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'job_backend',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'job-backend',
+            'OPTIONS': {'MAX_ENTRIES': 20000},
+        }
+    }
+
+
+# Sessions are read from the cache and only written through to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -129,6 +160,159 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.FastJSONRenderer',
     ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Job retrieval: catalogues at least this large are shortlisted through the
+# ANN index before exact match scoring. NPROBE is the recall-vs-latency knob.
+JOB_ANN_MIN_CATALOGUE = config('JOB_ANN_MIN_CATALOGUE', default=20000, cast=int)
+JOB_ANN_CANDIDATES = config('JOB_ANN_CANDIDATES', default=500, cast=int)
+JOB_ANN_NPROBE = config('JOB_ANN_NPROBE', default=8, cast=int)
+
+# In-process job catalogue (api.catalogue): jobs outside the published,
+# ingested set are evicted least recently refreshed first beyond MAX_JOBS, or
+# once they have not been produced again for MAX_AGE_SECONDS.
+JOB_CATALOGUE = {
+    'MAX_JOBS': config('JOB_CATALOGUE_MAX_JOBS', default=50000, cast=int),
+    'MAX_AGE_SECONDS': config('JOB_CATALOGUE_MAX_AGE', default=7 * 24 * 3600, cast=int),
+}
+
+# Background job ingestion: every QUERY is swept against every LOCATION and
+# the results are published to the shared job catalogue that jobs_list reads.
+JOB_INGESTION = {
+    'QUERIES': config('JOB_INGESTION_QUERIES', default='Software Engineer,Python Developer,Data Scientist', cast=Csv()),
+    'LOCATIONS': config('JOB_INGESTION_LOCATIONS', default='Remote,Bangalore,New York', cast=Csv()),
+    'INTERVAL_SECONDS': config('JOB_INGESTION_INTERVAL', default=3600, cast=int),
+    'EXPIRE_AFTER_SECONDS': config('JOB_INGESTION_EXPIRE_AFTER', default=3 * 24 * 3600, cast=int),
+    # Run the scheduler inside the web process (otherwise use `manage.py ingest_jobs`)
+    'AUTOSTART': config('JOB_INGESTION_AUTOSTART', default=False, cast=bool),
+    # Serve jobs_list from the ingested catalogue instead of live generation when it has data
+    'SERVE_FROM_CATALOGUE': config('JOB_INGESTION_SERVE_FROM_CATALOGUE', default=True, cast=bool),
+}
+
+# On-demand collection (ai_collect_linkedin_jobs): one provider call per (query, location) pair
+JOB_COLLECTION = {
+    'PARALLELISM': config('JOB_COLLECTION_PARALLELISM', default=4, cast=int),
+    'DEADLINE_SECONDS': config('JOB_COLLECTION_DEADLINE', default=45, cast=float),
+    'MAX_PAIRS': config('JOB_COLLECTION_MAX_PAIRS', default=30, cast=int),
+    'MAX_LIMIT': config('JOB_COLLECTION_MAX_LIMIT', default=500, cast=int),
+}
+
+# Memory-mapped catalogue snapshot written after each ingestion sweep and
+# mapped read-only by every worker at startup (empty PATH disables it)
+JOB_SNAPSHOT = {
+    'PATH': config('JOB_SNAPSHOT_PATH', default=str(BASE_DIR / 'var' / 'job_catalogue.snap')),
+    'LOAD_ON_START': config('JOB_SNAPSHOT_LOAD_ON_START', default=True, cast=bool),
+}
+
+# Request tracing: a SAMPLE_RATE fraction of traces (plus every debug
+# request) is appended as OTLP/JSON lines to PATH (empty PATH disables the
+# sink), which is rotated to PATH.1 once it passes MAX_BYTES. Per-endpoint
+# token and cost metrics count every request regardless of sampling.
+# X-Trace-Debug returns the waterfall inline when it matches DEBUG_TOKEN (or,
+# with no token configured, when DEBUG is on).
+TRACING = {
+    'ENABLED': config('TRACING_ENABLED', default=True, cast=bool),
+    'PATH': config('TRACING_PATH', default=str(BASE_DIR / 'var' / 'traces.jsonl')),
+    'SAMPLE_RATE': config('TRACING_SAMPLE_RATE', default=0.01, cast=float),
+    'MAX_BYTES': config('TRACING_MAX_BYTES', default=50 * 1024 * 1024, cast=int),
+    'DEBUG_TOKEN': config('TRACING_DEBUG_TOKEN', default=''),
+    # USD per million (input, output) tokens by model, for cost estimates
+    'PRICING': {
+        'gemini-1.5-flash': (0.075, 0.30),
+        'llama-3.1-sonar-small-128k-online': (0.2, 0.2),
+    },
+}
+
+# Sampling profiler for single requests, triggered by an X-Flamegraph header
+# equal to TOKEN (empty TOKEN disables the header) or by SAMPLE_RATE.
+# Collapsed stacks are written to DIR, which keeps at most MAX_FILES profiles
+# none older than MAX_AGE_SECONDS; sampling backs off to stay under
+# MAX_OVERHEAD of wall time and stops after MAX_SECONDS.
+PROFILING = {
+    'DIR': config('PROFILING_DIR', default=str(BASE_DIR / 'var' / 'profiles')),
+    'TOKEN': config('PROFILING_TOKEN', default=''),
+    'SAMPLE_RATE': config('PROFILING_SAMPLE_RATE', default=0.0, cast=float),
+    'INTERVAL_MS': config('PROFILING_INTERVAL_MS', default=5, cast=float),
+    'MAX_OVERHEAD': config('PROFILING_MAX_OVERHEAD', default=0.02, cast=float),
+    'MAX_CONCURRENT': config('PROFILING_MAX_CONCURRENT', default=2, cast=int),
+    'MAX_SECONDS': config('PROFILING_MAX_SECONDS', default=60, cast=float),
+    'MAX_FILES': config('PROFILING_MAX_FILES', default=200, cast=int),
+    'MAX_AGE_SECONDS': config('PROFILING_MAX_AGE_SECONDS', default=7 * 24 * 3600, cast=int),
+}
+
+# Memory budgets for resume extraction and provider-output parsing: uploads
+# larger than UPLOAD_MAX_BYTES get a 413. With ENABLED, SAMPLE_RATE of the
+# stages are traced with tracemalloc (which slows every thread while on), and
+# one whose allocations grow past STAGE_BYTES is aborted: 422 for uploads, or
+# a retryable 503 when other stages overlapped it
+MEMORY_BUDGET = {
+    'ENABLED': config('MEMORY_BUDGET_ENABLED', default=False, cast=bool),
+    'SAMPLE_RATE': config('MEMORY_BUDGET_SAMPLE_RATE', default=1.0, cast=float),
+    'UPLOAD_MAX_BYTES': config('MEMORY_BUDGET_UPLOAD_MAX_BYTES', default=10 * 1024 * 1024, cast=int),
+    'STAGE_BYTES': config('MEMORY_BUDGET_STAGE_BYTES', default=256 * 1024 * 1024, cast=int),
+}
+
+# Import the AI SDKs and document parsers at startup instead of on first use.
+# Pair with GUNICORN_PRELOAD (gunicorn.conf.py) so the master imports them once
+# and the forked workers share the pages copy-on-write.
+WARM_UP_IMPORTS = config('WARM_UP_IMPORTS', default=False, cast=bool)
+# Budget for `manage.py bench_imports` and api.tests.ColdStartTests (module
+# imports before the first request; set SKIP_COLD_START_BUDGET=1 to skip the
+# timing test on slow CI machines)
+COLD_START_BUDGET_MS = config('COLD_START_BUDGET_MS', default=750, cast=float)
+
+# Route the provider-bound AI views to api.async_views. Only worthwhile under
+# ASGI (GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker, see gunicorn.conf.py);
+# under WSGI each async view would run on its own short-lived event loop.
+AI_VIEWS_ASYNC = config('AI_VIEWS_ASYNC', default=False, cast=bool)
+
+# Response compression (api.compression): text bodies of at least MIN_BYTES
+# are sent brotli-compressed when the client accepts it and the brotli package
+# is installed, gzip-compressed otherwise
+COMPRESSION = {
+    'ENABLED': config('COMPRESSION_ENABLED', default=True, cast=bool),
+    'MIN_BYTES': config('COMPRESSION_MIN_BYTES', default=1024, cast=int),
+    'BROTLI_QUALITY': config('COMPRESSION_BROTLI_QUALITY', default=4, cast=int),
+}
+
+# Section parses of uploaded resumes (api.resume_store), served by the
+# /api/resumes/<id>/... endpoints: shared through the cache for TIMEOUT
+# seconds, with the LOCAL_ENTRIES most recent kept in each worker. Each
+# applicant's last VERSIONS_KEPT parses are also stored (api.resume_versions)
+# for section diffs and reprocess, which makes at most ANALYSIS_PARALLELISM
+# provider calls at once. An applicant's versions are deleted VERSIONS_MAX_AGE
+# seconds after their last upload (checked at most every PRUNE_INTERVAL
+# seconds, or on demand with `manage.py prune_resume_versions`)
+RESUME_STORE = {
+    'TIMEOUT': config('RESUME_STORE_TIMEOUT', default=24 * 3600, cast=int),
+    'LOCAL_ENTRIES': config('RESUME_STORE_LOCAL_ENTRIES', default=1000, cast=int),
+    'VERSIONS_KEPT': config('RESUME_STORE_VERSIONS_KEPT', default=10, cast=int),
+    'ANALYSIS_PARALLELISM': config('RESUME_STORE_ANALYSIS_PARALLELISM', default=4, cast=int),
+    'VERSIONS_MAX_AGE': config('RESUME_STORE_VERSIONS_MAX_AGE', default=30 * 24 * 3600, cast=int),
+    'PRUNE_INTERVAL': config('RESUME_STORE_PRUNE_INTERVAL', default=3600, cast=int),
+}
+
+# Recruiter batch scoring (api.batch_scoring): every resume is ranked locally,
+# the TOP_K best are scored by the provider with up to PACK_SIZE resumes of at
+# most PACK_RESUME_MAX_CHARS (PACK_MAX_CHARS together) per prompt, PARALLELISM
+# prompts at a time. Progress is checkpointed in the database (api.models.
+# BatchScore) for CHECKPOINT_TIMEOUT seconds so an interrupted batch resumes
+# when resubmitted; expired scores are deleted at most every PRUNE_INTERVAL.
+BATCH_SCORING = {
+    'TOP_K': config('BATCH_SCORING_TOP_K', default=50, cast=int),
+    'MAX_TOP_K': config('BATCH_SCORING_MAX_TOP_K', default=500, cast=int),
+    'MAX_RESUMES': config('BATCH_SCORING_MAX_RESUMES', default=5000, cast=int),
+    'PACK_SIZE': config('BATCH_SCORING_PACK_SIZE', default=5, cast=int),
+    'PACK_RESUME_MAX_CHARS': config('BATCH_SCORING_PACK_RESUME_MAX_CHARS', default=3000, cast=int),
+    'PACK_MAX_CHARS': config('BATCH_SCORING_PACK_MAX_CHARS', default=12000, cast=int),
+    'PARALLELISM': config('BATCH_SCORING_PARALLELISM', default=4, cast=int),
+    'CHECKPOINT_TIMEOUT': config('BATCH_SCORING_CHECKPOINT_TIMEOUT', default=24 * 3600, cast=int),
+    'PRUNE_INTERVAL': config('BATCH_SCORING_PRUNE_INTERVAL', default=3600, cast=int),
 }
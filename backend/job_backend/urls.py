@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
 from api import views as api_views
+from api.metrics import metrics_view
 
 def api_status(request):
     return JsonResponse({
@@ -13,6 +14,7 @@ def api_status(request):
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', api_status, name='api_status'),
+    path('metrics', metrics_view, name='metrics'),
     path('api/', include('api.urls')),
     # Add resume endpoints that frontend expects
     path('api/resumes/upload/', api_views.upload_resume, name='resumes_upload'),
@@ -1,6 +1,20 @@
-from rest_framework import viewsets
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status, viewsets
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.views import APIView
+
+from api import resume_versions
+from api.applications import applicant_key
+from api.batch_scoring import BatchScorer
+from api.catalogue import catalogue
+from api.comparison import compare, job_error
+from api.models import BatchScore
+from api.profiles import UserProfile, attach_profile
+from api.renderers import dumps
+from api.resume_store import parsed_resumes
+from api.tracing import span
 
 class ResumeViewSet(viewsets.ViewSet):
     """
@@ -17,3 +31,243 @@ class ResumeViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['post'])
     def analyze(self, request):
         return Response({'message': 'Resume analysis endpoint - coming soon'})
+
+
+class CompareResumesView(APIView):
+    """Compare a shortlist of resumes with each other and with job descriptions.
+
+    POST ``resumes`` (texts, or objects with ``id`` and ``text``) plus any of
+    ``jobs`` (descriptions, or job objects) and ``job_ids`` (catalogue jobs).
+    Returns the resume x job and resume x resume similarity matrices with
+    shared and missing skills per resume/job pair; no LLM call is made.
+    """
+
+    MAX_RESUMES = 500
+    MAX_JOBS = 50
+
+    def post(self, request):
+        resumes = []
+        for i, item in enumerate(request.data.get('resumes') or []):
+            if isinstance(item, str):
+                item = {'text': item}
+            if not isinstance(item, dict) or not str(item.get('text') or item.get('resume_text') or '').strip():
+                return self._error(f'Resume {i + 1} has no text')
+            resumes.append({'id': str(item.get('id') or f'resume-{i + 1}'),
+                            'text': str(item.get('text') or item.get('resume_text'))})
+
+        jobs = []
+        for i, item in enumerate(request.data.get('jobs') or []):
+            if isinstance(item, str):
+                item = {'description': item}
+            if not isinstance(item, dict):
+                return self._error(f'Job {i + 1} must be a description or a job object')
+            problem = job_error(item)
+            if problem:
+                return self._error(f'Job {i + 1}: {problem}')
+            jobs.append(dict(item, id=str(item.get('id') or f'job-{i + 1}')))
+        for job_id in request.data.get('job_ids') or []:
+            job = catalogue.get(str(job_id))
+            if job is None:
+                return self._error(f'Job {job_id} not found', status.HTTP_404_NOT_FOUND)
+            jobs.append(dict(job))
+
+        if not resumes:
+            return self._error('No resumes provided')
+        if len(resumes) > self.MAX_RESUMES or len(jobs) > self.MAX_JOBS:
+            return self._error(f'Compare at most {self.MAX_RESUMES} resumes and {self.MAX_JOBS} jobs at a time')
+
+        with span('compare_resumes', {'compare.resumes': len(resumes), 'compare.jobs': len(jobs)}):
+            result = compare(resumes, jobs)
+        return Response({'status': 'success', **result})
+
+    @staticmethod
+    def _error(message, code=status.HTTP_400_BAD_REQUEST):
+        return Response({'status': 'error', 'message': message}, status=code)
+
+
+class ParsedSectionView(APIView):
+    """One section of an uploaded resume, from its cached local parse.
+
+    ``upload_resume`` segments the text once (``api.sections``) and returns
+    its ``resume_id``; every section view below is a lookup in
+    ``api.resume_store``, falling back to the caller's stored versions once
+    the cached parse has expired. ``section = None`` returns the whole parse.
+    """
+
+    section = None
+
+    def get(self, request, resume_id):
+        resume_id = str(resume_id)
+        parsed = parsed_resumes.get(resume_id)
+        if parsed is None and (request.user.is_authenticated or request.session.session_key):
+            version = resume_versions.find(applicant_key(request), resume_id)
+            parsed = version.sections if version is not None else None
+        if parsed is None:
+            return Response({
+                'status': 'error',
+                'message': 'Resume not found or expired; upload it again',
+            }, status=status.HTTP_404_NOT_FOUND)
+        if self.section is None:
+            return Response({'status': 'success', 'resume_id': resume_id, 'parsed_data': parsed})
+        return Response({'status': 'success', 'resume_id': resume_id, self.section: parsed[self.section]})
+
+
+class ParsedDataView(ParsedSectionView):
+    section = None
+
+
+class PersonalInfoView(ParsedSectionView):
+    section = 'personal_info'
+
+
+class WorkExperienceView(ParsedSectionView):
+    section = 'experience'
+
+
+class EducationView(ParsedSectionView):
+    section = 'education'
+
+
+class SkillsView(ParsedSectionView):
+    section = 'skills'
+
+
+class ProjectsView(ParsedSectionView):
+    section = 'projects'
+
+
+class CertificationsView(ParsedSectionView):
+    section = 'certifications'
+
+
+class ResumeVersionsView(APIView):
+    """The caller's stored resume versions, newest first, with the sections each one changed"""
+
+    def get(self, request):
+        versions = resume_versions.history(applicant_key(request)).values(
+            'version', 'resume_id', 'changes', 'created_at',
+        )
+        return Response({
+            'status': 'success',
+            'versions': [{
+                'version': version['version'],
+                'resume_id': version['resume_id'],
+                'changed_sections': version['changes'].get('changed', []),
+                'created_at': version['created_at'],
+            } for version in versions],
+        })
+
+
+class ReprocessResumeView(APIView):
+    """Re-run the analysis of an uploaded resume version, section by section.
+
+    POST an optional ``target_role``. Only sections whose content (or the
+    target role) has no stored analysis in this or an earlier version of the
+    caller's resume go to the provider; the rest are reused, so a re-upload
+    that fixes one section costs one call instead of a full analysis.
+    """
+
+    def post(self, request, resume_id):
+        version = resume_versions.find(applicant_key(request), str(resume_id))
+        if version is None:
+            return Response({
+                'status': 'error',
+                'message': 'Resume not found for this user; upload it first',
+            }, status=status.HTTP_404_NOT_FOUND)
+        target_role = str(request.data.get('target_role') or '')
+
+        with span('reanalyze_resume', {'resume.version': version.version}) as current:
+            outcome = resume_versions.reanalyze(version, target_role)
+            current.set_attributes({'resume.reprocessed': len(outcome['reprocessed']),
+                                    'resume.reused': len(outcome['reused'])})
+
+        analysis = outcome['analysis']
+        scores = [entry['score'] for entry in analysis.values()
+                  if isinstance(entry, dict) and isinstance(entry.get('score'), (int, float))]
+        parsed = version.sections
+        profile = UserProfile.build(
+            skills=parsed['skills']['normalized'],
+            experience_level=str(analysis.get(resume_versions.EXPERIENCE_LEVEL, '')),
+            location=str(parsed['personal_info'].get('location') or ''),
+            target_role=target_role,
+        )
+        return attach_profile(Response({
+            'status': 'success',
+            'resume_id': version.resume_id,
+            'version': version.version,
+            'changes': version.changes,
+            'personal_info': parsed['personal_info'],
+            'score': round(sum(scores) / len(scores), 1) if scores else None,
+            **outcome,
+        }), profile)
+
+
+class BatchScoreView(APIView):
+    """Rank a large batch of resumes against one job for a recruiter.
+
+    POST ``resumes`` (as for CompareResumesView), the job as ``job`` (a
+    description or job object) or ``job_id``, and optionally ``top_k``.
+    Every resume is ranked locally and only the ``top_k`` best are scored by
+    the provider (see ``api.batch_scoring``). Progress streams back as
+    newline-delimited JSON events ending in ``done`` with the ranking; send
+    ``stream: false`` to get only that final event. Resubmitting the same
+    batch after an interruption resumes from its checkpoint.
+    """
+
+    # Checkpointed scores are stored per resume ID
+    MAX_RESUME_ID_LENGTH = BatchScore._meta.get_field('resume_id').max_length
+
+    def post(self, request):
+        options = settings.BATCH_SCORING
+        resumes = []
+        for i, item in enumerate(request.data.get('resumes') or []):
+            if isinstance(item, str):
+                item = {'text': item}
+            if not isinstance(item, dict) or not str(item.get('text') or item.get('resume_text') or '').strip():
+                return self._error(f'Resume {i + 1} has no text')
+            resumes.append({'id': str(item.get('id') or f'resume-{i + 1}'),
+                            'text': str(item.get('text') or item.get('resume_text'))})
+            if len(resumes[-1]['id']) > self.MAX_RESUME_ID_LENGTH:
+                return self._error(f'Resume {i + 1}: ids are at most {self.MAX_RESUME_ID_LENGTH} characters')
+        if not resumes:
+            return self._error('No resumes provided')
+        if len(resumes) > options['MAX_RESUMES']:
+            return self._error(f"Score at most {options['MAX_RESUMES']} resumes at a time")
+        if len({resume['id'] for resume in resumes}) != len(resumes):
+            return self._error('Resume ids must be unique')
+
+        job = request.data.get('job')
+        if request.data.get('job_id'):
+            job = catalogue.get(str(request.data['job_id']))
+            if job is None:
+                return self._error(f"Job {request.data['job_id']} not found", status.HTTP_404_NOT_FOUND)
+            job = dict(job)
+        elif isinstance(job, str) and job.strip():
+            job = {'id': 'job', 'description': job}
+        elif not isinstance(job, dict) or not any(job.get(field) for field in ('title', 'description')):
+            return self._error('Provide the job as a description, a job object or a job_id')
+        else:
+            problem = job_error(job)
+            if problem:
+                return self._error(f'Job: {problem}')
+
+        try:
+            top_k = int(request.data.get('top_k') or options['TOP_K'])
+        except (TypeError, ValueError):
+            return self._error('top_k must be a number')
+        if not 1 <= top_k <= options['MAX_TOP_K']:
+            return self._error(f"top_k must be between 1 and {options['MAX_TOP_K']}")
+
+        events = BatchScorer(job, resumes, top_k=top_k).run()
+        if request.data.get('stream', True) in (False, 'false', '0', 0):
+            *_, done = events
+            return Response({'status': 'success', **done})
+        response = StreamingHttpResponse((dumps(event) + b'\n' for event in events),
+                                         content_type='application/x-ndjson')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Let nginx pass each event through as it is written
+        return response
+
+    @staticmethod
+    def _error(message, code=status.HTTP_400_BAD_REQUEST):
+        return Response({'status': 'error', 'message': message}, status=code)
@@ -8,6 +8,8 @@ const api = axios.create({
   headers: {
     'Content-Type': 'application/json',
   },
+  // Send the session cookie: uploaded resume versions and applications belong to it
+  withCredentials: true,
 });
 
 // Resume API calls